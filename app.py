@@ -4,25 +4,47 @@ It initializes the app, sets up configurations, and registers routes.
 """
 
 import os
-from flask import Flask
+from flask import Flask, jsonify, make_response
 from flask_migrate import Migrate
 from flask_restful import Api
 from flasgger import Swagger
 from database import db
 from config import config
+from application.auth import jwt, token_verifier
+from application.cache import response_cache
+from application.distributions import grade_distribution_command
+from application.hashing import HashingBusyError, benchmark_argon2_command, password_hashing
+from application.leaderboard import rebuild_course_standings_command
+from application.ratelimit import rate_limiter
+from application.risk import scan_at_risk_students_command
+from application.rollups import rebuild_attendance_rollups_command
 from application.resources.assignment_resource import AssignmentResource, AssignmentByID
-from application.resources.attendance_resource import AttendanceResource, AttendanceByID
+from application.resources.auth_resource import Login, TokenRefresh
+from application.resources.attendance_resource import (AttendanceResource, AttendanceByID,
+                                                       StudentAttendanceRate)
 from application.resources.comments_resource import CommentResource, CommentByID
 from application.resources.course_resource import CourseResource, CourseByID
-from application.resources.discussion_resource import DiscussionResource, DiscussionByID
+from application.resources.discussion_resource import (DiscussionResource, DiscussionByID,
+                                                       DiscussionActivity,
+                                                       CourseDiscussionActivity)
 from application.resources.enrollments_resource import EnrollmentsResource, EnrollmentByID
 from application.resources.files_resource import FilesResource, FileByID
-from application.resources.grades_resource import GradesResource, GradeByID
-from application.resources.instructors_resource import InstructorResource, InstructorByID
+from application.resources.grade_stats_resource import (CourseGradeStats, GradeStatsResource,
+                                                        CourseGradeDistribution,
+                                                        GradeDistributionResource)
+from application.resources.grades_resource import (GradesResource, GradeByID, CourseLeaderboard,
+                                                   StudentCourseRank)
+from application.resources.instructors_resource import (InstructorResource, InstructorByID,
+                                                        InstructorDashboard)
 from application.resources.lectures_resource import LecturesResource, LectureByID
-from application.resources.notifications_resource import NotificationsResource, NotificationByID
-from application.resources.students_resource import StudentResource, StudentByID
+from application.resources.metrics_resource import HashingMetrics
+from application.resources.notifications_resource import (NotificationsResource, NotificationByID,
+                                                          NotificationReadLatency)
+from application.resources.students_resource import (StudentResource, StudentByID,
+                                                     StudentTranscript, AtRiskStudents)
 from application.resources.submission_resource import SubmissionResource, SubmissionByID
+from application.resources.submission_stats_resource import (AssignmentSubmissionStats,
+                                                             CourseSubmissionStats)
 
 app = Flask(__name__)
 swagger = Swagger(app)
@@ -32,35 +54,87 @@ app.config.from_object(config[config_name])
 
 db.init_app(app)
 migrate = Migrate(app, db)
+response_cache.init_app(app)
+password_hashing.init_app(app)
+jwt.init_app(app)
+rate_limiter.init_app(app)
+# After the rate limiter, so rejected requests are not verified first.
+token_verifier.init_app(app)
+app.cli.add_command(rebuild_attendance_rollups_command)
+app.cli.add_command(grade_distribution_command)
+app.cli.add_command(scan_at_risk_students_command)
+app.cli.add_command(rebuild_course_standings_command)
+app.cli.add_command(benchmark_argon2_command)
 api = Api(app)
 
+
+@app.errorhandler(HashingBusyError)
+def hashing_busy(error):
+    """Shed requests that found the password hashing queue full."""
+    response = make_response(jsonify({"error": str(error)}), 503)
+    response.headers['Retry-After'] = str(max(1, round(password_hashing.queue_timeout)))
+    return response
+
+
 # Registering resources
 api.add_resource(AssignmentResource, "/assignments", endpoint="assignments")
-api.add_resource(AssignmentByID, "/assignments/<int:id>", endpoint="assignments_by_id")
+api.add_resource(AssignmentByID, "/assignments/<int:assignment_id>", endpoint="assignments_by_id")
+api.add_resource(AssignmentSubmissionStats, "/assignments/<int:assignment_id>/submission-stats",
+                 endpoint="assignment_submission_stats")
 api.add_resource(AttendanceResource, "/attendances", endpoint="attendances")
-api.add_resource(AttendanceByID, "/attendances/<int:id>", endpoint="attendances_by_id")
+api.add_resource(AttendanceByID, "/attendances/<int:attendance_id>", endpoint="attendances_by_id")
+api.add_resource(Login, "/auth/login", endpoint="auth_login")
+api.add_resource(TokenRefresh, "/auth/refresh", endpoint="auth_refresh")
 api.add_resource(CommentResource, "/comments", endpoint="comments")
-api.add_resource(CommentByID, "/comments/<int:id>", endpoint="comments_by_id")
+api.add_resource(CommentByID, "/comments/<int:comment_id>", endpoint="comments_by_id")
 api.add_resource(CourseResource, "/courses", endpoint="courses")
-api.add_resource(CourseByID, "/courses/<int:id>", endpoint="courses_by_id")
+api.add_resource(CourseByID, "/courses/<int:course_id>", endpoint="courses_by_id")
+api.add_resource(CourseGradeStats, "/courses/<int:course_id>/grade-stats",
+                 endpoint="course_grade_stats")
+api.add_resource(GradeStatsResource, "/courses/grade-stats", endpoint="grade_stats")
+api.add_resource(CourseGradeDistribution, "/courses/<int:course_id>/grade-distribution",
+                 endpoint="course_grade_distribution")
+api.add_resource(CourseDiscussionActivity, "/courses/<int:course_id>/discussion-activity",
+                 endpoint="course_discussion_activity")
+api.add_resource(CourseLeaderboard, "/courses/<int:course_id>/leaderboard",
+                 endpoint="course_leaderboard")
+api.add_resource(CourseSubmissionStats, "/courses/<int:course_id>/submission-stats",
+                 endpoint="course_submission_stats")
+api.add_resource(GradeDistributionResource, "/courses/grade-distribution",
+                 endpoint="grade_distribution")
 api.add_resource(DiscussionResource, "/discussions", endpoint="discussions")
-api.add_resource(DiscussionByID, "/discussions/<int:id>", endpoint="discussions_by_id")
+api.add_resource(DiscussionByID, "/discussions/<int:discussion_id>", endpoint="discussions_by_id")
+api.add_resource(DiscussionActivity, "/discussions/<int:discussion_id>/activity",
+                 endpoint="discussion_activity")
 api.add_resource(EnrollmentsResource, "/enrollments", endpoint="enrollments")
-api.add_resource(EnrollmentByID, "/enrollments/<int:id>", endpoint="enrollments_by_id")
+api.add_resource(EnrollmentByID, "/enrollments/<int:enrollment_id>", endpoint="enrollments_by_id")
 api.add_resource(FilesResource, "/files", endpoint="files")
-api.add_resource(FileByID, "/files/<int:id>", endpoint="files_by_id")
+api.add_resource(FileByID, "/files/<int:file_id>", endpoint="files_by_id")
 api.add_resource(GradesResource, "/grades", endpoint="grades")
-api.add_resource(GradeByID, "/grades/<int:id>", endpoint="grades_by_id")
+api.add_resource(GradeByID, "/grades/<int:grade_id>", endpoint="grades_by_id")
 api.add_resource(InstructorResource, "/instructors", endpoint="instructors")
-api.add_resource(InstructorByID, "/instructors/<int:id>", endpoint="instructors_by_id")
+api.add_resource(InstructorByID, "/instructors/<int:instructor_id>", endpoint="instructors_by_id")
+api.add_resource(InstructorDashboard, "/instructors/<int:instructor_id>/dashboard",
+                 endpoint="instructor_dashboard")
 api.add_resource(LecturesResource, "/lectures", endpoint="lectures")
-api.add_resource(LectureByID, "/lectures/<int:id>", endpoint="lectures_by_id")
+api.add_resource(LectureByID, "/lectures/<int:lecture_id>", endpoint="lectures_by_id")
+api.add_resource(HashingMetrics, "/metrics/hashing", endpoint="hashing_metrics")
 api.add_resource(NotificationsResource, "/notifications", endpoint="notifications")
-api.add_resource(NotificationByID, "/notifications/<int:id>", endpoint="notifications_by_id")
+api.add_resource(NotificationByID, "/notifications/<int:notification_id>",
+                 endpoint="notifications_by_id")
+api.add_resource(NotificationReadLatency, "/notifications/read-latency",
+                 endpoint="notification_read_latency")
 api.add_resource(StudentResource, "/students", endpoint="students")
-api.add_resource(StudentByID, "/students/<int:id>", endpoint="students_by_id")
+api.add_resource(StudentByID, "/students/<int:student_id>", endpoint="students_by_id")
+api.add_resource(AtRiskStudents, "/students/at-risk", endpoint="students_at_risk")
+api.add_resource(StudentAttendanceRate, "/students/<int:student_id>/attendance-rate",
+                 endpoint="student_attendance_rate")
+api.add_resource(StudentCourseRank, "/students/<int:student_id>/rank",
+                 endpoint="student_course_rank")
+api.add_resource(StudentTranscript, "/students/<int:student_id>/transcript",
+                 endpoint="student_transcript")
 api.add_resource(SubmissionResource, "/submissions", endpoint="submissions")
-api.add_resource(SubmissionByID, "/submissions/<int:id>", endpoint="submissions_by_id")
+api.add_resource(SubmissionByID, "/submissions/<int:submission_id>", endpoint="submissions_by_id")
 
 if __name__ == '__main__':
     try:
@@ -0,0 +1,150 @@
+"""
+Token authentication for students and instructors.
+
+``/auth/login`` checks a password once with the argon2 ``authenticate()``
+and issues a short-lived access token and a longer-lived refresh token;
+``/auth/refresh`` trades the refresh token for new access tokens, so
+clients never resend credentials. Tokens carry the account ID as their
+subject and the account kind in a ``role`` claim.
+
+Verifying a token's signature on every request repeats the same work for
+a token that is presented many times. ``token_verifier`` checks the bearer
+token of every request that carries one before the view runs, through
+``flask_jwt_extended.decode_token``, and keeps the claims of verified
+tokens in an in-process LRU cache, keyed by a SHA-256 digest of the token
+and kept no longer than the token's own expiry or JWT_VERIFIED_CACHE_TTL
+seconds, whichever comes first. A request with an invalid or expired token
+is answered with 401; views that need a token of a given type are wrapped
+in ``token_required``, and any view can read the claims with
+``current_claims()``.
+"""
+
+import hashlib
+import time
+from functools import lru_cache, wraps
+from flask import current_app, g, jsonify, make_response, request
+from flask_jwt_extended import JWTManager, decode_token
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt import ExpiredSignatureError, PyJWTError
+from sqlalchemy import or_
+from application.cache import MemoryBackend
+from application.hashing import password_hashing
+from application.models.instructors import Instructor
+from application.models.students import Student
+
+VERIFIED_CACHE_SIZE = 4096
+VERIFIED_CACHE_TTL = 60
+ACCOUNT_MODELS = {'student': Student, 'instructor': Instructor}
+
+jwt = JWTManager()
+
+
+class TokenVerifier:
+    """Decode tokens with ``decode_token``, skipping signature checks for recent ones."""
+
+    def __init__(self):
+        self.verified = MemoryBackend(VERIFIED_CACHE_SIZE, VERIFIED_CACHE_TTL)
+
+    def init_app(self, app):
+        """Size the verified-token cache from ``JWT_VERIFIED_CACHE_*`` settings."""
+        self.verified = MemoryBackend(
+            app.config.get('JWT_VERIFIED_CACHE_SIZE', VERIFIED_CACHE_SIZE),
+            app.config.get('JWT_VERIFIED_CACHE_TTL', VERIFIED_CACHE_TTL)
+        )
+        app.extensions['token_verifier'] = self
+        app.before_request(self.check)
+
+    def decode(self, encoded_token):
+        """Return the claims of ``encoded_token``, verifying it unless it was verified recently."""
+        key = hashlib.sha256(encoded_token.encode()).hexdigest()
+        claims = self.verified.get(key)
+        if claims is not None:
+            return dict(claims)
+        claims = decode_token(encoded_token)
+        if 'exp' in claims:
+            ttl = min(claims['exp'] - time.time(), self.verified.ttl)
+            if ttl > 0:
+                self.verified.set(key, claims, ttl=ttl)
+        return dict(claims)
+
+    def check(self):
+        """before_request hook verifying the bearer token of a request, if it has one."""
+        g.token_claims = None
+        scheme, _, encoded_token = request.headers.get('Authorization', '').partition(' ')
+        if scheme != 'Bearer' or not encoded_token.strip():
+            return None
+        try:
+            g.token_claims = self.decode(encoded_token.strip())
+        except ExpiredSignatureError:
+            return make_response(jsonify({"error": "Token has expired"}), 401)
+        except (PyJWTError, JWTExtendedException):
+            return make_response(jsonify({"error": "Invalid token"}), 401)
+        return None
+
+
+token_verifier = TokenVerifier()
+
+
+def token_required(refresh=False):
+    """
+    Require a bearer token of the expected type.
+
+    Access tokens are expected unless ``refresh`` is set. The token itself
+    was verified by ``TokenVerifier.check``; a request without one is
+    answered with 401, a token of the wrong type with 422.
+    """
+    expected = 'refresh' if refresh else 'access'
+
+    def wrapper(fn):
+        @wraps(fn)
+        def decorated(*args, **kwargs):
+            claims = current_claims()
+            if claims is None:
+                return make_response(jsonify({"error": "Missing bearer token"}), 401)
+            if claims.get('type') != expected:
+                return make_response(jsonify({"error": f"Only {expected} tokens are allowed"}),
+                                     422)
+            return fn(*args, **kwargs)
+        return decorated
+    return wrapper
+
+
+def current_claims():
+    """Claims of the bearer token verified for the current request, or None."""
+    return g.get('token_claims')
+
+
+def find_account(role, username):
+    """Return the student with this username or email, or the instructor with this email."""
+    model = ACCOUNT_MODELS[role]
+    if model is Student:
+        criteria = or_(Student.username == username, Student.email == username)
+    else:
+        criteria = Instructor.email == username
+    return model.query.filter(criteria).first()
+
+
+@lru_cache(maxsize=1)
+def placeholder_hash():
+    """A hash to verify against when the account does not exist."""
+    return password_hashing.hash('placeholder password')
+
+
+def authenticate_account(role, username, password):
+    """
+    Return the account matching ``username`` and ``password``, or None.
+
+    Unknown accounts still pay for one argon2 verification, so response
+    times do not tell which usernames exist. A rehashed password is left
+    for the caller to commit.
+    """
+    account = find_account(role, username)
+    if account is None:
+        password_hashing.verify(placeholder_hash(), password)
+        return None
+    return account if account.authenticate(password) else None
+
+
+def access_token_lifetime():
+    """Seconds an access token stays valid."""
+    return int(current_app.config['JWT_ACCESS_TOKEN_EXPIRES'].total_seconds())
@@ -0,0 +1,304 @@
+"""
+Response cache for read-mostly endpoints.
+
+Responses are stored in an in-process LRU cache with a TTL, or in a SQLite
+file shared by all workers on a host. Each entry is keyed on the request and
+on the current token of its tags: a collection response is tagged with its
+table name and a by-ID response with ``<table>:<id>``. Invalidating a tag
+replaces its token, so every entry built under the old token is skipped.
+
+Rows that belong to a student (they have a ``student_id`` column) are also
+tagged with ``<table>:student:<id>``, so per-student views such as the
+transcript can be invalidated without dropping every other student's entry.
+
+Tags are invalidated from SQLAlchemy session events: rows flushed by a
+transaction are collected after each flush and their tags are invalidated
+once the transaction commits, so a rolled back write never evicts anything.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, make_response, request
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+DEFAULT_TTL = object()
+OWNER_COLUMN = 'student_id'
+
+
+class MemoryBackend:
+    """Thread-safe in-process LRU cache with per-entry expiry."""
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for ``key``, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires is not None and expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=DEFAULT_TTL):
+        """Store ``value``; ``ttl`` of None keeps it until it is evicted."""
+        ttl = self.ttl if ttl is DEFAULT_TTL else ttl
+        expires = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteBackend:
+    """Cache stored in a SQLite file, so several worker processes can share it."""
+
+    def __init__(self, path, ttl=60):
+        self.path = path
+        self.ttl = ttl
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5, isolation_level=None)
+
+    def get(self, key):
+        """Return the cached value for ``key``, or None if missing or expired."""
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT value, expires FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            return None
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl=DEFAULT_TTL):
+        """Store ``value``; ``ttl`` of None keeps it until it is cleared."""
+        ttl = self.ttl if ttl is DEFAULT_TTL else ttl
+        expires = time.time() + ttl if ttl is not None else None
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires)
+            )
+            connection.execute("DELETE FROM cache WHERE expires < ?", (time.time(),))
+
+    def clear(self):
+        """Remove every entry."""
+        with self._connect() as connection:
+            connection.execute("DELETE FROM cache")
+
+
+def table_tag(table):
+    """Tag for every collection response of ``table``."""
+    return table
+
+
+def entity_tag(table, record_id):
+    """Tag for the by-ID responses of one row."""
+    return f"{table}:{record_id}"
+
+
+def owner_tag(table, student_id):
+    """Tag for the rows of ``table`` that belong to one student."""
+    return f"{table}:student:{student_id}"
+
+
+def related_tables(model, expand):
+    """Return the tables reached through the ``?expand=`` paths of a request."""
+    tables = set()
+    for path in (expand or '').split(','):
+        mapper = model.__mapper__
+        for name in path.strip().split('.'):
+            relationship = mapper.relationships.get(name)
+            if relationship is None:
+                break
+            mapper = relationship.mapper
+            tables.add(mapper.local_table.name)
+    return sorted(tables)
+
+
+class ResponseCache:
+    """Flask extension holding the configured cache backend."""
+
+    def __init__(self):
+        self.backend = None
+
+    def init_app(self, app):
+        """Create the backend from ``RESPONSE_CACHE_*`` settings."""
+        kind = app.config.get('RESPONSE_CACHE_BACKEND', 'memory')
+        ttl = app.config.get('RESPONSE_CACHE_TTL', 60)
+        if kind == 'memory':
+            self.backend = MemoryBackend(app.config.get('RESPONSE_CACHE_SIZE', 1024), ttl)
+        elif kind == 'sqlite':
+            self.backend = SQLiteBackend(app.config['RESPONSE_CACHE_PATH'], ttl)
+        else:
+            self.backend = None
+        app.extensions['response_cache'] = self
+
+    def clear(self):
+        """Drop every cached response."""
+        if self.backend is not None:
+            self.backend.clear()
+
+    def tag_token(self, tag):
+        """Return the current token of ``tag``, creating one if needed."""
+        token = self.backend.get(f"tag:{tag}")
+        if token is None:
+            token = uuid.uuid4().hex
+            self.backend.set(f"tag:{tag}", token, ttl=None)
+        return token
+
+    def invalidate(self, *tags):
+        """Invalidate every response cached under any of ``tags``."""
+        if self.backend is None:
+            return
+        for tag in tags:
+            self.backend.set(f"tag:{tag}", uuid.uuid4().hex, ttl=None)
+
+    def key(self, tags):
+        """Build the key for the current request under ``tags``."""
+        parts = [request.full_path, request.headers.get('Accept', '')]
+        parts.extend(self.tag_token(tag) for tag in tags)
+        return 'response:' + hashlib.sha1('\n'.join(parts).encode()).hexdigest()
+
+
+response_cache = ResponseCache()
+
+
+def cached_response(model, tags=None, ttl_setting=None):
+    """
+    Cache successful GET responses of a resource method for ``model``.
+
+    Collection responses are tagged with the model's table and by-ID
+    responses with the row's entity tag. Responses with ``?expand=`` are
+    also tagged with every related table they embed. A cached response still
+    honours ``If-None-Match`` without touching the database.
+
+    ``tags`` overrides the default tags: it is called with the view's URL
+    arguments and returns the tags of the response. ``ttl_setting`` names a
+    config key holding a TTL that replaces the backend's default.
+    """
+    table = model.__tablename__
+
+    def default_tags(**kwargs):
+        record_id = next(iter(kwargs.values()), None)
+        return [table_tag(table) if record_id is None else entity_tag(table, record_id)]
+
+    build_tags = tags or default_tags
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if response_cache.backend is None:
+                return view(*args, **kwargs)
+            response_tags = list(build_tags(**kwargs))
+            response_tags.extend(table_tag(name)
+                                 for name in related_tables(model, request.args.get('expand')))
+            key = response_cache.key(response_tags)
+            hit = response_cache.backend.get(key)
+            if hit is not None:
+                response = make_response(hit['body'], hit['status'], hit['headers'])
+                response.headers['X-Cache'] = 'HIT'
+                return response.make_conditional(request)
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                ttl = (current_app.config.get(ttl_setting, DEFAULT_TTL)
+                       if ttl_setting else DEFAULT_TTL)
+                response_cache.backend.set(key, {
+                    'status': response.status_code,
+                    'headers': [(name, value) for name, value in response.headers
+                                if name.lower() != 'content-length'],
+                    'body': response.get_data(as_text=True)
+                }, ttl=ttl)
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+
+def mark_changed(session, table, ids, student_ids=()):
+    """
+    Record rows changed outside the unit of work, e.g. by a bulk UPDATE.
+
+    ``student_ids`` lists the owners of the rows, if the table has any.
+    Their tags are invalidated together with the rest of the transaction's
+    tags when it commits.
+    """
+    tags = session.info.setdefault('cache_tags', set())
+    tags.add(table_tag(table))
+    tags.update(entity_tag(table, record_id) for record_id in ids)
+    tags.update(owner_tag(table, student_id) for student_id in student_ids)
+
+
+def owner_ids(instance):
+    """Return the current and previous owners of a flushed instance."""
+    state = inspect(instance)
+    if OWNER_COLUMN not in state.mapper.column_attrs:
+        return set()
+    history = state.attrs[OWNER_COLUMN].history
+    return {value for value in (*history.added, *history.unchanged, *history.deleted)
+            if value is not None}
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_tags(session, _flush_context):
+    """Remember the tags of rows written by this flush."""
+    tags = session.info.setdefault('cache_tags', set())
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(instance, '__tablename__', None)
+        if table is None:
+            continue
+        tags.add(table_tag(table))
+        record_id = getattr(instance, 'id', None)
+        if record_id is not None:
+            tags.add(entity_tag(table, record_id))
+        tags.update(owner_tag(table, student_id) for student_id in owner_ids(instance))
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_bulk_tags(orm_execute_state):
+    """Remember the table written by a bulk INSERT, UPDATE or DELETE statement."""
+    state = orm_execute_state
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    mapper = state.bind_mapper
+    if mapper is not None:
+        state.session.info.setdefault('cache_tags', set()).add(table_tag(mapper.local_table.name))
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_tags(session):
+    """Invalidate the tags collected during the committed transaction."""
+    tags = session.info.pop('cache_tags', None)
+    if tags:
+        response_cache.invalidate(*tags)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_tags(session):
+    """Forget tags collected by a transaction that was rolled back."""
+    session.info.pop('cache_tags', None)
@@ -0,0 +1,74 @@
+"""
+Landing page figures of an instructor.
+
+Every dashboard figure is a correlated COUNT or SUM subquery whose join
+condition is taken from the Instructor relationships, and all of them are
+evaluated in a single statement. Each subquery is an index range scan over
+one instructor's rows, so the cost depends on the instructor's own
+workload rather than on the size of the institution.
+"""
+
+from sqlalchemy import distinct, func, select
+from database import db
+from application.models.assignment import Assignment
+from application.models.attendance_rollup import AttendanceRollup
+from application.models.course import Course
+from application.models.enrollments import Enrollment
+from application.models.grades import Grade
+from application.models.instructors import Instructor
+from application.models.lectures import Lecture
+from application.models.notifications import Notification
+from application.models.submission import Submission
+
+
+def instructor_dashboard(instructor_id):
+    """
+    Return the dashboard figures of one instructor, or None if it does not exist.
+
+    Enrolled students are counted once per instructor even when they take
+    several of the instructor's courses. Grades are posted per course, so a
+    submission counts as ungraded while the student has no grade in the
+    assignment's course posted at or after the submission.
+    """
+    def count(target, *criteria, column=None):
+        query = select(func.count(column) if column is not None else func.count())
+        return query.select_from(target).where(*criteria)
+
+    def correlated(query):
+        return query.correlate(Instructor).scalar_subquery()
+
+    owns_course = Instructor.course.property.primaryjoin
+    submissions = (count(Course, owns_course, column=Submission.id)
+                   .join(Assignment, Assignment.course_id == Course.id)
+                   .join(Assignment.submission))
+    graded = select(Grade.id).where(Grade.student_id == Submission.student_id,
+                                    Grade.course_id == Course.id,
+                                    Grade.date_posted >= Submission.date)
+    rollups = select(func.coalesce(func.sum(AttendanceRollup.present_count), 0),
+                     func.coalesce(func.sum(AttendanceRollup.absent_count), 0))
+    rollups = rollups.where(AttendanceRollup.instructor_id == Instructor.id)
+    query = select(
+        correlated(count(Course, owns_course)).label('courses'),
+        correlated(count(Lecture, Instructor.lecture.property.primaryjoin)).label('lectures'),
+        correlated(count(Course, owns_course, Enrollment.status == 'enrolled',
+                         column=distinct(Enrollment.student_id)).join(Course.enrollment)
+                   ).label('enrolled_students'),
+        correlated(submissions).label('submissions'),
+        correlated(submissions.where(~graded.exists())).label('ungraded_submissions'),
+        correlated(rollups.with_only_columns(rollups.selected_columns[0])).label('present'),
+        correlated(rollups.with_only_columns(rollups.selected_columns[1])).label('absent'),
+        correlated(count(Notification, Instructor.notification.property.primaryjoin,
+                         Notification.read_status == 'unread')).label('unread_notifications'),
+    ).where(Instructor.id == instructor_id)
+    row = db.session.execute(query).first()
+    if row is None:
+        return None
+    figures = row._asdict()
+    present, absent = figures.pop('present'), figures.pop('absent')
+    attended = present + absent
+    figures['attendance'] = {
+        'present': present,
+        'absent': absent,
+        'rate': round(present / attended, 4) if attended else None
+    }
+    return {'instructor_id': instructor_id, **figures}
@@ -0,0 +1,67 @@
+"""
+Comment activity of discussions.
+
+Comment counts, distinct participants and the first and last activity of
+every selected discussion are one GROUP BY over the discussion's comments,
+joined through the Discussion.comments relationship, so a course page
+gets the figures of all its discussions from a single statement. Daily
+comment counts of one discussion are a second GROUP BY on the comment
+date, which the ``(discussion_id, posted_at)`` index serves in order.
+"""
+
+from sqlalchemy import distinct, func, select
+from database import db
+from application.models.comments import Comment
+from application.models.discussion import Discussion
+
+SECONDS_PER_DAY = 86400
+
+
+def discussion_activity(*criteria):
+    """
+    Return activity figures for the discussions matching ``criteria``.
+
+    Participants are the distinct students and instructors who commented.
+    The last activity is the latest comment posted or edited.
+    ``comments_per_day`` spreads the comments over the days from the first
+    comment to the last activity, counting at least one day. Discussions
+    without comments report zeros and None.
+    """
+    query = (select(Discussion.id.label('discussion_id'), Discussion.course_id,
+                    Discussion.title,
+                    func.count(Comment.id).label('comments'),
+                    func.count(distinct(Comment.student_id)).label('students'),
+                    func.count(distinct(Comment.instructor_id)).label('instructors'),
+                    func.min(Comment.posted_at).label('first_comment_at'),
+                    func.max(Comment.posted_at).label('last_posted_at'),
+                    func.max(Comment.edited_at).label('last_edited_at'))
+             .outerjoin(Discussion.comments)
+             .where(*criteria)
+             .group_by(Discussion.id)
+             .order_by(Discussion.id))
+    activity = []
+    for row in db.session.execute(query):
+        figures = row._asdict()
+        first = figures['first_comment_at']
+        last = max(filter(None, (figures.pop('last_posted_at'), figures.pop('last_edited_at'))),
+                   default=None)
+        figures['participants'] = figures['students'] + figures['instructors']
+        figures['comments_per_day'] = None
+        if first is not None:
+            days = max(1.0, (last - first).total_seconds() / SECONDS_PER_DAY)
+            figures['comments_per_day'] = round(figures['comments'] / days, 2)
+            figures['first_comment_at'] = first.isoformat()
+        figures['last_activity_at'] = last.isoformat() if last is not None else None
+        activity.append(figures)
+    return activity
+
+
+def daily_comment_counts(discussion_id):
+    """Return ``{'date', 'comments'}`` for every day a comment was posted in a discussion."""
+    day = func.date(Comment.posted_at)
+    query = (select(day, func.count())
+             .where(Comment.discussion_id == discussion_id)
+             .group_by(day)
+             .order_by(day))
+    return [{'date': str(date), 'comments': count}
+            for date, count in db.session.execute(query)]
@@ -0,0 +1,171 @@
+"""
+Per-course grade histograms, letter-grade counts and z-scores.
+
+Histograms, letter-grade counts and z-scores need every grade row, so the
+``(course_id, student_id, grade)`` columns are fetched in one statement
+straight into a flat int64 buffer. Course IDs are mapped to dense indexes
+with a lookup array, after which every per-course figure is a single
+``numpy.bincount`` over all courses at once and z-scores are one
+vectorized expression over the whole grade column. No step sorts the data
+or loops over courses in Python.
+"""
+
+from itertools import chain
+import click
+import numpy as np
+from flask.cli import with_appcontext
+from sqlalchemy import select
+from database import db
+from application.models.grades import Grade
+
+DEFAULT_BIN_WIDTH = 10
+MAX_GRADE = 100
+LETTER_GRADES = (('F', 1), ('D', 60), ('C', 70), ('B', 80), ('A', 90))
+
+
+def grade_arrays(course_ids=None):
+    """
+    Fetch the grade rows as ``(course_ids, student_ids, grades)`` int64 arrays.
+
+    The rows of a single SELECT are read from the DBAPI cursor and flattened
+    into one buffer as they arrive, so neither Row objects nor an
+    intermediate list of rows is built. The columns are plain integers and
+    need no result processing.
+    """
+    query = select(Grade.course_id, Grade.student_id, Grade.grade)
+    if course_ids is not None:
+        query = query.where(Grade.course_id.in_(course_ids))
+    result = db.session.connection().execute(query)
+    try:
+        rows = np.fromiter(chain.from_iterable(result.cursor), dtype=np.int64)
+    finally:
+        result.close()
+    rows = rows.reshape(-1, 3)
+    return rows[:, 0], rows[:, 1], rows[:, 2]
+
+
+def dense_index(values):
+    """
+    Map ``values`` to ``0..n-1`` in ascending order of value.
+
+    Returns the distinct values and the index of every element. Unlike
+    ``numpy.unique`` this is linear in the number of elements, since IDs
+    are small non-negative integers.
+    """
+    present = np.bincount(values) > 0 if len(values) else np.zeros(0, dtype=bool)
+    distinct_values = np.flatnonzero(present)
+    lookup = np.cumsum(present) - 1
+    return distinct_values, lookup[values]
+
+
+def grouped_counts(index, buckets, groups, width):
+    """Count ``buckets`` (``0..width-1``) per group as a ``groups x width`` matrix."""
+    return np.bincount(index * width + buckets, minlength=groups * width).reshape(groups, width)
+
+
+def grade_distribution(course_ids, student_ids, grades, bin_width=DEFAULT_BIN_WIDTH):
+    """
+    Histograms, letter-grade counts and z-scores of every course at once.
+
+    Histogram bins are ``bin_width`` grades wide starting at 1. A grade's
+    z-score uses the population standard deviation of its course and is 0
+    in a course where every grade is the same.
+    """
+    courses, index = dense_index(course_ids)
+    counts = np.bincount(index, minlength=len(courses))
+    means = np.bincount(index, weights=grades, minlength=len(courses)) / np.maximum(counts, 1)
+    deviations = grades - means[index]
+    stds = np.sqrt(np.bincount(index, weights=deviations ** 2, minlength=len(courses))
+                   / np.maximum(counts, 1))
+    spread = stds[index]
+    z_scores = np.divide(deviations, spread, out=np.zeros_like(deviations), where=spread > 0)
+    cutoffs = np.array([cutoff for _, cutoff in LETTER_GRADES])
+    return {
+        'courses': courses,
+        'counts': counts,
+        'means': means,
+        'stds': stds,
+        'histograms': grouped_counts(index, (grades - 1) // bin_width, len(courses),
+                                     -(-MAX_GRADE // bin_width)),
+        'letters': grouped_counts(index, np.searchsorted(cutoffs, grades, side='right') - 1,
+                                  len(courses), len(LETTER_GRADES)),
+        'index': index,
+        'student_ids': student_ids,
+        'grades': grades,
+        'z_scores': z_scores
+    }
+
+
+def distribution_report(distribution, bin_width=DEFAULT_BIN_WIDTH, z_scores=False,
+                        course_ids=None):
+    """
+    Turn the arrays of ``grade_distribution`` into one dictionary per course.
+
+    Every graded course is reported when ``course_ids`` is None; listed
+    courses without grades are reported with a count of zero. With
+    ``z_scores`` every course also lists the z-score of each of its grades;
+    the grade rows are grouped by course with one stable sort.
+    """
+    positions = {course_id: position
+                 for position, course_id in enumerate(distribution['courses'].tolist())}
+    starts = np.concatenate(([0], np.cumsum(distribution['counts']))).tolist()
+    if z_scores:
+        order = np.argsort(distribution['index'], kind='stable')
+        columns = [distribution[name][order].tolist()
+                   for name in ('student_ids', 'grades', 'z_scores')]
+    lowers = np.arange(1, MAX_GRADE + 1, bin_width).tolist()
+    bins = list(zip(lowers, [min(lower + bin_width - 1, MAX_GRADE) for lower in lowers]))
+    report = []
+    for course_id in positions if course_ids is None else course_ids:
+        position = positions.get(course_id)
+        if position is None:
+            entry = {'course_id': course_id, 'count': 0, 'mean': None, 'std': None,
+                     'histogram': [0] * len(bins), 'letters': [0] * len(LETTER_GRADES)}
+        else:
+            entry = {
+                'course_id': course_id,
+                'count': int(distribution['counts'][position]),
+                'mean': round(float(distribution['means'][position]), 4),
+                'std': round(float(distribution['stds'][position]), 4),
+                'histogram': distribution['histograms'][position].tolist(),
+                'letters': distribution['letters'][position].tolist()
+            }
+        entry['histogram'] = [{'min': low, 'max': high, 'count': count}
+                              for (low, high), count in zip(bins, entry['histogram'])]
+        entry['letters'] = dict(zip([letter for letter, _ in LETTER_GRADES], entry['letters']))
+        if z_scores:
+            rows = (slice(starts[position], starts[position + 1]) if position is not None
+                    else slice(0, 0))
+            entry['z_scores'] = [
+                {'student_id': student_id, 'grade': grade, 'z_score': round(z_score, 4)}
+                for student_id, grade, z_score in zip(*(column[rows] for column in columns))
+            ]
+        report.append(entry)
+    return report
+
+
+@click.command('grade-distribution')
+@click.option('--course-id', 'course_ids', type=int, multiple=True,
+              help='Limit the report to this course; may be repeated.')
+@click.option('--bin-width', type=click.IntRange(1, MAX_GRADE), default=DEFAULT_BIN_WIDTH,
+              show_default=True, help='Width of the histogram bins in grade points.')
+@click.option('--z-scores', 'z_scores_path', type=click.Path(dir_okay=False, writable=True),
+              help='Write course_id,student_id,grade,z_score rows to this CSV file.')
+@with_appcontext
+def grade_distribution_command(course_ids, bin_width, z_scores_path):
+    """Print per-course grade histograms and letter-grade counts."""
+    distribution = grade_distribution(*grade_arrays(list(course_ids) or None), bin_width)
+    letters = [letter for letter, _ in LETTER_GRADES]
+    for entry in distribution_report(distribution, bin_width):
+        buckets = ' '.join(f"{letter}={entry['letters'][letter]}" for letter in letters)
+        histogram = ' '.join(str(bucket['count']) for bucket in entry['histogram'])
+        click.echo(f"course {entry['course_id']}: n={entry['count']} mean={entry['mean']} "
+                   f"std={entry['std']} {buckets} histogram=[{histogram}]")
+    if z_scores_path:
+        np.savetxt(z_scores_path,
+                   np.column_stack([distribution['courses'][distribution['index']],
+                                    distribution['student_ids'],
+                                    distribution['grades'], distribution['z_scores']]),
+                   fmt=['%d', '%d', '%d', '%.4f'], delimiter=',',
+                   header='course_id,student_id,grade,z_score', comments='')
+        click.echo(f"Wrote {len(distribution['z_scores'])} z-scores to {z_scores_path}.")
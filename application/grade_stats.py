@@ -0,0 +1,91 @@
+"""
+Course grade statistics computed from database columns.
+
+Grades are integers between 1 and 100, so a course's grade distribution is
+fully described by at most 100 ``(grade, count)`` pairs. These pairs are
+produced by a GROUP BY that SQLite answers from the ``(course_id, grade)``
+index alone, and every statistic is derived from them with numpy. The cost
+therefore grows with the number of courses, not the number of grade rows,
+and no ORM objects are ever created.
+"""
+
+import numpy as np
+from sqlalchemy import func, select
+from database import db
+from application.models.grades import Grade
+
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def grade_distributions(course_ids=None):
+    """
+    Return ``{course_id: (grades, counts)}`` for the given courses.
+
+    ``grades`` holds the distinct grades of a course in ascending order and
+    ``counts`` how often each occurs. All courses are included when
+    ``course_ids`` is None.
+    """
+    query = (select(Grade.course_id, Grade.grade, func.count())
+             .group_by(Grade.course_id, Grade.grade)
+             .order_by(Grade.course_id, Grade.grade))
+    if course_ids is not None:
+        query = query.where(Grade.course_id.in_(course_ids))
+    rows = np.array(db.session.execute(query).all(), dtype=np.int64).reshape(-1, 3)
+    # Rows arrive ordered by course, so each course is one contiguous slice.
+    course_ids, starts = np.unique(rows[:, 0], return_index=True)
+    return {int(course_id): (selected[:, 1], selected[:, 2])
+            for course_id, selected in zip(course_ids, np.split(rows, starts[1:]))}
+
+
+def weighted_percentiles(values, counts, percentiles):
+    """
+    Percentiles of the data set in which ``values[i]`` occurs ``counts[i]`` times.
+
+    The result matches ``numpy.percentile`` on the expanded data with its
+    default linear interpolation, without expanding it.
+    """
+    cumulative = np.cumsum(counts)
+    ranks = np.asarray(percentiles, dtype=float) / 100 * (cumulative[-1] - 1)
+    lower = values[np.searchsorted(cumulative, np.floor(ranks), side='right')]
+    upper = values[np.searchsorted(cumulative, np.ceil(ranks), side='right')]
+    return lower + (upper - lower) * (ranks - np.floor(ranks))
+
+
+def summarize(values, counts, percentiles=DEFAULT_PERCENTILES):
+    """
+    Summary statistics of a ``(values, counts)`` distribution.
+
+    ``std`` is the population standard deviation. Every statistic is None
+    for an empty distribution.
+    """
+    total = int(counts.sum()) if len(counts) else 0
+    if not total:
+        return {'count': 0, 'mean': None, 'median': None, 'std': None,
+                'min': None, 'max': None,
+                'percentiles': {f"p{p:g}": None for p in percentiles}}
+    mean = float(np.dot(values, counts) / total)
+    variance = float(np.dot((values - mean) ** 2, counts) / total)
+    median, *quantiles = weighted_percentiles(values, counts, (50, *percentiles))
+    return {
+        'count': total,
+        'mean': round(mean, 4),
+        'median': float(median),
+        'std': round(variance ** 0.5, 4),
+        'min': int(values[0]),
+        'max': int(values[-1]),
+        'percentiles': {f"p{p:g}": float(q) for p, q in zip(percentiles, quantiles)}
+    }
+
+
+def course_grade_stats(course_ids=None, percentiles=DEFAULT_PERCENTILES):
+    """
+    Return grade statistics keyed by course ID.
+
+    Courses listed in ``course_ids`` without any grades are reported with a
+    count of zero.
+    """
+    distributions = grade_distributions(course_ids)
+    empty = (np.array([], dtype=np.int64), np.array([], dtype=np.int64))
+    ids = sorted(distributions) if course_ids is None else course_ids
+    return {course_id: summarize(*distributions.get(course_id, empty), percentiles)
+            for course_id in ids}
@@ -0,0 +1,282 @@
+"""
+Password hashing off the request thread.
+
+argon2 hashes cost tens of milliseconds of CPU each. ``password_hashing``
+runs them in a pool of HASHING_WORKERS processes, so hashing spreads over
+all cores instead of occupying the web worker that received the request.
+``hash_many`` hashes a whole batch, such as the passwords of a bulk
+import, with one ``map`` over the pool.
+
+At most HASHING_MAX_PENDING hashes may be queued or running at once. A
+caller that finds the queue full waits up to HASHING_QUEUE_TIMEOUT seconds
+for a slot and then gets a ``HashingBusyError``, which the API answers
+with 503 and a Retry-After header, so a burst of registrations or logins
+is shed instead of piling up behind the pool. ``stats()`` reports the
+current queue depth, its peak and the rejected calls.
+
+The pool is created on first use, after any server worker fork. With
+HASHING_WORKERS set to 0, or outside an app that called ``init_app``,
+hashes are computed on the calling thread.
+
+The argon2 time cost, memory cost (KiB) and parallelism come from
+ARGON2_TIME_COST, ARGON2_MEMORY_COST and ARGON2_PARALLELISM. A successful
+login whose stored hash was made with other parameters returns a new hash
+from the same worker call, so changing the settings upgrades (or
+downgrades) hashes as users log in. ``flask benchmark-argon2`` picks
+parameters that take a target time per hash on the current machine.
+"""
+
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import argon2
+import click
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from flask import current_app
+from flask.cli import with_appcontext
+
+MAX_PENDING = 64
+QUEUE_TIMEOUT = 2.0
+DEFAULT_PARAMETERS = {'time_cost': argon2.DEFAULT_TIME_COST,
+                      'memory_cost': argon2.DEFAULT_MEMORY_COST,
+                      'parallelism': argon2.DEFAULT_PARALLELISM}
+MAX_TIME_COST = 64
+BENCHMARK_SAMPLES = 3
+
+_state = {'hasher': PasswordHasher(**DEFAULT_PARAMETERS)}
+
+
+class HashingBusyError(RuntimeError):
+    """Raised when the hashing queue stays full for longer than the queue timeout."""
+
+
+def argon2_parameters(config):
+    """Read the argon2 cost parameters from ``ARGON2_*`` settings."""
+    return {name: config.get(f'ARGON2_{name.upper()}', default)
+            for name, default in DEFAULT_PARAMETERS.items()}
+
+
+def configure_hasher(parameters):
+    """Hash with ``parameters`` in this process; the pool's process initializer."""
+    _state['hasher'] = PasswordHasher(**parameters)
+
+
+def hash_password(password):
+    """Hash ``password`` with argon2; runs inside the pool's processes."""
+    return _state['hasher'].hash(password)
+
+
+def verify_password(password_hash, password):
+    """Check ``password`` against an argon2 hash; runs inside the pool's processes."""
+    try:
+        return _state['hasher'].verify(password_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def verify_and_rehash(password_hash, password):
+    """
+    Check ``password`` and rehash it if ``password_hash`` uses other parameters.
+
+    Returns ``(matches, new_hash)``; ``new_hash`` is None unless the
+    password matched and the stored hash is outdated.
+    """
+    if not verify_password(password_hash, password):
+        return False, None
+    hasher = _state['hasher']
+    return True, hasher.hash(password) if hasher.check_needs_rehash(password_hash) else None
+
+
+class HashingService:  # pylint: disable=too-many-instance-attributes
+    """Flask extension running password hashes in a bounded process pool."""
+
+    def __init__(self):
+        self.workers = 0
+        self.max_pending = MAX_PENDING
+        self.queue_timeout = QUEUE_TIMEOUT
+        self.parameters = dict(DEFAULT_PARAMETERS)
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(MAX_PENDING)
+        self._lock = threading.Lock()
+        self._metrics = {'queue_depth': 0, 'peak_queue_depth': 0, 'rejected': 0}
+
+    def init_app(self, app):
+        """Read the pool size and queue limits from ``HASHING_*`` settings."""
+        self.shutdown()
+        self.workers = app.config.get('HASHING_WORKERS', os.cpu_count() or 1)
+        self.max_pending = app.config.get('HASHING_MAX_PENDING', MAX_PENDING)
+        self.queue_timeout = app.config.get('HASHING_QUEUE_TIMEOUT', QUEUE_TIMEOUT)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self.parameters = argon2_parameters(app.config)
+        configure_hasher(self.parameters)
+        app.extensions['password_hashing'] = self
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     initializer=configure_hasher,
+                                                     initargs=(self.parameters,))
+            return self._executor
+
+    def _acquire(self):
+        # pylint: disable-next=consider-using-with
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self._metrics['rejected'] += 1
+            raise HashingBusyError("Password hashing is overloaded, retry later")
+        with self._lock:
+            metrics = self._metrics
+            metrics['queue_depth'] += 1
+            metrics['peak_queue_depth'] = max(metrics['peak_queue_depth'], metrics['queue_depth'])
+
+    def _finish(self, _future=None):
+        with self._lock:
+            self._metrics['queue_depth'] -= 1
+        self._slots.release()
+
+    def run(self, function, *args):
+        """
+        Run ``function(*args)`` in the pool and wait for its result.
+
+        Raises HashingBusyError when no queue slot frees up within the
+        queue timeout.
+        """
+        if not self.workers:
+            return function(*args)
+        self._acquire()
+        executor = self._pool()
+        try:
+            future = executor.submit(function, *args)
+        except BaseException:
+            self._finish()
+            raise
+        future.add_done_callback(self._finish)
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+
+    def map(self, function, items):
+        """
+        Run ``function`` on each of ``items`` across the pool's processes.
+
+        The batch takes one queue slot and is sent to the workers in one
+        chunk per process, so a large batch costs a handful of round trips
+        instead of one per item. Results are returned in order.
+        """
+        items = list(items)
+        if not self.workers or not items:
+            return [function(item) for item in items]
+        self._acquire()
+        executor = self._pool()
+        try:
+            chunksize = -(-len(items) // self.workers)
+            return list(executor.map(function, items, chunksize=chunksize))
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+        finally:
+            self._finish()
+
+    def _discard(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+
+    def hash(self, password):
+        """Return the argon2 hash of ``password``."""
+        return self.run(hash_password, password)
+
+    def hash_many(self, passwords):
+        """Return the argon2 hashes of ``passwords``, hashed in parallel."""
+        return self.map(hash_password, passwords)
+
+    def verify(self, password_hash, password):
+        """Return whether ``password`` matches ``password_hash``."""
+        return self.run(verify_password, password_hash, password)
+
+    def verify_and_rehash(self, password_hash, password):
+        """Return ``(matches, new_hash)``, with a new hash when the stored one is outdated."""
+        return self.run(verify_and_rehash, password_hash, password)
+
+    @property
+    def queue_depth(self):
+        """Number of hashes queued or running."""
+        return self._metrics['queue_depth']
+
+    def stats(self):
+        """Pool size, queue limits, current and peak queue depth and rejected calls."""
+        with self._lock:
+            return {'workers': self.workers, 'max_pending': self.max_pending, **self._metrics}
+
+    def shutdown(self):
+        """Stop the pool's processes; the next hash starts a new pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+password_hashing = HashingService()
+
+
+def time_hash(parameters, samples=BENCHMARK_SAMPLES):
+    """Median milliseconds one hash takes with ``parameters`` on this machine."""
+    hasher = PasswordHasher(**parameters)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hasher.hash('benchmark password')
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def benchmark_parameters(target_ms, parallelism, max_memory_cost):
+    """
+    Pick the costliest parameters whose hashes take at most ``target_ms``.
+
+    Memory is the main cost: the largest power-of-two fraction of
+    ``max_memory_cost`` KiB that meets the target with one pass is kept,
+    and passes are then added while the target still holds. Returns the
+    parameters and their measured milliseconds per hash.
+    """
+    minimum = 8 * parallelism
+    parameters = {'time_cost': 1, 'memory_cost': max(minimum, max_memory_cost),
+                  'parallelism': parallelism}
+    elapsed = time_hash(parameters)
+    while elapsed > target_ms and parameters['memory_cost'] // 2 >= minimum:
+        parameters['memory_cost'] //= 2
+        elapsed = time_hash(parameters)
+    while parameters['time_cost'] < MAX_TIME_COST:
+        slower = dict(parameters, time_cost=parameters['time_cost'] + 1)
+        slower_elapsed = time_hash(slower)
+        if slower_elapsed > target_ms:
+            break
+        parameters, elapsed = slower, slower_elapsed
+    return parameters, elapsed
+
+
+@click.command('benchmark-argon2')
+@click.option('--target-ms', type=click.FloatRange(min=1), default=250.0, show_default=True,
+              help='Time one hash should take.')
+@click.option('--parallelism', type=click.IntRange(min=1), default=None,
+              help='Lanes per hash; defaults to ARGON2_PARALLELISM.')
+@click.option('--max-memory', 'max_memory_cost', type=click.IntRange(min=8),
+              default=262144, show_default=True, help='Largest memory cost to try, in KiB.')
+@with_appcontext
+def benchmark_argon2_command(target_ms, parallelism, max_memory_cost):
+    """Find argon2 parameters that hash in about --target-ms on this machine."""
+    current = argon2_parameters(current_app.config)
+    parameters, elapsed = benchmark_parameters(
+        target_ms, parallelism or current['parallelism'], max_memory_cost)
+    click.echo(f"Current settings take {time_hash(current):.1f} ms per hash.")
+    click.echo(f"Suggested settings take {elapsed:.1f} ms per hash "
+               f"(target {target_ms:g} ms):")
+    for name, value in parameters.items():
+        click.echo(f"ARGON2_{name.upper()}={value}")
@@ -0,0 +1,340 @@
+"""
+Course leaderboards ranked by each student's average grade.
+
+course_standings keeps every student's grade total, count and average per
+course. Every flush that writes Grade rows through the ORM turns them into
+total/count deltas and applies them with an upsert in the same
+transaction, like the attendance rollups; the bulk grade endpoints
+recompute the standings of the students they touched instead. Standings
+of students and courses deleted in the same flush are dropped rather than
+decremented.
+
+Each change also bumps the course's row in course_standing_revisions.
+Every worker keeps an in-process ``Leaderboard`` per course: the
+standings held in a list sorted by ``(-average, student_id)``, so a rank
+is a binary search and the top of the board is a slice. A board is built
+once from course_standings and then kept current by applying the
+standings changed by this worker's own commits; when the stored revision
+shows a change made elsewhere, such as by another worker or a bulk write,
+the board is rebuilt on its next read. Students with equal averages share
+a rank.
+"""
+
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import delete, distinct, event, func, insert, inspect, select, union
+from sqlalchemy.orm import Session
+from database import db
+from application.models.course import Course
+from application.models.course_standing import CourseStanding, CourseStandingRevision
+from application.models.grades import Grade
+from application.models.students import Student
+from application.rollups import UPSERTS, deleted_owners
+
+LEADERBOARD_SIZE = 10
+KEY_COLUMNS = ('course_id', 'student_id')
+OWNER_MODELS = {Course: 'course_id', Student: 'student_id'}
+
+
+class Leaderboard:
+    """Standings of one course sorted by descending average, as of one revision."""
+
+    def __init__(self, revision, standings):
+        self.revision = revision
+        self.standings = dict(standings)
+        self.keys = sorted((-average, student_id)
+                           for student_id, (average, _) in self.standings.items())
+
+    def __len__(self):
+        return len(self.keys)
+
+    def rank_of(self, average):
+        """Rank of a student with ``average``: one more than the number of higher averages."""
+        return bisect_left(self.keys, (-average,)) + 1
+
+    def entry(self, student_id):
+        """Rank, average and grade count of one student, or None if they have no grades."""
+        standing = self.standings.get(student_id)
+        if standing is None:
+            return None
+        average, grade_count = standing
+        return {'rank': self.rank_of(average), 'student_id': student_id,
+                'average': round(average, 2), 'grade_count': grade_count}
+
+    def top(self, limit):
+        """The ``limit`` best placed students."""
+        return [self.entry(student_id) for _, student_id in self.keys[:limit]]
+
+    def update(self, student_id, standing):
+        """Move one student to their new ``(average, grade_count)``, or remove them on None."""
+        previous = self.standings.pop(student_id, None)
+        if previous is not None:
+            del self.keys[bisect_left(self.keys, (-previous[0], student_id))]
+        if standing is not None:
+            self.standings[student_id] = standing
+            insort(self.keys, (-standing[0], student_id))
+
+
+class LeaderboardRegistry:
+    """Thread-safe store of the leaderboards built by this process."""
+
+    def __init__(self):
+        self._boards = {}
+        self._lock = threading.Lock()
+
+    def read(self, course_id, revision, load, view):
+        """
+        Call ``view`` with the course's board as of ``revision``.
+
+        The board is rebuilt from ``load()`` when this process holds none or
+        an older one.
+        """
+        with self._lock:
+            board = self._boards.get(course_id)
+        if board is None or board.revision != revision:
+            board = Leaderboard(revision, load())
+            with self._lock:
+                current = self._boards.get(course_id)
+                if current is None or current.revision <= revision:
+                    self._boards[course_id] = board
+        with self._lock:
+            return view(board)
+
+    def apply(self, course_id, from_revision, to_revision, standings):
+        """Apply the standings committed by this process, or drop a board they do not follow."""
+        with self._lock:
+            board = self._boards.get(course_id)
+            if board is None:
+                return
+            if board.revision != from_revision:
+                del self._boards[course_id]
+                return
+            for student_id, standing in standings.items():
+                board.update(student_id, standing)
+            board.revision = to_revision
+
+    def clear(self):
+        """Drop every board."""
+        with self._lock:
+            self._boards.clear()
+
+
+leaderboards = LeaderboardRegistry()
+
+
+def current_values(instance):
+    """Course, student and grade of a grade row as it is now."""
+    return instance.course_id, instance.student_id, instance.grade
+
+
+def previous_values(instance):
+    """Course, student and grade of a grade row as it was last loaded or flushed."""
+    state = inspect(instance)
+    values = []
+    for name in KEY_COLUMNS + ('grade',):
+        history = state.attrs[name].history
+        previous = history.deleted or history.unchanged
+        values.append(previous[0] if previous else getattr(instance, name))
+    return tuple(values)
+
+
+def grade_deltas(session):
+    """Sum the ``[total, count]`` changes of each standing caused by one flush."""
+    deltas = defaultdict(lambda: [0, 0])
+
+    def add(values, sign):
+        course_id, student_id, grade = values
+        delta = deltas[(course_id, student_id)]
+        delta[0] += sign * grade
+        delta[1] += sign
+
+    for instance in session.new:
+        if isinstance(instance, Grade):
+            add(current_values(instance), 1)
+    for instance in session.deleted:
+        if isinstance(instance, Grade):
+            add(previous_values(instance), -1)
+    for instance in session.dirty:
+        if isinstance(instance, Grade) and session.is_modified(instance):
+            add(previous_values(instance), -1)
+            add(current_values(instance), 1)
+    return {key: delta for key, delta in deltas.items() if delta != [0, 0]}
+
+
+def bump_revisions(connection, course_ids):
+    """Advance the revision of ``course_ids`` and return ``{course_id: (old, new)}``."""
+    table = CourseStandingRevision.__table__
+    course_ids = sorted(set(course_ids))
+    if not course_ids:
+        return {}
+    old = dict(connection.execute(
+        select(table.c.course_id, table.c.revision).where(table.c.course_id.in_(course_ids))
+    ).all())
+    statement = UPSERTS[connection.dialect.name](table)
+    statement = statement.on_conflict_do_update(index_elements=['course_id'],
+                                                set_={'revision': table.c.revision + 1})
+    connection.execute(statement, [{'course_id': course_id, 'revision': 1}
+                                   for course_id in course_ids])
+    return {course_id: (old.get(course_id, 0), old.get(course_id, 0) + 1)
+            for course_id in course_ids}
+
+
+def apply_deltas(connection, deltas):
+    """
+    Add ``deltas`` to the standing rows and return the changed standings.
+
+    Rows left without grades are removed. The result maps each changed
+    course to ``{student_id: (average, grade_count) or None}``.
+    """
+    table = CourseStanding.__table__
+    statement = UPSERTS[connection.dialect.name](table)
+    total = table.c.grade_total + statement.excluded.grade_total
+    count = table.c.grade_count + statement.excluded.grade_count
+    statement = statement.on_conflict_do_update(
+        index_elements=list(KEY_COLUMNS),
+        set_={'grade_total': total, 'grade_count': count,
+              'average': total * 1.0 / func.nullif(count, 0)}
+    )
+    connection.execute(statement, [
+        {'course_id': course_id, 'student_id': student_id, 'grade_total': total_delta,
+         'grade_count': count_delta,
+         'average': total_delta / count_delta if count_delta > 0 else None}
+        for (course_id, student_id), (total_delta, count_delta) in deltas.items()
+    ])
+    course_ids = {course_id for course_id, _ in deltas}
+    connection.execute(delete(table).where(table.c.course_id.in_(course_ids),
+                                           table.c.grade_count <= 0))
+    rows = connection.execute(
+        select(table.c.course_id, table.c.student_id, table.c.average, table.c.grade_count)
+        .where(table.c.course_id.in_(course_ids),
+               table.c.student_id.in_({student_id for _, student_id in deltas}))
+    )
+    changed = defaultdict(dict)
+    for course_id, student_id in deltas:
+        changed[course_id][student_id] = None
+    for course_id, student_id, average, grade_count in rows:
+        if (course_id, student_id) in deltas:
+            changed[course_id][student_id] = (average, grade_count)
+    return changed
+
+
+def drop_owned_standings(connection, owners):
+    """
+    Delete the standings of deleted students and courses.
+
+    The foreign keys cascade on databases that enforce them; this keeps
+    SQLite, which does not, in the same state.
+    """
+    table = CourseStanding.__table__
+    if owners.get('student_id'):
+        connection.execute(delete(table).where(table.c.student_id.in_(owners['student_id'])))
+    if owners.get('course_id'):
+        revisions = CourseStandingRevision.__table__
+        connection.execute(delete(table).where(table.c.course_id.in_(owners['course_id'])))
+        connection.execute(delete(revisions).where(revisions.c.course_id.in_(owners['course_id'])))
+
+
+@event.listens_for(Session, 'after_flush')
+def _maintain_standings(session, _flush_context):
+    """Apply the standing deltas of the grade rows written by this flush."""
+    deltas = grade_deltas(session)
+    owners = deleted_owners(session, OWNER_MODELS)
+    # As with the rollups, rows of deleted owners are dropped outright:
+    # decrementing them would re-insert them against a missing foreign key.
+    dropped = {key for key in deltas
+               if any(key[index] in owners.get(column, ())
+                      for index, column in enumerate(KEY_COLUMNS))}
+    deltas = {key: delta for key, delta in deltas.items() if key not in dropped}
+    if not deltas and not owners:
+        return
+    connection = session.connection()
+    changed = apply_deltas(connection, deltas) if deltas else defaultdict(dict)
+    if owners:
+        drop_owned_standings(connection, owners)
+        # Boards of surviving courses lose the deleted students.
+        for course_id, student_id in dropped:
+            if course_id not in owners.get('course_id', ()):
+                changed[course_id][student_id] = None
+    pending = session.info.setdefault('leaderboard_changes', {})
+    for course_id, (old, new) in bump_revisions(connection, changed).items():
+        from_revision, _, standings = pending.get(course_id, (old, new, {}))
+        standings.update(changed[course_id])
+        pending[course_id] = (from_revision, new, standings)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_committed_standings(session):
+    """Bring this process's boards up to date with the standings it committed."""
+    for course_id, change in session.info.pop('leaderboard_changes', {}).items():
+        leaderboards.apply(course_id, *change)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_standings(session):
+    """Forget standings changed by a transaction that was rolled back."""
+    session.info.pop('leaderboard_changes', None)
+
+
+def load_standings(course_id):
+    """Read the ``{student_id: (average, grade_count)}`` standings of one course."""
+    rows = db.session.execute(
+        select(CourseStanding.student_id, CourseStanding.average, CourseStanding.grade_count)
+        .where(CourseStanding.course_id == course_id)
+    )
+    return {student_id: (average, grade_count) for student_id, average, grade_count in rows}
+
+
+def read_leaderboard(course_id, view):
+    """Call ``view`` with the current leaderboard of ``course_id`` and return its result."""
+    revision = db.session.execute(
+        select(CourseStandingRevision.revision)
+        .where(CourseStandingRevision.course_id == course_id)
+    ).scalar() or 0
+    return leaderboards.read(course_id, revision, lambda: load_standings(course_id), view)
+
+
+def standings_query(student_ids=None):
+    """Aggregate grade rows into standing rows, optionally for some students only."""
+    query = (select(Grade.course_id, Grade.student_id, func.sum(Grade.grade), func.count(),
+                    func.avg(Grade.grade * 1.0))
+             .group_by(Grade.course_id, Grade.student_id))
+    if student_ids is not None:
+        query = query.where(Grade.student_id.in_(student_ids))
+    return query
+
+
+def refresh_course_standings(student_ids=None):
+    """
+    Recompute standing rows from the grades table.
+
+    Only the rows of ``student_ids`` are rebuilt when it is given, otherwise
+    the whole table. The revisions of the affected courses are bumped, so
+    every worker rebuilds their boards. The caller commits.
+    """
+    table = CourseStanding.__table__
+    clear = delete(table)
+    courses = union(select(table.c.course_id), select(distinct(Grade.course_id)))
+    if student_ids is not None:
+        student_ids = list(student_ids)
+        clear = clear.where(table.c.student_id.in_(student_ids))
+        courses = union(select(table.c.course_id).where(table.c.student_id.in_(student_ids)),
+                        select(Grade.course_id).where(Grade.student_id.in_(student_ids)))
+    course_ids = db.session.execute(courses).scalars().all()
+    db.session.execute(clear)
+    db.session.execute(insert(table).from_select(
+        list(KEY_COLUMNS) + ['grade_total', 'grade_count', 'average'],
+        standings_query(student_ids)
+    ))
+    bump_revisions(db.session.connection(), course_ids)
+
+
+@click.command('rebuild-course-standings')
+@with_appcontext
+def rebuild_course_standings_command():
+    """Recompute every course standing from the grades table."""
+    refresh_course_standings()
+    db.session.commit()
+    click.echo(f"Rebuilt {db.session.query(CourseStanding).count()} course standings.")
@@ -5,19 +5,26 @@ This module defines the Assignment model and its associated validations.
 from datetime import datetime
 from sqlalchemy.orm import validates
 from database import db
+from application.models.serializer import SerializerMixin
 
 
-class Assignment(db.Model):
+class Assignment(SerializerMixin, db.Model):
     """Model representing an assignment."""
 
     __tablename__ = 'assignments'
 
+    serialize_fields = ('id', 'title', 'description', 'course_id', 'due_date', 'total_points')
+    isoformat_fields = ('due_date',)
+
     id = db.Column(db.Integer, primary_key=True, nullable=False)
     title = db.Column(db.String(255), nullable=False)
     description = db.Column(db.String(1000), nullable=False)
-    course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False)
+    course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False, index=True)
     due_date = db.Column(db.DateTime, nullable=False)
     total_points = db.Column(db.Integer, nullable=False)
+    version = db.Column(db.Integer, nullable=False, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
 
     course = db.relationship('Course', single_parent=True)
     submission = db.relationship('Submission', back_populates='assignment',
@@ -50,17 +57,6 @@ class Assignment(db.Model):
             raise ValueError("Total points must be greater than or equal to zero")
         return total_points
 
-    def to_dict(self) -> dict:
-        """Convert the Assignment instance to a dictionary."""
-        return {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'course_id': self.course_id,
-            'due_date': self.due_date.isoformat() if self.due_date else None,
-            'total_points': self.total_points
-        }
-
     def __repr__(self) -> str:
         """Return string representation of the model instance."""
         return f"<Assignment {self.title}, ID: {self.id}>"
@@ -0,0 +1,75 @@
+"""
+This module defines the AttendanceRollup model, which keeps running
+attendance counts per student and lecture, and the StudentAttendanceTotal
+model, which keeps one row of counts per student, so attendance rates can
+be read without scanning the attendance table.
+"""
+
+from database import db
+
+
+class AttendanceCounts:
+    """Present and absent counts with the rate derived from them."""
+
+    present_count = db.Column(db.Integer, nullable=False, default=0)
+    absent_count = db.Column(db.Integer, nullable=False, default=0)
+
+    @property
+    def total(self):
+        """Number of attendance records counted."""
+        return self.present_count + self.absent_count
+
+    @property
+    def rate(self):
+        """Share of records marked present, or None when nothing was recorded."""
+        return round(self.present_count / self.total, 4) if self.total else None
+
+
+class AttendanceRollup(AttendanceCounts, db.Model):
+    """Present and absent counts of one student for one lecture and instructor."""
+
+    __tablename__ = 'attendance_rollups'
+
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id', ondelete='CASCADE'),
+                           primary_key=True)
+    lecture_id = db.Column(db.Integer, db.ForeignKey('lectures.id', ondelete='CASCADE'),
+                           primary_key=True)
+    instructor_id = db.Column(db.Integer, db.ForeignKey('instructors.id', ondelete='CASCADE'),
+                              primary_key=True, index=True)
+
+    def to_dict(self):
+        """Return a dictionary representation of the AttendanceRollup instance."""
+        return {
+            'student_id': self.student_id,
+            'lecture_id': self.lecture_id,
+            'instructor_id': self.instructor_id,
+            'present': self.present_count,
+            'absent': self.absent_count,
+            'rate': self.rate
+        }
+
+    def __repr__(self):
+        """Return string representation of the model instance."""
+        return f"<AttendanceRollup {self.student_id}/{self.lecture_id}/{self.instructor_id}>"
+
+
+class StudentAttendanceTotal(AttendanceCounts, db.Model):
+    """Present and absent counts of one student over every lecture."""
+
+    __tablename__ = 'student_attendance_totals'
+
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id', ondelete='CASCADE'),
+                           primary_key=True)
+
+    def to_dict(self):
+        """Return a dictionary representation of the StudentAttendanceTotal instance."""
+        return {
+            'student_id': self.student_id,
+            'present': self.present_count,
+            'absent': self.absent_count,
+            'rate': self.rate
+        }
+
+    def __repr__(self):
+        """Return string representation of the model instance."""
+        return f"<StudentAttendanceTotal {self.student_id}>"
@@ -5,19 +5,30 @@ This module defines the Comment model and its associated validations.
 from datetime import datetime
 from sqlalchemy.orm import validates
 from database import db
+from application.models.serializer import SerializerMixin
 
-class Comment(db.Model):
+class Comment(SerializerMixin, db.Model):
     """Model for comments on discussions."""
 
     __tablename__ = 'comments'
+    __table_args__ = (
+        db.Index('ix_comments_discussion_id_posted_at', 'discussion_id', 'posted_at'),
+    )
+
+    serialize_fields = ('id', 'student_id', 'instructor_id', 'content', 'posted_at', 'edited_at')
+    isoformat_fields = ('posted_at', 'edited_at')
 
     id = db.Column(db.Integer, primary_key=True)
     discussion_id = db.Column(db.Integer, db.ForeignKey('discussions.id'), nullable=False)
-    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
-    instructor_id = db.Column(db.Integer, db.ForeignKey('instructors.id'), nullable=False)
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False, index=True)
+    instructor_id = db.Column(db.Integer, db.ForeignKey('instructors.id'),
+                              nullable=False, index=True)
     content = db.Column(db.String, nullable=False)
     posted_at = db.Column(db.DateTime, nullable=False)
     edited_at = db.Column(db.DateTime, nullable=False)
+    version = db.Column(db.Integer, nullable=False, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
 
     discussion = db.relationship('Discussion', back_populates='comments')
     student = db.relationship('Student', back_populates='comments')
@@ -39,17 +50,6 @@ class Comment(db.Model):
             raise AttributeError("Must be a valid datetime")
         return value
 
-    def to_dict(self):
-        """Convert the Comment instance to a dictionary."""
-        return {
-            'id': self.id,
-            'student_id': self.student_id,
-            'instructor_id': self.instructor_id,
-            'content': self.content,
-            'posted_at': self.posted_at.isoformat(),
-            'edited_at': self.edited_at.isoformat()
-        }
-
     def __repr__(self):
         """Return string representation of the model instance."""
         return f"<Comment {self.id}>"
@@ -6,16 +6,23 @@ to other models such as Instructor, Discussion, Enrollment, and Grade.
 from sqlalchemy.types import JSON
 from sqlalchemy.orm import validates
 from database import db
+from application.models.serializer import SerializerMixin
 
-class Course(db.Model):
+class Course(SerializerMixin, db.Model):
     """Model for courses, including course details and schedule information."""
 
     __tablename__ = 'courses'
 
+    serialize_fields = ('id', 'course_info', 'instructor_id', 'schedule')
+
     id = db.Column(db.Integer, primary_key=True)
     course_info = db.Column(db.String, nullable=False)
-    instructor_id = db.Column(db.Integer, db.ForeignKey('instructors.id'), nullable=False)
+    instructor_id = db.Column(db.Integer, db.ForeignKey('instructors.id'),
+                              nullable=False, index=True)
     schedule = db.Column(JSON, nullable=False)
+    version = db.Column(db.Integer, nullable=False, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
 
     instructor = db.relationship('Instructor', back_populates='course')
     discussion = db.relationship('Discussion', back_populates='course',
@@ -46,15 +53,6 @@ class Course(db.Model):
                 raise ValueError("Each entry must contain the day, start time, and end time")
         return schedule
 
-    def to_dict(self):
-        """Convert the Course instance to a dictionary."""
-        return {
-            'id': self.id,
-            'course_info': self.course_info,
-            'instructor_id': self.instructor_id,
-            'schedule': self.schedule
-        }
-
     def __repr__(self):
         """Return string representation of the model instance."""
         return f"<Course {self.course_info}, ID: {self.id}>"
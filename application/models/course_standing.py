@@ -0,0 +1,55 @@
+"""
+This module defines the CourseStanding model, which keeps the running grade
+total and average of each student in each course for the course
+leaderboards, and the CourseStandingRevision model, which counts the
+changes made to a course's standings.
+"""
+
+from database import db
+
+class CourseStanding(db.Model):
+    """Grade total, count and average of one student in one course."""
+
+    __tablename__ = 'course_standings'
+    __table_args__ = (
+        db.Index('ix_course_standings_course_id_average', 'course_id', 'average', 'student_id'),
+    )
+
+    course_id = db.Column(db.Integer, db.ForeignKey('courses.id', ondelete='CASCADE'),
+                          primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id', ondelete='CASCADE'),
+                           primary_key=True)
+    grade_total = db.Column(db.Integer, nullable=False, default=0)
+    grade_count = db.Column(db.Integer, nullable=False, default=0)
+    average = db.Column(db.Float)
+
+    def to_dict(self):
+        """Return a dictionary representation of the CourseStanding instance."""
+        return {
+            'course_id': self.course_id,
+            'student_id': self.student_id,
+            'grade_count': self.grade_count,
+            'average': self.average
+        }
+
+    def __repr__(self):
+        """Return string representation of the model instance."""
+        return f"<CourseStanding {self.course_id}/{self.student_id} average={self.average}>"
+
+
+class CourseStandingRevision(db.Model):
+    """Number of committed changes to the standings of one course."""
+
+    __tablename__ = 'course_standing_revisions'
+
+    course_id = db.Column(db.Integer, db.ForeignKey('courses.id', ondelete='CASCADE'),
+                          primary_key=True)
+    revision = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        """Return a dictionary representation of the CourseStandingRevision instance."""
+        return {'course_id': self.course_id, 'revision': self.revision}
+
+    def __repr__(self):
+        """Return string representation of the model instance."""
+        return f"<CourseStandingRevision {self.course_id} revision={self.revision}>"
@@ -6,8 +6,9 @@ It also validates the title, description, and datetime fields.
 from datetime import datetime
 from sqlalchemy.orm import validates
 from database import db
+from application.models.serializer import SerializerMixin
 
-class Discussion(db.Model):
+class Discussion(SerializerMixin, db.Model):
     """
     Represents a discussion within a course
     It also includes title, description, and related comments.
@@ -15,12 +16,17 @@ class Discussion(db.Model):
 
     __tablename__ = 'discussions'
 
+    serialize_fields = ('id', 'title', 'description', 'course_id', 'created_at', 'updated_at')
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String, nullable=False)
     description = db.Column(db.String, nullable=False)
-    course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False)
+    course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False, index=True)
     created_at = db.Column(db.DateTime, nullable=False)
     updated_at = db.Column(db.DateTime, nullable=False)
+    version = db.Column(db.Integer, nullable=False, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
 
     course = db.relationship('Course', back_populates='discussion')
     comments = db.relationship('Comment', back_populates='discussion',
@@ -44,17 +50,6 @@ class Discussion(db.Model):
             raise AttributeError(f"{key} must be a valid datetime")
         return value
 
-    def to_dict(self):
-        """Convert the Discussion instance to a dictionary representation."""
-        return {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'course_id': self.course_id,
-            'created_at': self.created_at,
-            'updated_at': self.updated_at
-        }
-
     def __repr__(self):
         """Return a string representation of the Discussion instance."""
         return f"<Discussion {self.title}, ID: {self.id}>"
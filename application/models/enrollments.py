@@ -5,19 +5,28 @@ It includes relationships to the Course and Student models, and validates the st
 
 from sqlalchemy.orm import validates
 from database import db
+from application.models.serializer import SerializerMixin
 
-class Enrollment(db.Model):
+class Enrollment(SerializerMixin, db.Model):
     """
     Represents a student's enrollment in a course.
     It includes statuses of 'enrolled', 'pending', or 'dropped'.
     """
 
     __tablename__ = 'enrollments'
+    __table_args__ = (
+        db.Index('ix_enrollments_student_id_course_id', 'student_id', 'course_id'),
+    )
+
+    serialize_fields = ('id', 'course_id', 'student_id', 'status')
 
     id = db.Column(db.Integer, primary_key=True)
-    course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False)
+    course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False, index=True)
     student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
     status = db.Column(db.String, nullable=False)
+    version = db.Column(db.Integer, nullable=False, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
 
     course = db.relationship('Course', back_populates='enrollment')
     student = db.relationship('Student', back_populates='enrollment')
@@ -33,15 +42,6 @@ class Enrollment(db.Model):
             raise AssertionError("Status must be 'enrolled', 'pending', or 'dropped'")
         return status
 
-    def to_dict(self):
-        """Convert the Enrollment instance to a dictionary representation."""
-        return {
-            'id': self.id,
-            'course_id': self.course_id,
-            'student_id': self.student_id,
-            'status': self.status
-        }
-
     def __repr__(self):
         """Return a string representation of the Enrollment instance."""
         return f"<Enrollment {self.id}>"
@@ -6,8 +6,9 @@ validation for file metadata and upload date.
 from datetime import datetime
 from sqlalchemy.orm import validates
 from database import db
+from application.models.serializer import SerializerMixin
 
-class File(db.Model):
+class File(SerializerMixin, db.Model):
     """
     Represents an uploaded file with related metadata.
     It also includes information, relation, and upload date.
@@ -15,10 +16,15 @@ class File(db.Model):
 
     __tablename__ = 'files'
 
+    serialize_fields = ('id', 'file_info', 'related_to', 'upload_date')
+
     id = db.Column(db.Integer, primary_key=True)
     file_info = db.Column(db.String, nullable=False)
     related_to = db.Column(db.String, nullable=False)
     upload_date = db.Column(db.DateTime, nullable=False)
+    version = db.Column(db.Integer, nullable=False, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
 
     @validates('file_info', 'related_to')
     def validate_strings(self, _, value):
@@ -38,15 +44,6 @@ class File(db.Model):
             raise AttributeError("Upload date must be a valid datetime")
         return value
 
-    def to_dict(self):
-        """Return the dictionary representation of the File instance."""
-        return {
-            'id': self.id,
-            'file_info': self.file_info,
-            'related_to': self.related_to,
-            'upload_date': self.upload_date
-        }
-
     def __repr__(self):
         """Return a string representation of the File instance."""
         return f"<File {self.file_info}, ID: {self.id}>"
@@ -6,17 +6,26 @@ for a specific course, including validation for grades and date posted.
 from datetime import datetime
 from sqlalchemy.orm import validates
 from database import db
+from application.models.serializer import SerializerMixin
 
-class Grade(db.Model):
+class Grade(SerializerMixin, db.Model):
     """Represents a student's grade for a course, including the student and course relationships."""
 
     __tablename__ = 'grades'
+    __table_args__ = (
+        db.Index('ix_grades_course_id_grade', 'course_id', 'grade'),
+    )
+
+    serialize_fields = ('id', 'course_id', 'student_id', 'grade', 'date_posted')
 
     id = db.Column(db.Integer, primary_key=True)
-    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False, index=True)
     course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False)
     grade = db.Column(db.Integer, nullable=False)
     date_posted = db.Column(db.DateTime, nullable=False)
+    version = db.Column(db.Integer, nullable=False, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
 
     student = db.relationship('Student', back_populates='grade')
     course = db.relationship('Course', back_populates='grade')
@@ -40,16 +49,6 @@ class Grade(db.Model):
             raise AttributeError(f"{value} must be a valid datetime")
         return value
 
-    def to_dict(self):
-        """Return a dictionary representation of the Grade instance."""
-        return {
-            'id': self.id,
-            'course_id': self.course_id,
-            'student_id': self.student_id,
-            'grade': self.grade,
-            'date_posted': self.date_posted
-        }
-
     def __repr__(self):
         """Return a string representation of the Grade instance."""
         return f"<Grade {self.id}>"
@@ -3,19 +3,19 @@ This module defines the Instructor model, representing an instructor in the syst
 including validation for various fields and password management.
 """
 
-from argon2 import PasswordHasher
-from argon2.exceptions import VerificationError
 from sqlalchemy.orm import validates
 from database import db
+from application.models.serializer import SerializerMixin
+from application.hashing import password_hashing
 
-ph = PasswordHasher()
-
-class Instructor(db.Model):
+class Instructor(SerializerMixin, db.Model):
     """Represents an instructor with personal information, authentication,
     and relationships with other models."""
 
     __tablename__ = 'instructors'
 
+    serialize_fields = ('id', 'email', 'profile_picture', 'department', 'bio')
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String, nullable=False)
     email = db.Column(db.String, nullable=False, unique=True)
@@ -23,6 +23,9 @@ class Instructor(db.Model):
     profile_picture = db.Column(db.String)
     department = db.Column(db.String, nullable=False)
     bio = db.Column(db.String, nullable=False)
+    version = db.Column(db.Integer, nullable=False, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
 
     course = db.relationship(
         'Course', back_populates='instructor', cascade="all, delete-orphan"
@@ -48,15 +51,19 @@ class Instructor(db.Model):
     @password_hash.setter
     def password_hash(self, password):
         """Set the password hash."""
-        self._password_hash = ph.hash(password)
+        self._password_hash = password_hashing.hash(password)
 
     def authenticate(self, password):
-        """Authenticate the instructor by verifying the password."""
-        try:
-            ph.verify(self._password_hash, password)
-            return True
-        except VerificationError:
-            return False
+        """
+        Authenticate the instructor by verifying the password.
+
+        A stored hash made with outdated argon2 parameters is replaced by
+        a fresh hash of the password; the caller commits.
+        """
+        matches, new_hash = password_hashing.verify_and_rehash(self._password_hash, password)
+        if new_hash is not None:
+            self._password_hash = new_hash
+        return matches
 
     @validates('name', 'profile_picture', 'bio', 'department')
     def validate_strings(self, key, value):
@@ -70,26 +77,14 @@ class Instructor(db.Model):
         return value
 
     @validates('email')
-    def validate_email(self, email):
-        """Validate the email format and uniqueness."""
+    def validate_email(self, _, email):
+        """Validate the email format; uniqueness is left to the unique constraint."""
         if not email:
             raise AssertionError('No email provided')
-        if Instructor.query.filter(Instructor.email == email).first():
-            raise AssertionError("Email is already in use")
         if '@' not in email:
             raise AssertionError("Invalid email")
         return email
 
-    def to_dict(self):
-        """Return a dictionary representation of the Instructor instance."""
-        return {
-            'id': self.id,
-            'email': self.email,
-            'profile_picture': self.profile_picture,
-            'department': self.department,
-            'bio': self.bio
-        }
-
     def __repr__(self):
         """Return a string representation of the model instance."""
         return f"<Instructor {self.name}, ID: {self.id}>"
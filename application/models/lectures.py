@@ -7,20 +7,28 @@ from datetime import datetime
 from sqlalchemy.types import JSON
 from sqlalchemy.orm import validates
 from database import db
+from application.models.serializer import SerializerMixin
 
-class Lecture(db.Model):
+class Lecture(SerializerMixin, db.Model):
     """Represents a lecture with information about the lecture,
     its instructor, schedule, and timestamps for creation and updates."""
 
     __tablename__ = 'lectures'
 
+    serialize_fields = ('id', 'lecture_info', 'instructor_id', 'schedule', 'created_at',
+                        'updated_at')
+
     id = db.Column(db.Integer, primary_key=True)
     lecture_info = db.Column(db.String, nullable=False)
-    instructor_id = db.Column(db.Integer, db.ForeignKey('instructors.id'), nullable=False)
+    instructor_id = db.Column(db.Integer, db.ForeignKey('instructors.id'),
+                              nullable=False, index=True)
     schedule = db.Column(JSON, nullable=False)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False,
                         default=datetime.utcnow, onupdate=datetime.utcnow)
+    version = db.Column(db.Integer, nullable=False, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
 
     instructor = db.relationship('Instructor', back_populates='lecture')
     attendance = db.relationship('Attendance', back_populates='lecture')
@@ -59,17 +67,6 @@ class Lecture(db.Model):
             raise ValueError(f"{key} cannot be in the future")
         return value
 
-    def to_dict(self):
-        """Return a dictionary representation of the Lecture instance."""
-        return {
-            'id': self.id,
-            'lecture_info': self.lecture_info,
-            'instructor_id': self.instructor_id,
-            'schedule': self.schedule,
-            'created_at': self.created_at,
-            'updated_at': self.updated_at
-        }
-
     def __repr__(self):
         """Return a string representation of the model instance."""
         return f"<Lecture {self.id}>"
@@ -0,0 +1,59 @@
+"""
+This module defines the models behind the notification read-latency cache:
+per-bucket latency summaries and the time range they cover.
+"""
+
+from database import db
+
+class NotificationLatencyBucket(db.Model):
+    """Read-latency summary of one instructor's notifications sent in one time bucket."""
+
+    __tablename__ = 'notification_latency_buckets'
+
+    unit = db.Column(db.String, primary_key=True)
+    bucket_start = db.Column(db.DateTime, primary_key=True)
+    instructor_id = db.Column(db.Integer, db.ForeignKey('instructors.id'), primary_key=True)
+    count = db.Column(db.Integer, nullable=False)
+    mean = db.Column(db.Float, nullable=False)
+    p50 = db.Column(db.Float, nullable=False)
+    p90 = db.Column(db.Float, nullable=False)
+    p99 = db.Column(db.Float, nullable=False)
+
+    def to_dict(self):
+        """Return a dictionary representation of the NotificationLatencyBucket instance."""
+        return {
+            'bucket_start': self.bucket_start.isoformat(),
+            'instructor_id': self.instructor_id,
+            'count': self.count,
+            'mean': self.mean,
+            'p50': self.p50,
+            'p90': self.p90,
+            'p99': self.p99
+        }
+
+    def __repr__(self):
+        """Return string representation of the model instance."""
+        return (f"<NotificationLatencyBucket {self.unit} {self.bucket_start} "
+                f"instructor={self.instructor_id}>")
+
+
+class NotificationLatencyCoverage(db.Model):
+    """The range of complete buckets of one unit held in notification_latency_buckets."""
+
+    __tablename__ = 'notification_latency_coverage'
+
+    unit = db.Column(db.String, primary_key=True)
+    cached_from = db.Column(db.DateTime, nullable=False)
+    cached_until = db.Column(db.DateTime, nullable=False)
+
+    def to_dict(self):
+        """Return a dictionary representation of the NotificationLatencyCoverage instance."""
+        return {
+            'unit': self.unit,
+            'cached_from': self.cached_from.isoformat(),
+            'cached_until': self.cached_until.isoformat()
+        }
+
+    def __repr__(self):
+        """Return string representation of the model instance."""
+        return f"<NotificationLatencyCoverage {self.unit} {self.cached_from}-{self.cached_until}>"
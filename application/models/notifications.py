@@ -7,22 +7,30 @@ and relationships with other models.
 from datetime import datetime
 from sqlalchemy.orm import validates
 from database import db
+from application.models.serializer import SerializerMixin
 
-class Notification(db.Model):
+class Notification(SerializerMixin, db.Model):
     """Represents a notification sent to a student or instructor,
     including title, message, read status, and timestamps for
     when it was sent and read."""
 
     __tablename__ = 'notifications'
 
+    serialize_fields = ('id', 'title', 'message_body', 'student_id', 'instructor_id', 'read_status',
+                        'sent_date', 'read_date')
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String, nullable=False)
     message_body = db.Column(db.String, nullable=False)
-    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
-    instructor_id = db.Column(db.Integer, db.ForeignKey('instructors.id'), nullable=False)
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False, index=True)
+    instructor_id = db.Column(db.Integer, db.ForeignKey('instructors.id'),
+                              nullable=False, index=True)
     read_status = db.Column(db.String, nullable=False)
-    sent_date = db.Column(db.DateTime, nullable=False)
+    sent_date = db.Column(db.DateTime, nullable=False, index=True)
     read_date = db.Column(db.DateTime, nullable=False)
+    version = db.Column(db.Integer, nullable=False, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
 
     student = db.relationship('Student', back_populates='notification')
     instructor = db.relationship('Instructor', back_populates='notification')
@@ -39,7 +47,7 @@ class Notification(db.Model):
         return value
 
     @validates('read_status')
-    def validate_read_status(self, value):
+    def validate_read_status(self, _, value):
         """Validate that the read_status is either 'read' or 'unread'."""
         if value is None:
             raise ValueError("Read status cannot be None")
@@ -59,19 +67,6 @@ class Notification(db.Model):
             raise ValueError(f"{key} cannot be in the future")
         return value
 
-    def to_dict(self):
-        """Return a dictionary representation of the Notification instance."""
-        return {
-            'id': self.id,
-            'title': self.title,
-            'message_body': self.message_body,
-            'student_id': self.student_id,
-            'instructor_id': self.instructor_id,
-            'read_status': self.read_status,
-            'sent_date': self.sent_date,
-            'read_date': self.read_date
-        }
-
     def __repr__(self):
         """Return string representation of the model instance."""
         return f"<Notification {self.id}>"
@@ -0,0 +1,28 @@
+"""
+Shared dictionary serialization for the API models.
+"""
+
+
+class SerializerMixin:  # pylint: disable=too-few-public-methods
+    """
+    Serialize a model from the columns it lists.
+
+    ``serialize_fields`` names the public columns in output order; they are
+    also the names ``?fields=`` accepts. Columns in ``isoformat_fields``
+    are rendered as ISO 8601 strings.
+    """
+
+    serialize_fields = ()
+    isoformat_fields = ()
+
+    def to_dict(self, fields=None):
+        """Return the listed columns, restricted to ``fields`` when given."""
+        data = {}
+        for name in self.serialize_fields:
+            if fields is not None and name not in fields:
+                continue
+            value = getattr(self, name)
+            if name in self.isoformat_fields and value is not None:
+                value = value.isoformat()
+            data[name] = value
+        return data
@@ -0,0 +1,68 @@
+"""
+This module defines the StudentRisk model, which holds the risk features
+computed for each student by the at-risk scan, and the StudentRiskChange
+model, which records students whose grades, attendance or enrollments
+changed since the scan last ran.
+"""
+
+from database import db
+
+class StudentRisk(db.Model):
+    """Risk features of one student as of the last at-risk scan."""
+
+    __tablename__ = 'student_risks'
+    __table_args__ = (
+        db.Index('ix_student_risks_at_risk_student_id', 'at_risk', 'student_id'),
+    )
+
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id', ondelete='CASCADE'),
+                           primary_key=True)
+    grade_count = db.Column(db.Integer, nullable=False, default=0)
+    recent_grade_mean = db.Column(db.Float)
+    previous_grade_mean = db.Column(db.Float)
+    grade_trend = db.Column(db.Float)
+    attendance_count = db.Column(db.Integer, nullable=False, default=0)
+    attendance_rate = db.Column(db.Float)
+    active_enrollments = db.Column(db.Integer, nullable=False, default=0)
+    falling_grades = db.Column(db.Boolean, nullable=False, default=False)
+    low_attendance = db.Column(db.Boolean, nullable=False, default=False)
+    at_risk = db.Column(db.Boolean, nullable=False, default=False)
+    computed_at = db.Column(db.DateTime, nullable=False)
+
+    def to_dict(self):
+        """Return a dictionary representation of the StudentRisk instance."""
+        return {
+            'student_id': self.student_id,
+            'grade_count': self.grade_count,
+            'recent_grade_mean': self.recent_grade_mean,
+            'previous_grade_mean': self.previous_grade_mean,
+            'grade_trend': self.grade_trend,
+            'attendance_count': self.attendance_count,
+            'attendance_rate': self.attendance_rate,
+            'active_enrollments': self.active_enrollments,
+            'falling_grades': self.falling_grades,
+            'low_attendance': self.low_attendance,
+            'at_risk': self.at_risk,
+            'computed_at': self.computed_at.isoformat()
+        }
+
+    def __repr__(self):
+        """Return string representation of the model instance."""
+        return f"<StudentRisk {self.student_id} at_risk={self.at_risk}>"
+
+
+class StudentRiskChange(db.Model):
+    """A student whose risk features must be recomputed by the next incremental scan."""
+
+    __tablename__ = 'student_risk_changes'
+
+    student_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    version = db.Column(db.Integer, nullable=False, default=1)
+
+    def to_dict(self):
+        """Return a dictionary representation of the StudentRiskChange instance."""
+        return {'student_id': self.student_id, 'version': self.version}
+
+    def __repr__(self):
+        """Return string representation of the model instance."""
+        return f"<StudentRiskChange student={self.student_id} version={self.version}>"
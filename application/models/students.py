@@ -4,19 +4,19 @@ system with fields for personal information, password hashing, and
 validation methods.
 """
 
-from argon2 import PasswordHasher
-from argon2.exceptions import VerificationError
 from sqlalchemy.orm import validates
 from database import db
+from application.models.serializer import SerializerMixin
+from application.hashing import password_hashing
 
-ph = PasswordHasher()
-
-class Student(db.Model):
+class Student(SerializerMixin, db.Model):
     """Represents a student, including personal details, password
     management, and relationships with other models."""
 
     __tablename__ = 'students'
 
+    serialize_fields = ('id', 'username', 'first_name', 'last_name', 'email', 'profile_picture')
+
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String, nullable=False, unique=True)
     first_name = db.Column(db.String(80), nullable=False)
@@ -24,6 +24,9 @@ class Student(db.Model):
     email = db.Column(db.String, nullable=False, unique=True)
     _password_hash = db.Column(db.String, nullable=False)
     profile_picture = db.Column(db.String, nullable=False)
+    version = db.Column(db.Integer, nullable=False, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
 
     submission = db.relationship('Submission', back_populates='student',
                                 cascade="all, delete-orphan")
@@ -46,15 +49,19 @@ class Student(db.Model):
     @password_hash.setter
     def password_hash(self, password):
         """Set the password hash after hashing the provided password."""
-        self._password_hash = ph.hash(password)
+        self._password_hash = password_hashing.hash(password)
 
     def authenticate(self, password):
-        """Verify the provided password against the stored password hash."""
-        try:
-            ph.verify(self._password_hash, password)
-            return True
-        except VerificationError:
-            return False
+        """
+        Verify the provided password against the stored password hash.
+
+        A stored hash made with outdated argon2 parameters is replaced by
+        a fresh hash of the password; the caller commits.
+        """
+        matches, new_hash = password_hashing.verify_and_rehash(self._password_hash, password)
+        if new_hash is not None:
+            self._password_hash = new_hash
+        return matches
 
     @validates('first_name', 'last_name', 'profile_picture')
     def validate_strings(self, key, value):
@@ -68,38 +75,28 @@ class Student(db.Model):
         return value
 
     @validates("username")
-    def validate_username(self, username):
-        """Validate the username for uniqueness and length constraints."""
+    def validate_username(self, _, username):
+        """
+        Validate the username length.
+
+        Uniqueness is left to the unique constraint, so setting the
+        attribute does not query the database.
+        """
         if not username:
             raise AssertionError("No username provided")
-        if Student.query.filter(Student.username == username).first():
-            raise AssertionError("Username is already in use")
         if len(username) < 5 or len(username) > 20:
             raise AssertionError('Username must be between 5 and 20 characters')
         return username
 
     @validates('email')
-    def validate_email(self, email):
-        """Validate the email for uniqueness and format constraints."""
+    def validate_email(self, _, email):
+        """Validate the email format; uniqueness is left to the unique constraint."""
         if not email:
             raise AssertionError('No email provided')
-        if Student.query.filter(Student.email == email).first():
-            raise AssertionError("Email is already in use")
         if '@' not in email:
             raise AssertionError("Invalid email")
         return email
 
-    def to_dict(self):
-        """Return a dictionary representation of the Student instance."""
-        return {
-            'id': self.id,
-            'username': self.username,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'email': self.email,
-            'profile_picture': self.profile_picture
-        }
-
     def __repr__(self):
         """Return string representation of the model instance."""
         return f"<Student {self.username}, ID: {self.id}>"
@@ -7,18 +7,30 @@ with other models.
 from datetime import datetime
 from sqlalchemy.orm import validates
 from database import db
+from application.models.serializer import SerializerMixin
 
-class Submission(db.Model):
+class Submission(SerializerMixin, db.Model):
     """Represents a submission made by a student for an assignment."""
 
     __tablename__ = 'submissions'
+    __table_args__ = (
+        db.Index('ix_submissions_assignment_id_student_id_date',
+                 'assignment_id', 'student_id', 'date'),
+    )
+
+    serialize_fields = ('id', 'student_id', 'assignment_id', 'grade_id', 'submission_info', 'date')
+    isoformat_fields = ('date',)
 
     id = db.Column(db.Integer, primary_key=True)
-    assignment_id = db.Column(db.Integer, db.ForeignKey('assignments.id'), nullable=False)
-    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
+    assignment_id = db.Column(db.Integer, db.ForeignKey('assignments.id'),
+                              nullable=False, index=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False, index=True)
     submission_info = db.Column(db.String, nullable=False)
-    grade_id = db.Column(db.Integer, db.ForeignKey('grades.id'), nullable=False)
+    grade_id = db.Column(db.Integer, db.ForeignKey('grades.id'), nullable=False, index=True)
     date = db.Column(db.DateTime, nullable=False)
+    version = db.Column(db.Integer, nullable=False, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
 
     assignment = db.relationship('Assignment', back_populates='submission')
     student = db.relationship('Student', back_populates='submission')
@@ -45,17 +57,6 @@ class Submission(db.Model):
             raise ValueError(f"{key} cannot be in the future")
         return value
 
-    def to_dict(self):
-        """Return a dictionary representation of the Submission instance."""
-        return {
-            'id': self.id,
-            'student_id': self.student_id,
-            'assignment_id': self.assignment_id,
-            'grade_id': self.grade_id,
-            'submission_info': self.submission_info,
-            'date': self.date.isoformat()
-        }
-
     def __repr__(self):
         """Return string representation of the model instance."""
         return f"<Submission {self.id}>"
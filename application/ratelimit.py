@@ -0,0 +1,206 @@
+"""
+Token-bucket rate limiting for expensive and write endpoints.
+
+Every login attempt costs a full argon2 verification, so a client retrying
+passwords in a loop can keep the hashing workers busy on its own.
+``rate_limiter`` checks each request against token buckets before the view
+runs: a bucket holds up to ``capacity`` tokens, refills at ``capacity``
+tokens per period and each request takes one. A request finding a bucket
+empty is answered with 429 and a Retry-After header giving the seconds
+until the next token.
+
+Limits are set in RATE_LIMITS, keyed by endpoint name (``auth_login``) or,
+for routes without their own entry, by HTTP method (``POST``). Each rule
+maps a dimension to a limit such as ``'5/minute'``: ``ip`` keeps a bucket
+per client address and ``username`` one per ``username`` field of the
+request body, so guessing one account's password from many addresses is
+limited as well. Rules keyed by method share their buckets across every
+route they cover.
+
+Buckets live in a bounded in-process map by default; with
+RATE_LIMIT_BACKEND set to ``sqlite`` they are kept in the RATE_LIMIT_PATH
+file, so all workers of a host draw from the same buckets. Client
+addresses come from ``request.remote_addr``, which behind a reverse proxy
+needs ProxyFix to report the real client.
+"""
+
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from flask import jsonify, make_response, request
+
+MAX_KEYS = 10000
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+DIMENSIONS = ('ip', 'username')
+
+
+def parse_limit(limit):
+    """Parse ``'<count>/<second|minute|hour|day>'`` into ``(capacity, period_seconds)``."""
+    count, _, unit = limit.partition('/')
+    if not count.strip().isdigit() or int(count) < 1 or unit.strip() not in PERIODS:
+        raise ValueError(f"Invalid rate limit {limit!r}, expected e.g. '5/minute'")
+    return int(count), PERIODS[unit.strip()]
+
+
+def parse_rules(rules):
+    """Parse a RATE_LIMITS mapping, rejecting unknown dimensions."""
+    parsed = {}
+    for name, limits in rules.items():
+        unknown = sorted(set(limits) - set(DIMENSIONS))
+        if unknown:
+            raise ValueError(f"Unknown rate limit dimension {', '.join(unknown)} for {name}")
+        parsed[name] = {dimension: parse_limit(limit) for dimension, limit in limits.items()}
+    return parsed
+
+
+def take_token(tokens, updated, now, capacity, period):
+    """
+    Refill a bucket up to ``now`` and take one token from it.
+
+    Returns the bucket's new token count and the seconds to wait for a
+    token, which is 0 when the request is allowed.
+    """
+    rate = capacity / period
+    tokens = min(capacity, tokens + (now - updated) * rate)
+    if tokens >= 1:
+        return tokens - 1, 0
+    return tokens, (1 - tokens) / rate
+
+
+class MemoryBuckets:
+    """Thread-safe in-process buckets, evicting the least recently used beyond ``maxsize``."""
+
+    def __init__(self, maxsize=MAX_KEYS):
+        self.maxsize = maxsize
+        # key -> (tokens, monotonic time of the last update)
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, period):
+        """Take a token from the bucket ``key``; return the seconds to wait, 0 if allowed."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens, wait = take_token(tokens, updated, now, capacity, period)
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        """Refill every bucket."""
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteBuckets:
+    """Buckets stored in a SQLite file, so several worker processes share them."""
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets "
+                "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5, isolation_level=None)
+
+    def consume(self, key, capacity, period):
+        """Take a token from the bucket ``key``; return the seconds to wait, 0 if allowed."""
+        with self._connect() as connection:
+            # IMMEDIATE takes the write lock up front, so two workers cannot
+            # both read the same token count.
+            connection.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = connection.execute(
+                "SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens, updated = row if row is not None else (capacity, now)
+            tokens, wait = take_token(tokens, updated, now, capacity, period)
+            connection.execute(
+                "INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated) "
+                "VALUES (?, ?, ?)", (key, tokens, now)
+            )
+            # A bucket untouched for its longest period is full again.
+            connection.execute("DELETE FROM rate_limit_buckets WHERE updated < ?",
+                               (now - max(PERIODS.values()),))
+            connection.execute("COMMIT")
+        return wait
+
+    def clear(self):
+        """Refill every bucket."""
+        with self._connect() as connection:
+            connection.execute("DELETE FROM rate_limit_buckets")
+
+
+def request_username():
+    """The ``username`` field of a JSON or form body, normalized, or None."""
+    data = request.get_json(silent=True) or request.form
+    username = data.get('username') if hasattr(data, 'get') else None
+    return username.strip().lower() if isinstance(username, str) and username.strip() else None
+
+
+class RateLimiter:
+    """Flask extension rejecting requests whose token buckets are empty."""
+
+    def __init__(self):
+        self.enabled = False
+        self.rules = {}
+        self.buckets = MemoryBuckets()
+
+    def init_app(self, app):
+        """Read the rules and the bucket store from ``RATE_LIMIT*`` settings."""
+        self.enabled = app.config.get('RATE_LIMIT_ENABLED', True)
+        self.rules = parse_rules(app.config.get('RATE_LIMITS', {}))
+        kind = app.config.get('RATE_LIMIT_BACKEND', 'memory')
+        if kind == 'memory':
+            self.buckets = MemoryBuckets(app.config.get('RATE_LIMIT_MAX_KEYS', MAX_KEYS))
+        elif kind == 'sqlite':
+            self.buckets = SQLiteBuckets(app.config['RATE_LIMIT_PATH'])
+        else:
+            raise ValueError(f"Unknown RATE_LIMIT_BACKEND {kind!r}")
+        app.extensions['rate_limiter'] = self
+        app.before_request(self.check)
+
+    def rule_for(self, endpoint, method):
+        """The rule name and limits applying to a request, or ``(None, {})``."""
+        for name in (endpoint, method):
+            if name in self.rules:
+                return name, self.rules[name]
+        return None, {}
+
+    def check(self):
+        """before_request hook answering 429 when one of the request's buckets is empty."""
+        if not self.enabled:
+            return None
+        name, limits = self.rule_for(request.endpoint, request.method)
+        identities = {'ip': request.remote_addr or 'unknown'}
+        if 'username' in limits:
+            identities['username'] = request_username()
+        for dimension, (capacity, period) in limits.items():
+            identity = identities[dimension]
+            if identity is None:
+                continue
+            try:
+                wait = self.buckets.consume(f"{name}:{dimension}:{identity}", capacity, period)
+            except sqlite3.Error as e:
+                print(f"Rate limit check failed, allowing request: {e}")
+                return None
+            if wait:
+                response = make_response(jsonify({"error": "Too many requests, retry later"}),
+                                         429)
+                response.headers['Retry-After'] = str(math.ceil(wait))
+                return response
+        return None
+
+    def clear(self):
+        """Refill every bucket."""
+        self.buckets.clear()
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,197 @@
+"""
+Notification read-latency percentiles per time bucket and instructor.
+
+Latency is ``read_date - sent_date`` of notifications marked read, grouped
+by the hour or day of ``sent_date``. Each bucket's count, mean and
+nearest-rank percentiles are computed by the database with window
+functions over an indexed ``sent_date`` range.
+
+Complete buckets are kept as one summary row per bucket and instructor in
+notification_latency_buckets, so a request only reads the notifications
+of buckets that are not cached yet. The cached buckets of a unit always
+form one contiguous range, recorded in notification_latency_coverage;
+requests outside it extend the range, so every stretch of history is
+aggregated once. Cache rows are written with insert-or-ignore, so
+concurrent requests filling the same buckets do not collide. A flush that
+writes a notification sent inside the range re-aggregates only that
+notification's bucket, and bulk notification writes drop the cache, since
+they do not report which buckets they touch.
+"""
+
+from datetime import timedelta
+from sqlalchemy import DateTime, delete, event, func, inspect, select, type_coerce
+from sqlalchemy.orm import Session
+from database import db
+from application.models.notification_latency import (NotificationLatencyBucket,
+                                                     NotificationLatencyCoverage)
+from application.models.notifications import Notification
+from application.rollups import UPSERTS
+from application.sql_functions import SecondsBetween
+
+PERCENTILES = (50, 90, 99)
+UNITS = {'hour': timedelta(hours=1), 'day': timedelta(days=1)}
+SQLITE_FORMATS = {'hour': '%Y-%m-%d %H:00:00', 'day': '%Y-%m-%d 00:00:00'}
+
+
+def floor_time(value, unit):
+    """Start of the ``unit`` bucket containing ``value``."""
+    value = value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(hour=0) if unit == 'day' else value
+
+
+def time_bucket(column, unit):
+    """SQL expression truncating ``column`` to the start of its ``unit`` bucket."""
+    if db.session.get_bind().dialect.name == 'sqlite':
+        return type_coerce(func.strftime(SQLITE_FORMATS[unit], column), DateTime)
+    return func.date_trunc(unit, column)
+
+
+def ranked_latencies(start, end, unit, instructor_id=None):
+    """
+    Rank the read latencies of notifications sent in ``[start, end)``.
+
+    Each row carries its bucket, instructor, latency in seconds, its
+    position within the bucket and instructor, and that group's size and
+    mean latency.
+    """
+    latency = SecondsBetween(Notification.read_date, Notification.sent_date)
+    bucket = time_bucket(Notification.sent_date, unit)
+    window = {'partition_by': [bucket, Notification.instructor_id]}
+    criteria = [Notification.read_status == 'read',
+                Notification.sent_date >= start, Notification.sent_date < end]
+    if instructor_id is not None:
+        criteria.append(Notification.instructor_id == instructor_id)
+    return (select(bucket.label('bucket_start'), Notification.instructor_id,
+                   latency.label('latency'),
+                   func.row_number().over(order_by=latency, **window).label('position'),
+                   func.count().over(**window).label('count'),
+                   func.avg(latency).over(**window).label('mean'))
+            .where(*criteria)
+            .subquery())
+
+
+def collate_percentiles(rows):
+    """Fold ranked rows holding percentile positions into one summary per bucket and instructor."""
+    summaries = {}
+    for bucket_start, instructor_id, value, position, count, mean in rows:
+        summary = summaries.setdefault((bucket_start, instructor_id), {
+            'bucket_start': bucket_start, 'instructor_id': instructor_id,
+            'count': count, 'mean': round(mean, 1)
+        })
+        for p in PERCENTILES:
+            if position == (count * p + 99) // 100:
+                summary[f'p{p}'] = round(value, 1)
+    return [summaries[key] for key in sorted(summaries)]
+
+
+def latency_stats(start, end, unit, instructor_id=None, connection=None):
+    """
+    Aggregate the notifications sent in ``[start, end)`` into bucket summaries.
+
+    Only the rows holding a requested percentile are returned by the
+    database, at most ``len(PERCENTILES)`` per bucket and instructor.
+    """
+    connection = connection if connection is not None else db.session
+    ranked = ranked_latencies(start, end, unit, instructor_id)
+    ranks = [(ranked.c.count * p + 99) // 100 for p in PERCENTILES]
+    return collate_percentiles(
+        connection.execute(select(ranked).where(ranked.c.position.in_(ranks))))
+
+
+def store_buckets(start, end, unit, connection=None):
+    """Cache the bucket summaries of ``[start, end)``, keeping rows another request wrote."""
+    connection = connection if connection is not None else db.session.connection()
+    rows = latency_stats(start, end, unit, connection=connection)
+    if rows:
+        statement = UPSERTS[connection.dialect.name](NotificationLatencyBucket.__table__)
+        connection.execute(statement.on_conflict_do_nothing(),
+                           [dict(row, unit=unit) for row in rows])
+
+
+def extend_coverage(unit, start, end):
+    """
+    Make sure every complete bucket in ``[start, end)`` is cached.
+
+    Only the parts of the range outside the current coverage are
+    aggregated. The caller commits.
+    """
+    coverage = db.session.get(NotificationLatencyCoverage, unit)
+    if coverage is None:
+        store_buckets(start, end, unit)
+        connection = db.session.connection()
+        statement = UPSERTS[connection.dialect.name](NotificationLatencyCoverage.__table__)
+        claimed = connection.execute(statement.on_conflict_do_nothing(), {
+            'unit': unit, 'cached_from': start, 'cached_until': end
+        }).rowcount
+        if claimed:
+            return
+        # Another request recorded the unit's coverage first; extend that range.
+        coverage = db.session.get(NotificationLatencyCoverage, unit, populate_existing=True)
+    if start < coverage.cached_from:
+        store_buckets(start, coverage.cached_from, unit)
+        coverage.cached_from = start
+    if end > coverage.cached_until:
+        store_buckets(coverage.cached_until, end, unit)
+        coverage.cached_until = end
+
+
+def read_latency(start, end, unit, now, instructor_id=None):
+    """
+    Return the bucket summaries of notifications sent in ``[start, end)``.
+
+    ``start`` is rounded down to its bucket. Buckets that ended by ``now``
+    are served from the cache, the rest from the notifications table. The
+    caller commits, which keeps any cache rows added on the way.
+    """
+    start = floor_time(start, unit)
+    cache_end = max(start, min(floor_time(end, unit), floor_time(now, unit)))
+    summaries = []
+    if cache_end > start:
+        extend_coverage(unit, start, cache_end)
+        query = (select(NotificationLatencyBucket)
+                 .where(NotificationLatencyBucket.unit == unit,
+                        NotificationLatencyBucket.bucket_start >= start,
+                        NotificationLatencyBucket.bucket_start < cache_end)
+                 .order_by(NotificationLatencyBucket.bucket_start,
+                           NotificationLatencyBucket.instructor_id))
+        if instructor_id is not None:
+            query = query.where(NotificationLatencyBucket.instructor_id == instructor_id)
+        summaries.extend(bucket.to_dict() for bucket in db.session.execute(query).scalars())
+    if end > cache_end:
+        for summary in latency_stats(cache_end, end, unit, instructor_id):
+            summaries.append(dict(summary, bucket_start=summary['bucket_start'].isoformat()))
+    return summaries
+
+
+def reset_read_latency_cache(_student_ids=()):
+    """Drop every cached bucket; used after bulk notification writes."""
+    db.session.execute(delete(NotificationLatencyCoverage))
+    db.session.execute(delete(NotificationLatencyBucket))
+
+
+def sent_dates(instance):
+    """Current and previous ``sent_date`` values of a flushed notification."""
+    history = inspect(instance).attrs.sent_date.history
+    return {value for value in (*history.added, *history.unchanged, *history.deleted)
+            if value is not None}
+
+
+@event.listens_for(Session, 'after_flush')
+def _refresh_latency_buckets(session, _flush_context):
+    """Re-aggregate the cached buckets holding notifications changed by this flush."""
+    written = [instance for instance in (*session.new, *session.deleted, *session.dirty)
+               if isinstance(instance, Notification)
+               and (instance not in session.dirty or session.is_modified(instance))]
+    changed = set().union(*[sent_dates(instance) for instance in written])
+    if not changed:
+        return
+    connection = session.connection()
+    coverage = NotificationLatencyCoverage.__table__
+    buckets = NotificationLatencyBucket.__table__
+    for unit, cached_from, cached_until in connection.execute(select(coverage)).all():
+        starts = {floor_time(value, unit) for value in changed
+                  if cached_from <= value < cached_until}
+        for bucket_start in sorted(starts):
+            connection.execute(delete(buckets).where(buckets.c.unit == unit,
+                                                     buckets.c.bucket_start == bucket_start))
+            store_buckets(bucket_start, bucket_start + UNITS[unit], unit, connection)
@@ -6,18 +6,61 @@ from datetime import datetime
 from flask import jsonify, request, make_response
 from flask_restful import Resource
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from database import db
 from application.models.assignment import Assignment
+from application.resources.collection import (collection_response, expand_options,
+                                               field_options, parse_expand, parse_fields,
+                                               serialize, QueryParameterError)
+from application.resources.conditional import (not_modified, patch_error, stale_response,
+                                                with_etag)
+from application.cache import cached_response
 
 class AssignmentResource(Resource):
     """
     Resource for handling Assignment-related CRUD operations.
     """
 
+    filter_columns = ('course_id', 'due_date', 'total_points')
+    sort_columns = ('due_date', 'title', 'total_points')
+    expand_paths = ('course', 'course.instructor')
+
+    @cached_response(Assignment)
     def get(self):
         """
         Get all assignments
         ---
+        parameters:
+            - in: query
+              name: limit
+              type: integer
+              required: false
+              description: Page size; enables cursor pagination
+            - in: query
+              name: after
+              type: string
+              required: false
+              description: Cursor returned as next_cursor by the previous page
+            - in: query
+              name: sort
+              type: string
+              required: false
+              description: Comma separated sort columns, prefix with - for descending
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: stream
+              type: boolean
+              required: false
+              description: Stream the full collection in chunks
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. course.instructor
         responses:
             200:
                 description: A list of assignments
@@ -29,8 +72,10 @@ class AssignmentResource(Resource):
                 description: Internal Server Error
         """
         try:
-            assignments = Assignment.query.all()
-            return jsonify([assignment.to_dict() for assignment in assignments])
+            return collection_response(Assignment, filters=self.filter_columns,
+                                       sorts=self.sort_columns, expand=self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
         except SQLAlchemyError as e:
             print(f"An error occurred: {e}")
             return {"message": "Internal server error"}, 500
@@ -104,6 +149,9 @@ class AssignmentByID(Resource):
     Resource for handling assignment operations by ID.
     """
 
+    expand_paths = ('course', 'course.instructor')
+
+    @cached_response(Assignment)
     def get(self, assignment_id):
         """
         Get assignment by ID
@@ -114,18 +162,41 @@ class AssignmentByID(Resource):
               type: integer
               required: true
               description: The ID of the assignment to retrieve
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. course.instructor
         responses:
             200:
                 description: Assignment data
+            304:
+                description: Not modified since the ETag in If-None-Match
             404:
                 description: Assignment not found
         """
-        assignment = Assignment.query.filter_by(id=assignment_id).first()
+        try:
+            fields = parse_fields(Assignment)
+            expand = parse_expand(Assignment, self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        cached = not_modified(Assignment, assignment_id, fields, expand)
+        if cached is not None:
+            return cached
+        query = Assignment.query.options(*field_options(Assignment, fields),
+                                         *expand_options(Assignment, expand))
+        assignment = query.filter_by(id=assignment_id).first()
         if assignment:
-            return make_response(assignment.to_dict(), 200)
+            response = make_response(serialize(assignment, fields, expand), 200)
+            return with_etag(response, Assignment, assignment, fields, expand)
         return make_response(jsonify({"error": "Assignment not found"}), 404)
 
-    def patch(self, assignment_id):
+    def patch(self, assignment_id):  # pylint: disable=too-many-return-statements
         """
         Update assignment by ID
         ---
@@ -152,6 +223,9 @@ class AssignmentByID(Resource):
         data = request.get_json()
         if not data:
             return make_response(jsonify({"error": "Invalid data format"}), 400)
+        error = patch_error(Assignment, data)
+        if error:
+            return make_response(jsonify({"error": error}), 400)
 
         for attr, value in data.items():
             if attr == 'due_date' and value:
@@ -159,13 +233,15 @@ class AssignmentByID(Resource):
                     value = datetime.fromisoformat(value)
                 except ValueError:
                     return make_response(jsonify({"error": "Invalid date format"}), 400)
-            if hasattr(record, attr):
-                setattr(record, attr, value)
+            setattr(record, attr, value)
 
         try:
             db.session.add(record)
             db.session.commit()
             return make_response(jsonify(record.to_dict()), 200)
+        except StaleDataError:
+            db.session.rollback()
+            return stale_response(Assignment)
         except SQLAlchemyError as e:
             db.session.rollback()
             return make_response(jsonify({"error": "Unable to update assignment",
@@ -6,8 +6,25 @@ from datetime import datetime
 from flask import jsonify, request, make_response
 from flask_restful import Resource
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from database import db
 from application.models.attendance import Attendance
+from application.models.attendance_rollup import AttendanceRollup, StudentAttendanceTotal
+from application.resources.collection import (collection_response, expand_options,
+                                               field_options, parse_expand, parse_fields,
+                                               serialize, QueryParameterError)
+from application.resources.bulk import (bulk_create, bulk_delete, bulk_update,
+                                         BulkRequestError)
+from application.resources.conditional import (not_modified, patch_error, stale_response,
+                                                with_etag)
+from application.risk import record_risk_changes
+from application.rollups import refresh_attendance_rollups
+
+
+def refresh_derived_data(student_ids):
+    """Refresh the rollups and queue the risk scan of students touched by a bulk write."""
+    refresh_attendance_rollups(student_ids)
+    record_risk_changes(student_ids)
 
 
 class AttendanceResource(Resource):
@@ -15,10 +32,48 @@ class AttendanceResource(Resource):
     A resource to manage attendances.
     """
 
+    filter_columns = ('student_id', 'lecture_id', 'instructor_id', 'attendance_status', 'dates')
+    sort_columns = ('dates',)
+    expand_paths = ('student', 'lecture', 'instructor')
+    bulk_required = ('student_id', 'lecture_id', 'instructor_id', 'attendance_status')
+    bulk_defaults = {'dates': datetime.now}
+    bulk_update_columns = ('attendance_status',)
+
     def get(self):
         """
         Get all attendances.
         ---
+        parameters:
+            - in: query
+              name: limit
+              type: integer
+              required: false
+              description: Page size; enables cursor pagination
+            - in: query
+              name: after
+              type: string
+              required: false
+              description: Cursor returned as next_cursor by the previous page
+            - in: query
+              name: sort
+              type: string
+              required: false
+              description: Comma separated sort columns, prefix with - for descending
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: stream
+              type: boolean
+              required: false
+              description: Stream the full collection in chunks
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. instructor
         responses:
             200:
                 description: A list of attendances.
@@ -30,8 +85,10 @@ class AttendanceResource(Resource):
                 description: Internal Server Error.
         """
         try:
-            attendances = Attendance.query.all()
-            return jsonify([attendance.to_dict() for attendance in attendances])
+            return collection_response(Attendance, filters=self.filter_columns,
+                                       sorts=self.sort_columns, expand=self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
         except SQLAlchemyError as e:
             print(f"An error occurred: {e}")
             return {"message": "Internal server error"}, 500
@@ -39,6 +96,9 @@ class AttendanceResource(Resource):
     def post(self):
         """
         Create a new attendance.
+
+        Send a JSON array instead of form data to create many attendance records in one
+        transaction.
         ---
         parameters:
             -in: formData
@@ -70,6 +130,12 @@ class AttendanceResource(Resource):
             500:
                 description: Internal server error.
         """
+        if request.is_json:
+            try:
+                return bulk_create(Attendance, request.get_json(), self.bulk_required,
+                                   self.bulk_defaults, after_write=refresh_derived_data)
+            except BulkRequestError as e:
+                return make_response(jsonify({"error": str(e)}), 400)
         try:
             dates_str = request.form.get('dates')
             dates = datetime.fromisoformat(dates_str) if dates_str else datetime.now()
@@ -93,12 +159,82 @@ class AttendanceResource(Resource):
             return make_response(jsonify({"error": "Unable to create attendance",
                                         "details": str(e)}), 500)
 
+    def patch(self):
+        """
+        Apply the same changes to many attendance records.
+
+        The rows are selected by an ``ids`` list or a ``filter`` object and
+        updated with one statement, e.g.
+        ``{"filter": {"lecture_id": 7}, "changes": {"attendance_status": "present"}}``.
+        ---
+        parameters:
+            - in: body
+              name: body
+              required: true
+              schema:
+                  type: object
+                  properties:
+                      ids:
+                          type: array
+                          items:
+                              type: integer
+                      filter:
+                          type: object
+                      changes:
+                          type: object
+        responses:
+            200:
+                description: Number and IDs of updated attendance records
+            400:
+                description: Invalid target or changes
+            500:
+                description: Internal server error
+        """
+        try:
+            return bulk_update(Attendance, request.get_json(silent=True), self.filter_columns,
+                               self.bulk_update_columns, after_write=refresh_derived_data)
+        except BulkRequestError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+
+    def delete(self):
+        """
+        Delete many attendance records selected by an ``ids`` list or a ``filter`` object.
+        ---
+        parameters:
+            - in: body
+              name: body
+              required: true
+              schema:
+                  type: object
+                  properties:
+                      ids:
+                          type: array
+                          items:
+                              type: integer
+                      filter:
+                          type: object
+        responses:
+            200:
+                description: Number and IDs of deleted attendance records
+            400:
+                description: Missing or invalid target
+            500:
+                description: Internal server error
+        """
+        try:
+            return bulk_delete(Attendance, request.get_json(silent=True), self.filter_columns,
+                               after_write=refresh_derived_data)
+        except BulkRequestError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+
 
 class AttendanceByID(Resource):
     """
     A resource to manage attendance by ID.
     """
 
+    expand_paths = ('student', 'lecture', 'instructor')
+
     def get(self, attendance_id):
         """
         Get attendance by ID.
@@ -109,18 +245,36 @@ class AttendanceByID(Resource):
             type: integer
             required: true
             description: The ID of the attendance to retrieve.
+            -in: query
+            name: fields
+            type: string
+            required: false
+            description: Comma separated list of fields to return.
         responses:
             200:
                 description: Attendance data.
+            304:
+                description: Not modified since the ETag in If-None-Match
             404:
                 description: Attendance not found.
         """
-        attendance = Attendance.query.filter_by(id=attendance_id).first()
+        try:
+            fields = parse_fields(Attendance)
+            expand = parse_expand(Attendance, self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        cached = not_modified(Attendance, attendance_id, fields, expand)
+        if cached is not None:
+            return cached
+        query = Attendance.query.options(*field_options(Attendance, fields),
+                                         *expand_options(Attendance, expand))
+        attendance = query.filter_by(id=attendance_id).first()
         if attendance:
-            return make_response(jsonify(attendance.to_dict()), 200)
+            response = make_response(jsonify(serialize(attendance, fields, expand)), 200)
+            return with_etag(response, Attendance, attendance, fields, expand)
         return make_response(jsonify({"error": "Attendance not found"}), 404)
 
-    def patch(self, attendance_id):
+    def patch(self, attendance_id):  # pylint: disable=too-many-return-statements
         """
         Update attendance by ID.
         ---
@@ -147,6 +301,9 @@ class AttendanceByID(Resource):
         data = request.get_json()
         if not data:
             return make_response(jsonify({"error": "Invalid data format"}), 400)
+        error = patch_error(Attendance, data)
+        if error:
+            return make_response(jsonify({"error": error}), 400)
 
         for attr, value in data.items():
             if attr == 'dates' and value:
@@ -154,13 +311,15 @@ class AttendanceByID(Resource):
                     value = datetime.fromisoformat(value)
                 except ValueError:
                     return make_response(jsonify({"error": "Invalid date format"}), 400)
-            if hasattr(attendance, attr):
-                setattr(attendance, attr, value)
+            setattr(attendance, attr, value)
 
         try:
             db.session.add(attendance)
             db.session.commit()
             return make_response(jsonify(attendance.to_dict()), 200)
+        except StaleDataError:
+            db.session.rollback()
+            return stale_response(Attendance)
         except SQLAlchemyError as e:
             db.session.rollback()
             return make_response(jsonify({"error": "Unable to update attendance",
@@ -193,3 +352,71 @@ class AttendanceByID(Resource):
         except SQLAlchemyError as e:
             db.session.rollback()
             return make_response(jsonify({"error": "Unable to delete attendance", "details": str(e)}), 500)
+
+
+class StudentAttendanceRate(Resource):
+    """
+    Resource for a student's attendance rates, read from the attendance rollups.
+    """
+
+    def get(self, student_id):
+        """
+        Get a student's attendance rate overall or for one lecture.
+        ---
+        parameters:
+            - in: path
+              name: student_id
+              type: integer
+              required: true
+              description: The ID of the student.
+            - in: query
+              name: lecture_id
+              type: integer
+              required: false
+              description: Only report this lecture.
+            - in: query
+              name: lectures
+              type: boolean
+              required: false
+              description: Also list the counts and rate of every lecture.
+        responses:
+            200:
+                description: Present and absent counts and rates.
+            400:
+                description: Invalid lecture ID.
+        """
+        lecture_id = request.args.get('lecture_id')
+        breakdown = request.args.get('lectures', '').lower() in ('1', 'true')
+        try:
+            if lecture_id is not None:
+                lecture_id = int(lecture_id)
+        except ValueError:
+            return make_response(jsonify({"error": "lecture_id must be an integer"}), 400)
+        try:
+            # The overall figures are one primary key read; per-lecture rows
+            # are only read when a lecture or the breakdown is asked for.
+            rollups = []
+            if lecture_id is not None or breakdown:
+                query = AttendanceRollup.query.filter_by(student_id=student_id)
+                if lecture_id is not None:
+                    query = query.filter_by(lecture_id=lecture_id)
+                rollups = query.order_by(AttendanceRollup.lecture_id).all()
+            if lecture_id is None:
+                totals = db.session.get(StudentAttendanceTotal, student_id)
+                present, absent = (totals.present_count, totals.absent_count) if totals else (0, 0)
+            else:
+                present = sum(rollup.present_count for rollup in rollups)
+                absent = sum(rollup.absent_count for rollup in rollups)
+        except SQLAlchemyError as e:
+            print(f"Error fetching attendance rates: {e}")
+            return {"message": "Internal server error"}, 500
+        total = present + absent
+        body = {
+            "student_id": student_id,
+            "present": present,
+            "absent": absent,
+            "rate": round(present / total, 4) if total else None
+        }
+        if lecture_id is not None or breakdown:
+            body["lectures"] = [rollup.to_dict() for rollup in rollups]
+        return make_response(jsonify(body), 200)
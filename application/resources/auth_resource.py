@@ -0,0 +1,138 @@
+"""
+Module for handling authentication endpoints.
+"""
+
+from flask import jsonify, request, make_response
+from flask_restful import Resource
+from flask_jwt_extended import create_access_token, create_refresh_token
+from sqlalchemy.exc import SQLAlchemyError
+from database import db
+from application.auth import (ACCOUNT_MODELS, access_token_lifetime, authenticate_account,
+                              current_claims, token_required)
+
+
+def token_response(role, account_id, refresh=True):
+    """Issue an access token, and optionally a refresh token, for one account."""
+    claims = {'role': role}
+    body = {
+        'access_token': create_access_token(identity=str(account_id), additional_claims=claims),
+        'token_type': 'Bearer',
+        'expires_in': access_token_lifetime(),
+        'role': role,
+        'id': account_id
+    }
+    if refresh:
+        body['refresh_token'] = create_refresh_token(identity=str(account_id),
+                                                     additional_claims=claims)
+    return body
+
+
+def login_error(data):
+    """Describe what is wrong with a login body, or return None if it can be checked."""
+    if not isinstance(data, dict):
+        return "Request body must be an object"
+    role = data.get('role')
+    if not isinstance(role, str) or role not in ACCOUNT_MODELS:
+        return "role must be student or instructor"
+    missing = [name for name in ('username', 'password') if not data.get(name)]
+    if missing:
+        return f"Missing required field: {', '.join(missing)}"
+    if not all(isinstance(data[name], str) for name in ('username', 'password')):
+        return "username and password must be strings"
+    return None
+
+
+class Login(Resource):
+    """
+    Resource for exchanging a student's or instructor's password for tokens.
+    """
+
+    def post(self):
+        """
+        Log in.
+        ---
+        parameters:
+            - in: body
+              name: body
+              required: true
+              schema:
+                  type: object
+                  properties:
+                      role:
+                          type: string
+                          description: student or instructor
+                      username:
+                          type: string
+                          description: Student username or email, or instructor email
+                      password:
+                          type: string
+        responses:
+            200:
+                description: Access and refresh tokens
+            400:
+                description: Body not an object, missing or non-string fields, or unknown role
+            401:
+                description: Invalid credentials
+            429:
+                description: Too many attempts from this address or for this username
+            503:
+                description: Password hashing is overloaded
+        """
+        data = request.get_json(silent=True)
+        if data is None:
+            data = request.form
+        error = login_error(data)
+        if error:
+            return make_response(jsonify({"error": error}), 400)
+        role = data['role']
+        try:
+            account = authenticate_account(role, data['username'], data['password'])
+            if account is None:
+                return make_response(jsonify({"error": "Invalid credentials"}), 401)
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            print(f"Error logging in: {e}")
+            return {"message": "Internal server error"}, 500
+        return make_response(jsonify(token_response(role, account.id)), 200)
+
+
+class TokenRefresh(Resource):
+    """
+    Resource for exchanging a refresh token for a new access token.
+    """
+
+    method_decorators = {'post': [token_required(refresh=True)]}
+
+    def post(self):
+        """
+        Refresh an access token.
+        ---
+        parameters:
+            - in: header
+              name: Authorization
+              type: string
+              required: true
+              description: Bearer refresh token
+        responses:
+            200:
+                description: A new access token
+            401:
+                description: Missing or expired token, or the account no longer exists
+            422:
+                description: Not a refresh token
+            429:
+                description: Too many refreshes from this address
+        """
+        claims = current_claims()
+        role = claims.get('role')
+        account_id = int(claims['sub'])
+        model = ACCOUNT_MODELS.get(role)
+        try:
+            account = db.session.get(model, account_id) if model is not None else None
+        except SQLAlchemyError as e:
+            print(f"Error refreshing token: {e}")
+            return {"message": "Internal server error"}, 500
+        if account is None:
+            return make_response(jsonify({"error": "Account not found"}), 401)
+        return make_response(jsonify(token_response(role, account_id, refresh=False)), 200)
@@ -0,0 +1,264 @@
+"""
+Helpers for bulk write endpoints.
+"""
+
+from datetime import datetime
+from flask import current_app, jsonify, make_response
+from sqlalchemy import delete, insert, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from database import db
+from application.cache import OWNER_COLUMN, mark_changed
+from application.hashing import password_hashing
+from application.resources.conflicts import conflict_response, find_conflicts
+
+VALIDATION_ERRORS = (ValueError, AssertionError, AttributeError, TypeError)
+
+
+class BulkRequestError(ValueError):
+    """Raised when a bulk request body is malformed as a whole."""
+
+
+def returned_columns(model):
+    """Columns to return from a bulk statement: the key and, if any, the owning student."""
+    owner = model.__table__.columns.get(OWNER_COLUMN)
+    return (model.id,) if owner is None else (model.id, getattr(model, OWNER_COLUMN))
+
+
+def record_bulk_write(model, rows, ids, after_write=None):
+    """
+    Report rows written by a bulk statement to the cache and to ``after_write``.
+
+    ``rows`` are the statement's RETURNING rows; ``after_write`` is called
+    with the IDs of the students owning them, so derived data kept outside
+    the unit of work can be refreshed in the same transaction.
+    """
+    owners = {row[1] for row in rows if len(row) > 1}
+    mark_changed(db.session, model.__tablename__, ids, owners)
+    if after_write is not None:
+        after_write(owners)
+
+
+def check_batch(rows):
+    """Ensure ``rows`` is a non-empty JSON array within BULK_MAX_ROWS."""
+    if not isinstance(rows, list) or not rows:
+        raise BulkRequestError("Expected a non-empty JSON array")
+    max_rows = current_app.config.get('BULK_MAX_ROWS', 5000)
+    if len(rows) > max_rows:
+        raise BulkRequestError(f"At most {max_rows} rows can be sent at once")
+
+
+def parse_dates(model, values):
+    """Convert ISO 8601 strings for DateTime columns into datetimes."""
+    parsed = dict(values)
+    for name, value in values.items():
+        column = model.__table__.columns.get(name)
+        if column is not None and isinstance(column.type, db.DateTime) and isinstance(value, str):
+            parsed[name] = datetime.fromisoformat(value)
+    return parsed
+
+
+def validate_row(model, row, required, defaults, hashed=()):
+    """
+    Validate one row through the model's validators.
+
+    Returns the normalized column values, or raises one of
+    VALIDATION_ERRORS (or KeyError for a missing field). Password fields
+    named in ``hashed`` are checked to be strings and returned as sent,
+    for ``hash_passwords`` to hash the whole batch at once.
+    """
+    if not isinstance(row, dict):
+        raise TypeError("Each row must be a JSON object")
+    allowed = set(required) | set(defaults)
+    unknown = sorted(set(row) - allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    missing = [name for name in required if row.get(name) is None]
+    if missing:
+        raise KeyError(', '.join(missing))
+    values = {name: row[name] for name in required}
+    for name, default in defaults.items():
+        values[name] = row[name] if row.get(name) is not None else default()
+    values = parse_dates(model, values)
+    passwords = {name: values.pop(name) for name in hashed if name in values}
+    for name, password in passwords.items():
+        if not isinstance(password, str):
+            raise TypeError(f"{name} must be a string")
+    instance = model(**values)
+    # Read back the columns the constructor set, so write-only properties
+    # such as a password setter store their derived column.
+    state = db.inspect(instance)
+    return {**{attr.key: state.dict[attr.key] for attr in state.mapper.column_attrs
+               if attr.key in state.dict}, **passwords}
+
+
+def validate_rows(model, rows, required, defaults, hashed=()):
+    """Validate every row; return the normalized values and the per-row errors."""
+    values, errors = [], []
+    for index, row in enumerate(rows):
+        try:
+            values.append(validate_row(model, row, required, defaults, hashed))
+        except KeyError as ke:
+            errors.append({"index": index, "error": f"Missing required field: {ke}"})
+        except VALIDATION_ERRORS as e:
+            errors.append({"index": index, "error": str(e)})
+    return values, errors
+
+
+def hash_passwords(values, hashed):
+    """
+    Replace each row's passwords by their hashes, in one batch per field.
+
+    ``hashed`` maps a password field to the column storing its hash; the
+    hashes are computed in parallel over the hashing pool.
+    """
+    for field, column in hashed.items():
+        hashes = password_hashing.hash_many([row.pop(field) for row in values])
+        for row, password_hash in zip(values, hashes):
+            row[column] = password_hash
+
+
+# pylint: disable-next=too-many-arguments
+def bulk_create(model, rows, required, defaults=None, *, after_write=None, check_unique=False,
+                hashed=None):
+    """
+    Validate every row up front and insert them in one transaction.
+
+    Rows are passed through the model's validators, so the same rules apply
+    as for single creates. If any row fails nothing is written and the
+    response lists the errors per row; otherwise all rows are inserted with
+    batched multi-row INSERT statements and their new IDs are returned in
+    request order.
+
+    With ``check_unique`` the batch is also checked against the model's
+    unique columns before inserting, so every taken value is reported with
+    its row (409) instead of the first one failing the INSERT.
+
+    ``hashed`` maps write-only password fields to their hash columns. Those
+    passwords are hashed together once the batch is valid, instead of one
+    pool call per row from the model's setter.
+    """
+    check_batch(rows)
+    hashed = hashed or {}
+    values, errors = validate_rows(model, rows, required, defaults or {}, hashed)
+    if errors:
+        return make_response(jsonify({"error": "Validation failed", "results": errors}), 400)
+    conflicts = find_conflicts(model, values) if check_unique else []
+    if conflicts:
+        return make_response(jsonify({"error": "Conflicting rows", "results": conflicts}), 409)
+    hash_passwords(values, hashed)
+
+    try:
+        # Rows of one multi-row INSERT receive increasing keys in VALUES order,
+        # so sorting the returned keys maps them back to request order without
+        # asking SQLAlchemy to fall back to one statement per row.
+        rows = sorted(db.session.execute(insert(model).returning(*returned_columns(model)),
+                                         values).all())
+        ids = [row[0] for row in rows]
+        record_bulk_write(model, rows, (), after_write)
+        db.session.commit()
+    except IntegrityError as ie:
+        db.session.rollback()
+        print(f"Integrity error creating {model.__tablename__}: {ie}")
+        return conflict_response(model, ie)
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        print(f"Error creating {model.__tablename__}: {e}")
+        return make_response(jsonify({"error": f"Unable to create {model.__tablename__}",
+                                      "details": str(e)}), 500)
+    results = [{"index": index, "id": record_id, "status": "created"}
+               for index, record_id in enumerate(ids)]
+    return make_response(jsonify({"created": len(ids), "results": results}), 201)
+
+
+def bulk_target(model, body, filters):
+    """
+    Build the WHERE clause selecting the rows of a bulk PATCH or DELETE.
+
+    The body names the rows either with ``ids`` or with a ``filter`` object
+    on whitelisted columns; a list value matches any of its items. One of the
+    two is required so a request can never touch the whole table by accident.
+    """
+    if not isinstance(body, dict):
+        raise BulkRequestError("Expected a JSON object")
+    ids, conditions = body.get('ids'), body.get('filter')
+    if (ids is None) == (conditions is None):
+        raise BulkRequestError("Provide exactly one of ids or filter")
+    if ids is not None:
+        check_batch(ids)
+        if not all(isinstance(record_id, int) for record_id in ids):
+            raise BulkRequestError("ids must be a list of integers")
+        return model.id.in_(ids)
+    if not isinstance(conditions, dict) or not conditions:
+        raise BulkRequestError("filter must be a non-empty JSON object")
+    unknown = sorted(set(conditions) - set(filters))
+    if unknown:
+        raise BulkRequestError(f"Filtering on {', '.join(unknown)} is not supported")
+    clauses = []
+    try:
+        for name, value in conditions.items():
+            column = getattr(model, name)
+            if isinstance(value, list):
+                clauses.append(column.in_([parse_dates(model, {name: item})[name]
+                                           for item in value]))
+            else:
+                clauses.append(column == parse_dates(model, {name: value})[name])
+    except ValueError as e:
+        raise BulkRequestError(str(e)) from e
+    return db.and_(*clauses)
+
+
+def validate_changes(model, changes, columns):
+    """Run the model's validators once on the new values of a bulk PATCH."""
+    if not isinstance(changes, dict) or not changes:
+        raise BulkRequestError("changes must be a non-empty JSON object")
+    unknown = sorted(set(changes) - set(columns))
+    if unknown:
+        raise BulkRequestError(f"Updating {', '.join(unknown)} is not supported")
+    try:
+        values = parse_dates(model, changes)
+        instance = model()
+        for name, value in values.items():
+            setattr(instance, name, value)
+    except VALIDATION_ERRORS as e:
+        raise BulkRequestError(str(e)) from e
+    return {name: getattr(instance, name) for name in values}
+
+
+def bulk_update(model, body, filters, columns, after_write=None):
+    """
+    Apply the same changes to many rows with one UPDATE statement.
+
+    ``columns`` whitelists the attributes that may be changed. The new values
+    are validated once through the model's validators, and each row's
+    version is bumped so cached representations and ETags are invalidated.
+    """
+    where = bulk_target(model, body, filters)
+    values = validate_changes(model, body.get('changes'), columns)
+    statement = (update(model).where(where)
+                 .values(**values, version=model.version + 1)
+                 .returning(*returned_columns(model))
+                 .execution_options(synchronize_session=False))
+    return execute_bulk(model, statement, 'updated', after_write)
+
+
+def bulk_delete(model, body, filters, after_write=None):
+    """Delete every row selected by ``ids`` or ``filter`` with one DELETE statement."""
+    statement = (delete(model).where(bulk_target(model, body, filters))
+                 .returning(*returned_columns(model))
+                 .execution_options(synchronize_session=False))
+    return execute_bulk(model, statement, 'deleted', after_write)
+
+
+def execute_bulk(model, statement, action, after_write=None):
+    """Run a set-based UPDATE or DELETE and report the affected IDs."""
+    try:
+        rows = sorted(db.session.execute(statement).all())
+        ids = [row[0] for row in rows]
+        record_bulk_write(model, rows, ids, after_write)
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        print(f"Error in bulk {action[:-1]} of {model.__tablename__}: {e}")
+        return make_response(jsonify({"error": f"Unable to {action[:-1]} {model.__tablename__}",
+                                      "details": str(e)}), 500)
+    return make_response(jsonify({action: len(ids), "ids": ids}), 200)
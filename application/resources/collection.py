@@ -0,0 +1,423 @@
+"""
+Shared helpers for collection endpoints: keyset (cursor) pagination,
+filtering/sorting on whitelisted columns, sparse fieldsets, eager loading
+of related entities and streaming.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from flask import Response, current_app, jsonify, request, stream_with_context
+from sqlalchemy import PrimaryKeyConstraint, UniqueConstraint, and_, or_
+from sqlalchemy.orm import joinedload, load_only, selectinload
+from database import db
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+MAX_EXPAND_DEPTH = 2
+STREAM_CHUNK_SIZE = 1000
+NDJSON_MIMETYPE = 'application/x-ndjson'
+RESERVED_PARAMETERS = {'limit', 'after', 'sort', 'fields', 'stream', 'expand'}
+FILTER_OPERATORS = {
+    'eq': lambda column, value: column == value,
+    'ne': lambda column, value: column != value,
+    'gt': lambda column, value: column > value,
+    'gte': lambda column, value: column >= value,
+    'lt': lambda column, value: column < value,
+    'lte': lambda column, value: column <= value,
+}
+
+
+class QueryParameterError(ValueError):
+    """Raised when a collection query parameter is missing or malformed."""
+
+
+def encode_cursor(keys, values):
+    """Encode the sort keys and the last row's key values as an opaque cursor."""
+    payload = {
+        'k': keys,
+        'v': [value.isoformat() if isinstance(value, datetime) else value
+              for value in values]
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def order_keys(order):
+    """Describe an ordering as column names, prefixed with ``-`` when descending."""
+    return [f"-{column.key}" if descending else column.key for column, descending in order]
+
+
+def decode_cursor(cursor, order):
+    """Decode a cursor produced by encode_cursor for the given ordering."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        keys, values = payload['k'], payload['v']
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise QueryParameterError("Invalid cursor") from e
+    if keys != order_keys(order) or len(values) != len(order):
+        raise QueryParameterError("Cursor does not match the requested sort order")
+    decoded = []
+    for (column, _), value in zip(order, values):
+        if value is not None and isinstance(column.type, db.DateTime):
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError) as e:
+                raise QueryParameterError("Invalid cursor") from e
+        decoded.append(value)
+    return decoded
+
+
+def parse_limit():
+    """Read the optional ``limit`` query parameter."""
+    limit = request.args.get('limit')
+    if limit is None:
+        return None
+    try:
+        limit = int(limit)
+    except ValueError as e:
+        raise QueryParameterError("limit must be an integer") from e
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise QueryParameterError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit
+
+
+def indexed_columns(model):
+    """Return the names of columns that lead an index on the model's table."""
+    table = model.__table__
+    names = {index.columns.values()[0].name for index in table.indexes}
+    for constraint in table.constraints:
+        if isinstance(constraint, (PrimaryKeyConstraint, UniqueConstraint)):
+            columns = constraint.columns.values()
+            if columns:
+                names.add(columns[0].name)
+    return names
+
+
+def coerce_value(column, value):
+    """Convert a query string value to the Python type of ``column``."""
+    try:
+        if isinstance(column.type, db.Integer):
+            return int(value)
+        if isinstance(column.type, db.DateTime):
+            return datetime.fromisoformat(value)
+    except ValueError as e:
+        raise QueryParameterError(f"Invalid value for {column.key}: {value}") from e
+    return value
+
+
+def check_indexed(model, names):
+    """
+    Return the subset of ``names`` that is not backed by an index.
+
+    When ``REJECT_UNINDEXED_FILTERS`` is set the request is refused instead,
+    so a filter or sort on an unindexed column cannot start a table scan.
+    """
+    unindexed = sorted(set(names) - indexed_columns(model))
+    if unindexed and current_app.config.get('REJECT_UNINDEXED_FILTERS'):
+        raise QueryParameterError(
+            f"Filtering or sorting on unindexed columns is not allowed: {', '.join(unindexed)}"
+        )
+    return unindexed
+
+
+def apply_filters(query, model, filters):
+    """
+    Apply ``?column=value`` style filters from the query string.
+
+    A comma separated value matches any of the listed values, and a
+    ``column__op`` parameter applies one of the comparison operators in
+    FILTER_OPERATORS. Only columns listed in ``filters`` may be used.
+    Returns the filtered query and the names of the filtered columns.
+    """
+    used = []
+    for parameter, raw in request.args.items():
+        if parameter in RESERVED_PARAMETERS:
+            continue
+        name, _, operator = parameter.partition('__')
+        operator = operator or 'eq'
+        if name not in filters:
+            raise QueryParameterError(f"Filtering on {name} is not supported")
+        if operator not in FILTER_OPERATORS:
+            raise QueryParameterError(f"Unknown filter operator: {operator}")
+        column = getattr(model, name)
+        if operator == 'eq' and ',' in raw:
+            values = [coerce_value(column, value) for value in raw.split(',')]
+            query = query.filter(column.in_(values))
+        else:
+            query = query.filter(FILTER_OPERATORS[operator](column, coerce_value(column, raw)))
+        used.append(name)
+    return query, used
+
+
+def parse_sort(model, sorts):
+    """
+    Build the ``(column, descending)`` ordering requested by ``?sort=``.
+
+    Columns are comma separated and prefixed with ``-`` for descending order.
+    The primary key is always appended as a tie-breaker. Since it is unique,
+    ``id`` may only be the last sort column.
+    """
+    order = []
+    raw = request.args.get('sort')
+    names = raw.split(',') if raw else []
+    for position, name in enumerate(names):
+        descending = name.startswith('-')
+        name = name.lstrip('-')
+        if name == 'id':
+            if position != len(names) - 1:
+                raise QueryParameterError("id must be the last sort column")
+            order.append((model.id, descending))
+            return order
+        if name not in sorts:
+            raise QueryParameterError(f"Sorting on {name} is not supported")
+        order.append((getattr(model, name), descending))
+    order.append((model.id, False))
+    return order
+
+
+def parse_fields(model):
+    """
+    Read the optional ``?fields=`` projection.
+
+    Returns None when every field is wanted, otherwise the requested names
+    among the model's ``serialize_fields``.
+    """
+    raw = request.args.get('fields')
+    if not raw:
+        return None
+    fields = tuple(name.strip() for name in raw.split(',') if name.strip())
+    unknown = [name for name in fields if name not in model.serialize_fields]
+    if unknown:
+        raise QueryParameterError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def field_options(model, fields, extra=()):
+    """
+    Return loader options that read only ``fields`` (plus ``extra`` columns).
+
+    The primary key and version are always loaded so rows keep their
+    identity and their ETag can be computed.
+    """
+    if fields is None:
+        return []
+    names = dict.fromkeys(('id', 'version') + tuple(fields) + tuple(extra))
+    return [load_only(*[getattr(model, name) for name in names])]
+
+
+def parse_expand(model, allowed):
+    """
+    Read the optional ``?expand=`` list of relationships to embed.
+
+    Nested relationships are written as dotted paths such as
+    ``course.instructor``. Only paths listed in ``allowed`` may be expanded,
+    and no path may be deeper than the EXPAND_MAX_DEPTH setting, which
+    defaults to ``MAX_EXPAND_DEPTH``.
+    """
+    raw = request.args.get('expand')
+    if not raw:
+        return ()
+    paths = tuple(dict.fromkeys(path.strip() for path in raw.split(',') if path.strip()))
+    max_depth = current_app.config.get('EXPAND_MAX_DEPTH', MAX_EXPAND_DEPTH)
+    too_deep = [path for path in paths if path.count('.') >= max_depth]
+    if too_deep:
+        raise QueryParameterError(
+            f"Expansions may be at most {max_depth} levels deep: {', '.join(too_deep)}"
+        )
+    unknown = [path for path in paths if path not in allowed]
+    if unknown:
+        raise QueryParameterError(
+            f"Expanding {', '.join(unknown)} is not supported on {model.__tablename__}"
+        )
+    return paths
+
+
+def expand_options(model, paths):
+    """
+    Return loader options that fetch the expanded relationships up front.
+
+    Many-to-one relationships are joined into the main query and collections
+    are read with one extra ``SELECT ... IN`` per level, so the number of
+    queries does not depend on the number of rows.
+    """
+    options = []
+    for path in paths:
+        option, mapper = None, model.__mapper__
+        for name in path.split('.'):
+            relationship = mapper.relationships[name]
+            loader = selectinload if relationship.uselist else joinedload
+            attribute = getattr(mapper.class_, name)
+            if option is None:
+                option = loader(attribute)
+            else:
+                option = getattr(option, loader.__name__)(attribute)
+            mapper = relationship.mapper
+        options.append(option)
+    return options
+
+
+def expand_tree(paths):
+    """Turn dotted expansion paths into a nested dict of relationship names."""
+    tree = {}
+    for path in paths:
+        node = tree
+        for name in path.split('.'):
+            node = node.setdefault(name, {})
+    return tree
+
+
+def serialize(row, fields=None, expand=()):
+    """Return ``row.to_dict(fields)`` with the expanded relationships nested in."""
+    return nest_related(row, row.to_dict(fields), expand_tree(expand))
+
+
+def nest_related(row, data, tree):
+    """Add the ``to_dict()`` output of the relationships in ``tree`` to ``data``."""
+    for name, children in tree.items():
+        related = getattr(row, name)
+        if related is None:
+            data[name] = None
+        elif isinstance(related, list):
+            data[name] = [nest_related(item, item.to_dict(), children) for item in related]
+        else:
+            data[name] = nest_related(related, related.to_dict(), children)
+    return data
+
+
+def keyset_predicate(order, values):
+    """
+    Build the predicate selecting rows strictly after ``values`` in ``order``.
+
+    ``order`` is a list of ``(column, descending)`` pairs ending with the
+    primary key, so the ordering is total and pages never overlap.
+    """
+    clauses = []
+    for index, (column, descending) in enumerate(order):
+        value = values[index]
+        equal = [prev == values[i] for i, (prev, _) in enumerate(order[:index])]
+        after = column < value if descending else column > value
+        clauses.append(and_(*equal, after))
+    return or_(*clauses)
+
+
+def order_clauses(order):
+    """Translate ``(column, descending)`` pairs into ORDER BY clauses."""
+    return [column.desc() if descending else column.asc() for column, descending in order]
+
+
+def paginate(query, order, limit, after=None):
+    """
+    Return one page of ``query`` and the cursor for the next page.
+
+    Only ``limit + 1`` rows are read, so the cost of a page does not depend on
+    how deep into the collection the cursor points.
+    """
+    if after is not None:
+        query = query.filter(keyset_predicate(order, decode_cursor(after, order)))
+    query = query.order_by(*order_clauses(order))
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            order_keys(order),
+            [getattr(last, column.key) for column, _ in order]
+        )
+    return rows, next_cursor
+
+
+def wants_stream():
+    """Return the streaming format requested by the client, if any."""
+    best = request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE])
+    if best == NDJSON_MIMETYPE:
+        return 'ndjson'
+    if request.args.get('stream', '').lower() in ('1', 'true'):
+        return 'json'
+    return None
+
+
+def stream_rows(query, fields, fmt, expand=()):
+    """
+    Stream ``query`` as a JSON array or as newline delimited JSON.
+
+    Rows are fetched STREAM_CHUNK_SIZE at a time with ``yield_per`` and each
+    chunk is serialized and sent before the next one is read, so neither the
+    ORM objects nor the encoded body are ever held in memory in full.
+    """
+    dumps = current_app.json.dumps
+
+    def generate():
+        first = True
+        chunk = []
+        if fmt == 'json':
+            yield '['
+        for row in query.yield_per(STREAM_CHUNK_SIZE):
+            chunk.append(dumps(serialize(row, fields, expand)))
+            if len(chunk) >= STREAM_CHUNK_SIZE:
+                yield encode_chunk(chunk, fmt, first)
+                first = False
+                chunk = []
+        if chunk:
+            yield encode_chunk(chunk, fmt, first)
+        if fmt == 'json':
+            yield ']'
+
+    mimetype = NDJSON_MIMETYPE if fmt == 'ndjson' else 'application/json'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
+
+
+def encode_chunk(chunk, fmt, first):
+    """Join serialized rows for one chunk of a streamed response."""
+    if fmt == 'ndjson':
+        return '\n'.join(chunk) + '\n'
+    return ('' if first else ',') + ','.join(chunk)
+
+
+def collection_response(model, query=None, filters=(), sorts=(), expand=()):
+    """
+    Serialize a collection endpoint's rows.
+
+    ``filters`` and ``sorts`` whitelist the columns that may be used in the
+    query string. Filters or sorts on columns without an index are reported
+    in the ``X-Unindexed-Columns`` response header. ``?fields=`` limits both
+    the columns selected from the database and the keys in each item, and
+    ``?expand=`` nests the related entities whitelisted in ``expand``.
+
+    Without ``limit`` or ``after`` the full collection is returned as a JSON
+    array, streamed in chunks when ``?stream=true`` or an
+    ``Accept: application/x-ndjson`` header is sent. With either one, a page
+    of rows is returned together with an opaque ``next_cursor`` to pass back
+    as ``after``.
+    """
+    query = query if query is not None else model.query
+    limit = parse_limit()
+    after = request.args.get('after')
+    query, filtered = apply_filters(query, model, filters)
+    order = parse_sort(model, sorts)
+    unindexed = check_indexed(model, filtered + [column.key for column, _ in order])
+    fields = parse_fields(model)
+    expand = parse_expand(model, expand)
+    query = query.options(*field_options(model, fields, [column.key for column, _ in order]),
+                          *expand_options(model, expand))
+
+    if limit is None and after is None:
+        if request.args.get('sort'):
+            query = query.order_by(*order_clauses(order))
+        fmt = wants_stream()
+        if fmt:
+            response = stream_rows(query, fields, fmt, expand)
+        else:
+            response = jsonify([serialize(row, fields, expand) for row in query.all()])
+    else:
+        rows, next_cursor = paginate(query, order, limit or DEFAULT_PAGE_SIZE, after)
+        response = jsonify({
+            'items': [serialize(row, fields, expand) for row in rows],
+            'next_cursor': next_cursor
+        })
+    if unindexed:
+        response.headers['X-Unindexed-Columns'] = ','.join(unindexed)
+    return response
@@ -6,16 +6,57 @@ from datetime import datetime
 from flask import jsonify, request, make_response
 from flask_restful import Resource
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from database import db
 from application.models.comments import Comment
+from application.resources.collection import (collection_response, expand_options,
+                                               field_options, parse_expand, parse_fields,
+                                               serialize, QueryParameterError)
+from application.resources.conditional import (not_modified, patch_error, stale_response,
+                                                with_etag)
 
 class CommentResource(Resource):
     """Resource for comment-related operations."""
 
+    filter_columns = ('discussion_id', 'student_id', 'instructor_id', 'posted_at')
+    sort_columns = ('posted_at', 'edited_at')
+    expand_paths = ('discussion', 'student', 'instructor')
+
     def get(self):
         """Get all comments.
 
         ---
+        parameters:
+            - in: query
+              name: limit
+              type: integer
+              required: false
+              description: Page size; enables cursor pagination
+            - in: query
+              name: after
+              type: string
+              required: false
+              description: Cursor returned as next_cursor by the previous page
+            - in: query
+              name: sort
+              type: string
+              required: false
+              description: Comma separated sort columns, prefix with - for descending
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: stream
+              type: boolean
+              required: false
+              description: Stream the full collection in chunks
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. instructor
         responses:
           200:
             description: A list of comments
@@ -27,8 +68,10 @@ class CommentResource(Resource):
             description: Internal server error
         """
         try:
-            comments = Comment.query.all()
-            return jsonify([comment.to_dict() for comment in comments])
+            return collection_response(Comment, filters=self.filter_columns,
+                                       sorts=self.sort_columns, expand=self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
         except Exception as e:
             print(f"An error occurred: {e}")
             return {"message": "Internal server error"}, 500
@@ -103,6 +146,8 @@ class CommentResource(Resource):
 class CommentByID(Resource):
     """Resource for comment operations by ID."""
 
+    expand_paths = ('discussion', 'student', 'instructor')
+
     def get(self, comment_id):
         """Get comment by ID.
 
@@ -112,20 +157,37 @@ class CommentByID(Resource):
             in: path
             type: integer
             required: true
+          - name: fields
+            in: query
+            type: string
+            required: false
         responses:
           200:
             description: Comment found
             schema:
               $ref: '#/definitions/Comment'
+          304:
+            description: Not modified since the ETag in If-None-Match
           404:
             description: Comment not found
         """
-        response_dict = Comment.query.filter_by(id=comment_id).first()
+        try:
+            fields = parse_fields(Comment)
+            expand = parse_expand(Comment, self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        cached = not_modified(Comment, comment_id, fields, expand)
+        if cached is not None:
+            return cached
+        query = Comment.query.options(*field_options(Comment, fields),
+                                      *expand_options(Comment, expand))
+        response_dict = query.filter_by(id=comment_id).first()
         if response_dict:
-            return make_response(jsonify(response_dict.to_dict()), 200)
+            response = make_response(jsonify(serialize(response_dict, fields, expand)), 200)
+            return with_etag(response, Comment, response_dict, fields, expand)
         return make_response(jsonify({"error": "Comment not found"}), 404)
 
-    def patch(self, comment_id):
+    def patch(self, comment_id):  # pylint: disable=too-many-return-statements
         """Update comment by ID.
 
         ---
@@ -165,18 +227,23 @@ class CommentByID(Resource):
         data = request.get_json()
         if not data:
             return make_response(jsonify({"error": "Invalid data format"}), 400)
+        error = patch_error(Comment, data)
+        if error:
+            return make_response(jsonify({"error": error}), 400)
         for attr, value in data.items():
             if attr in ['posted_at', 'edited_at'] and value:
                 try:
                     value = datetime.fromisoformat(value)
                 except ValueError:
                     return make_response(jsonify({"error": "Invalid date format"}), 400)
-                if hasattr(record, attr):
-                    setattr(record, attr, value)
+                setattr(record, attr, value)
         try:
             db.session.commit()
             response_dict = record.to_dict()
             return make_response(jsonify(response_dict), 200)
+        except StaleDataError:
+            db.session.rollback()
+            return stale_response(Comment)
         except SQLAlchemyError as e:
             db.session.rollback()
             return make_response(jsonify({"error": "Unable to update comment",
@@ -0,0 +1,81 @@
+"""
+Helpers for ETags and conditional GET requests on by-ID endpoints.
+
+Every model carries a ``version`` column that SQLAlchemy increments on each
+UPDATE, so whether a client's copy is current can be decided from a single
+indexed lookup of that column, without loading or serializing the row. That
+only holds while clients cannot write the column themselves, so by-ID
+PATCH bodies are checked with ``patch_error`` first.
+"""
+
+import hashlib
+from flask import jsonify, make_response, request
+from sqlalchemy import select
+from database import db
+
+
+def make_etag(model, record_id, version, fields=None):
+    """Build a strong ETag for one representation of a row."""
+    projection = ','.join(fields) if fields else '*'
+    raw = f"{model.__tablename__}:{record_id}:{version}:{projection}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def current_version(model, record_id):
+    """Return the stored version of a row, or None if it does not exist."""
+    return db.session.execute(
+        select(model.version).where(model.id == record_id)
+    ).scalar()
+
+
+def not_modified(model, record_id, fields=None, expand=()):
+    """
+    Return a 304 response when ``If-None-Match`` matches the current ETag.
+
+    Returns None when the request is unconditional or the client's copy is
+    stale, in which case the caller builds the full response as usual.
+    Responses with expanded relationships have no ETag, since the row's
+    version does not change when a related row does.
+    """
+    if not request.if_none_match or expand:
+        return None
+    version = current_version(model, record_id)
+    if version is None:
+        return None
+    etag = make_etag(model, record_id, version, fields)
+    if not request.if_none_match.contains(etag):
+        return None
+    response = make_response('', 304)
+    response.set_etag(etag)
+    return response
+
+
+def with_etag(response, model, record, fields=None, expand=()):
+    """Attach the ETag of ``record`` to a successful, unexpanded response."""
+    if not expand:
+        response.set_etag(make_etag(model, record.id, record.version, fields))
+    return response
+
+
+def writable_columns(model):
+    """Columns a by-ID PATCH may set: not the key, the version or private columns."""
+    return {column.key for column in model.__table__.columns
+            if not column.primary_key and column.key != 'version'
+            and not column.key.startswith('_')}
+
+
+def patch_error(model, data):
+    """Describe why ``data`` cannot be applied by a by-ID PATCH, or return None."""
+    if not isinstance(data, dict):
+        return "Expected a JSON object"
+    rejected = sorted(set(data) - writable_columns(model))
+    if rejected:
+        return f"These fields cannot be updated: {', '.join(rejected)}"
+    return None
+
+
+def stale_response(model):
+    """409 for an UPDATE that lost a race with a concurrent write of the same row."""
+    return make_response(jsonify({
+        "error": f"{model.__name__} was changed by another request, reload it and retry"
+    }), 409)
@@ -0,0 +1,95 @@
+"""
+Helpers for reporting unique constraint violations.
+
+Uniqueness of usernames and emails is left to the database's unique
+constraints rather than checked with a SELECT before every write, which
+costs a round trip per field and still races with concurrent requests.
+A violating write fails with an ``IntegrityError`` that ``conflict_response``
+turns into a 409 naming the taken field. The bulk student and instructor
+imports use ``find_conflicts`` to report every clash up front, with one
+query per unique column for the whole batch.
+"""
+
+from flask import jsonify, make_response
+from sqlalchemy import UniqueConstraint, select
+from database import db
+
+
+def unique_columns(model):
+    """Names of the model's single-column unique constraints."""
+    return [column.name for column in model.__table__.columns if column.unique]
+
+
+def unique_constraint_names(model):
+    """
+    Map the names of the model's single-column unique constraints to their column.
+
+    Unnamed constraints get PostgreSQL's default name, ``<table>_<column>_key``.
+    """
+    table = model.__table__
+    names = {f"{table.name}_{name}_key": name for name in unique_columns(model)}
+    for constraint in table.constraints:
+        if isinstance(constraint, UniqueConstraint) and constraint.name \
+                and len(constraint.columns) == 1:
+            names[constraint.name] = next(iter(constraint.columns)).name
+    return names
+
+
+def conflicting_column(model, error):
+    """
+    The unique column an ``IntegrityError`` on ``model`` complains about, or None.
+
+    The constraint name reported by the driver (``diag.constraint_name`` on
+    PostgreSQL) is used when there is one. Otherwise the message is matched:
+    SQLite names the column as ``table.column`` and PostgreSQL as ``Key (column)``.
+    """
+    orig = getattr(error, 'orig', error)
+    constraint = getattr(getattr(orig, 'diag', None), 'constraint_name', None)
+    if constraint is not None:
+        return unique_constraint_names(model).get(constraint)
+    message = str(orig)
+    table = model.__tablename__
+    for name in unique_columns(model):
+        if f"{table}.{name}" in message or f"Key ({name})" in message:
+            return name
+    return None
+
+
+def conflict_message(name):
+    """Error message for a value of ``name`` that is already taken."""
+    return f"{name.capitalize()} is already in use"
+
+
+def conflict_response(model, error):
+    """409 for a duplicate value of a unique column, 400 for other integrity errors."""
+    name = conflicting_column(model, error)
+    if name is None:
+        return make_response(jsonify({"error": "Integrity error",
+                                      "details": str(error)}), 400)
+    return make_response(jsonify({"error": conflict_message(name), "field": name}), 409)
+
+
+def find_conflicts(model, values):
+    """
+    Report rows of a batch that would violate the model's unique columns.
+
+    ``values`` are validated column values in request order. A row clashes
+    when its value is already stored or appears in an earlier row of the
+    batch. Returns ``{"index", "error"}`` entries like bulk validation
+    errors, using one SELECT per unique column.
+    """
+    errors = {}
+    for name in unique_columns(model):
+        wanted = {row[name] for row in values if row.get(name) is not None}
+        if not wanted:
+            continue
+        column = getattr(model, name)
+        taken = set(db.session.execute(select(column).where(column.in_(wanted))).scalars())
+        for index, row in enumerate(values):
+            value = row.get(name)
+            if value is None:
+                continue
+            if value in taken and index not in errors:
+                errors[index] = {"index": index, "error": conflict_message(name), "field": name}
+            taken.add(value)
+    return [errors[index] for index in sorted(errors)]
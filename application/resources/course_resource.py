@@ -5,17 +5,60 @@ Module for handling course endpoints.
 from flask import jsonify, request, make_response
 from flask_restful import Resource
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from database import db
 from application.models.course import Course
+from application.resources.collection import (collection_response, expand_options,
+                                               field_options, parse_expand, parse_fields,
+                                               serialize, QueryParameterError)
+from application.resources.conditional import (not_modified, patch_error, stale_response,
+                                                with_etag)
+from application.cache import cached_response
 
 
 class CourseResource(Resource):
     """Resource for handling course-related operations."""
 
+    filter_columns = ('instructor_id',)
+    sort_columns = ('course_info',)
+    expand_paths = ('instructor', 'discussion')
+
+    @cached_response(Course)
     def get(self):
         """
         Get all courses.
         ---
+        parameters:
+            - in: query
+              name: limit
+              type: integer
+              required: false
+              description: Page size; enables cursor pagination
+            - in: query
+              name: after
+              type: string
+              required: false
+              description: Cursor returned as next_cursor by the previous page
+            - in: query
+              name: sort
+              type: string
+              required: false
+              description: Comma separated sort columns, prefix with - for descending
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: stream
+              type: boolean
+              required: false
+              description: Stream the full collection in chunks
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. discussion
         responses:
             200:
                 description: A list of courses
@@ -27,8 +70,10 @@ class CourseResource(Resource):
                 description: Internal Server Error
         """
         try:
-            courses = Course.query.all()
-            return jsonify([course.to_dict() for course in courses])
+            return collection_response(Course, filters=self.filter_columns,
+                                       sorts=self.sort_columns, expand=self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
         except SQLAlchemyError as e:
             print(f"An error occurred: {e}")
             return {"message": "Internal Server Error"}, 500
@@ -100,6 +145,9 @@ class CourseResource(Resource):
 class CourseByID(Resource):
     """Resource for handling course-related operations by ID."""
 
+    expand_paths = ('instructor', 'discussion')
+
+    @cached_response(Course)
     def get(self, course_id):
         """
         Get course by ID.
@@ -110,24 +158,47 @@ class CourseByID(Resource):
               type: integer
               required: true
               description: The ID of the course to retrieve
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. discussion
         responses:
             200:
                 description: Course data
+            304:
+                description: Not modified since the ETag in If-None-Match
             404:
                 description: Course not found
         """
-        response_dict = Course.query.filter_by(id=course_id).first()
+        try:
+            fields = parse_fields(Course)
+            expand = parse_expand(Course, self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        cached = not_modified(Course, course_id, fields, expand)
+        if cached is not None:
+            return cached
+        query = Course.query.options(*field_options(Course, fields),
+                                     *expand_options(Course, expand))
+        response_dict = query.filter_by(id=course_id).first()
         if response_dict is None:
             return make_response(
                 jsonify({"error": "Course not found"}),
                 404
             )
-        return make_response(
-            response_dict.to_dict(),
+        response = make_response(
+            serialize(response_dict, fields, expand),
             200
         )
+        return with_etag(response, Course, response_dict, fields, expand)
 
-    def patch(self, course_id):
+    def patch(self, course_id):  # pylint: disable=too-many-return-statements
         """
         Update course by ID.
         ---
@@ -160,10 +231,12 @@ class CourseByID(Resource):
                 jsonify({"error": "Invalid data format"}),
                 400
             )
+        error = patch_error(Course, data)
+        if error:
+            return make_response(jsonify({"error": error}), 400)
 
         for attr, value in data.items():
-            if hasattr(record, attr):
-                setattr(record, attr, value)
+            setattr(record, attr, value)
 
         try:
             db.session.add(record)
@@ -173,6 +246,9 @@ class CourseByID(Resource):
                 jsonify(response_dict),
                 200
             )
+        except StaleDataError:
+            db.session.rollback()
+            return stale_response(Course)
         except IntegrityError as ie:
             db.session.rollback()
             print(f"Integrity error: {ie}")
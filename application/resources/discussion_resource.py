@@ -5,17 +5,61 @@ Module for handling discussion endpoints.
 from datetime import datetime
 from flask import jsonify, request, make_response
 from flask_restful import Resource
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from database import db
+from application.discussions import daily_comment_counts, discussion_activity
 from application.models.discussion import Discussion
+from application.resources.collection import (collection_response, expand_options,
+                                               field_options, parse_expand, parse_fields,
+                                               serialize, QueryParameterError)
+from application.resources.conditional import (not_modified, patch_error, stale_response,
+                                                with_etag)
+from application.resources.grade_stats_resource import existing_courses
 
 
 class DiscussionResource(Resource):
     """Resource for managing discussions."""
 
+    filter_columns = ('course_id', 'created_at')
+    sort_columns = ('created_at', 'updated_at')
+    expand_paths = ('course', 'comments', 'course.instructor')
+
     def get(self):
         """
         Get all discussions.
         ---
+        parameters:
+            - in: query
+              name: limit
+              type: integer
+              required: false
+              description: Page size; enables cursor pagination
+            - in: query
+              name: after
+              type: string
+              required: false
+              description: Cursor returned as next_cursor by the previous page
+            - in: query
+              name: sort
+              type: string
+              required: false
+              description: Comma separated sort columns, prefix with - for descending
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: stream
+              type: boolean
+              required: false
+              description: Stream the full collection in chunks
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. course.instructor
         responses:
             200:
                 description: A list of discussions
@@ -27,8 +71,10 @@ class DiscussionResource(Resource):
                 description: Internal Server Error
         """
         try:
-            discussions = Discussion.query.all()
-            return jsonify([discussion.to_dict() for discussion in discussions])
+            return collection_response(Discussion, filters=self.filter_columns,
+                                       sorts=self.sort_columns, expand=self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
         except Exception as e:
             print(f"An error occurred: {e}")
             return {"message": "Internal Server Error"}, 500
@@ -102,6 +148,8 @@ class DiscussionResource(Resource):
 class DiscussionByID(Resource):
     """Resource for managing discussions by ID."""
 
+    expand_paths = ('course', 'comments', 'course.instructor')
+
     def get(self, discussion_id):
         """
         Get discussion by ID.
@@ -112,18 +160,41 @@ class DiscussionByID(Resource):
               type: integer
               required: true
               description: The ID of the discussion to retrieve
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. course.instructor
         responses:
             200:
                 description: Discussion data
+            304:
+                description: Not modified since the ETag in If-None-Match
             404:
                 description: Discussion not found
         """
-        discussion = Discussion.query.filter_by(id=discussion_id).first()
+        try:
+            fields = parse_fields(Discussion)
+            expand = parse_expand(Discussion, self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        cached = not_modified(Discussion, discussion_id, fields, expand)
+        if cached is not None:
+            return cached
+        query = Discussion.query.options(*field_options(Discussion, fields),
+                                         *expand_options(Discussion, expand))
+        discussion = query.filter_by(id=discussion_id).first()
         if discussion:
-            return make_response(jsonify(discussion.to_dict()), 200)
+            response = make_response(jsonify(serialize(discussion, fields, expand)), 200)
+            return with_etag(response, Discussion, discussion, fields, expand)
         return make_response(jsonify({"error": "Discussion not found"}), 404)
 
-    def patch(self, discussion_id):
+    def patch(self, discussion_id):  # pylint: disable=too-many-return-statements
         """
         Update discussion by ID.
         ---
@@ -152,6 +223,9 @@ class DiscussionByID(Resource):
         if not data:
             return make_response(jsonify({"error": "Invalid data format"}),
                                 400)
+        error = patch_error(Discussion, data)
+        if error:
+            return make_response(jsonify({"error": error}), 400)
 
         for attr, value in data.items():
             if attr in ['created_at', 'updated_at'] and value:
@@ -160,13 +234,15 @@ class DiscussionByID(Resource):
                 except ValueError:
                     return make_response(jsonify({"error": "Invalid date format"}),
                                         400)
-            if hasattr(discussion, attr):
-                setattr(discussion, attr, value)
+            setattr(discussion, attr, value)
 
         try:
             db.session.commit()
             response_dict = discussion.to_dict()
             return make_response(jsonify(response_dict), 200)
+        except StaleDataError:
+            db.session.rollback()
+            return stale_response(Discussion)
         except Exception as e:
             db.session.rollback()
             return make_response(jsonify({"error": "Unable to update discussion",
@@ -202,3 +278,66 @@ class DiscussionByID(Resource):
             db.session.rollback()
             return make_response(jsonify({"error": "Unable to delete discussion",
                                         "details": str(e)}), 500)
+
+
+class DiscussionActivity(Resource):
+    """Resource for the comment activity of a single discussion."""
+
+    def get(self, discussion_id):
+        """
+        Get the activity of a discussion.
+        ---
+        parameters:
+            - in: path
+              name: discussion_id
+              type: integer
+              required: true
+              description: The ID of the discussion
+        responses:
+            200:
+                description: Comment count, participants, last activity and comments per day
+            404:
+                description: Discussion not found
+            500:
+                description: Internal Server Error
+        """
+        try:
+            activity = discussion_activity(Discussion.id == discussion_id)
+            if not activity:
+                return make_response(jsonify({"error": "Discussion not found"}), 404)
+            daily = daily_comment_counts(discussion_id)
+        except SQLAlchemyError as e:
+            print(f"Error computing discussion activity: {e}")
+            return {"message": "Internal server Error"}, 500
+        return make_response(jsonify({**activity[0], "daily": daily}), 200)
+
+
+class CourseDiscussionActivity(Resource):
+    """Resource for the comment activity of every discussion of a course."""
+
+    def get(self, course_id):
+        """
+        Get the activity of every discussion of a course.
+        ---
+        parameters:
+            - in: path
+              name: course_id
+              type: integer
+              required: true
+              description: The ID of the course
+        responses:
+            200:
+                description: Per-discussion comment counts, participants and last activity
+            404:
+                description: Course not found
+            500:
+                description: Internal Server Error
+        """
+        try:
+            if not existing_courses([course_id]):
+                return make_response(jsonify({"error": "Course not found"}), 404)
+            activity = discussion_activity(Discussion.course_id == course_id)
+        except SQLAlchemyError as e:
+            print(f"Error computing discussion activity: {e}")
+            return {"message": "Internal server Error"}, 500
+        return make_response(jsonify({"course_id": course_id, "discussions": activity}), 200)
@@ -5,17 +5,64 @@ Module for handling enrollments endpoints.
 from flask import jsonify, request, make_response
 from flask_restful import Resource
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from database import db
 from application.models.enrollments import Enrollment
+from application.resources.collection import (collection_response, expand_options,
+                                               field_options, parse_expand, parse_fields,
+                                               serialize, QueryParameterError)
+from application.resources.bulk import (bulk_create, bulk_delete, bulk_update,
+                                         BulkRequestError)
+from application.resources.conditional import (not_modified, patch_error, stale_response,
+                                                with_etag)
+from application.risk import record_risk_changes
 
 
 class EnrollmentsResource(Resource):
     """Resource for managing enrollments."""
 
+    filter_columns = ('course_id', 'student_id', 'status')
+    sort_columns = ('status',)
+    expand_paths = ('course', 'student', 'course.instructor')
+    bulk_required = ('course_id', 'student_id', 'status')
+    bulk_defaults = None
+    bulk_update_columns = ('status',)
+
     def get(self):
         """
         Get all enrollments
         ---
+        parameters:
+            - in: query
+              name: limit
+              type: integer
+              required: false
+              description: Page size; enables cursor pagination
+            - in: query
+              name: after
+              type: string
+              required: false
+              description: Cursor returned as next_cursor by the previous page
+            - in: query
+              name: sort
+              type: string
+              required: false
+              description: Comma separated sort columns, prefix with - for descending
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: stream
+              type: boolean
+              required: false
+              description: Stream the full collection in chunks
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. course.instructor
         responses:
             200:
                 description: A list of enrollments
@@ -27,8 +74,10 @@ class EnrollmentsResource(Resource):
                 description: Internal Server Error
         """
         try:
-            enrollments = Enrollment.query.all()
-            return jsonify([enrollment.to_dict() for enrollment in enrollments])
+            return collection_response(Enrollment, filters=self.filter_columns,
+                                       sorts=self.sort_columns, expand=self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
         except SQLAlchemyError as e:
             print(f"An error occurred: {e}")
             return {"message": "Internal Server Error"}, 500
@@ -36,6 +85,9 @@ class EnrollmentsResource(Resource):
     def post(self):
         """
         Create a new enrollment
+
+        Send a JSON array instead of form data to create many enrollments in one
+        transaction.
         ---
         parameters:
             - in: formData
@@ -60,6 +112,12 @@ class EnrollmentsResource(Resource):
             500:
                 description: Internal Server Error
         """
+        if request.is_json:
+            try:
+                return bulk_create(Enrollment, request.get_json(), self.bulk_required,
+                                   self.bulk_defaults, after_write=record_risk_changes)
+            except BulkRequestError as e:
+                return make_response(jsonify({"error": str(e)}), 400)
         try:
             new_enrollment = Enrollment(
                 course_id=request.form['course_id'],
@@ -81,10 +139,80 @@ class EnrollmentsResource(Resource):
             return make_response(jsonify({"error": "Unable to create enrollment",
                                         "details": str(e)}), 500)
 
+    def patch(self):
+        """
+        Apply the same changes to many enrollments.
+
+        The rows are selected by an ``ids`` list or a ``filter`` object and
+        updated with one statement, e.g.
+        ``{"ids": [4, 5], "changes": {"status": "dropped"}}``.
+        ---
+        parameters:
+            - in: body
+              name: body
+              required: true
+              schema:
+                  type: object
+                  properties:
+                      ids:
+                          type: array
+                          items:
+                              type: integer
+                      filter:
+                          type: object
+                      changes:
+                          type: object
+        responses:
+            200:
+                description: Number and IDs of updated enrollments
+            400:
+                description: Invalid target or changes
+            500:
+                description: Internal server error
+        """
+        try:
+            return bulk_update(Enrollment, request.get_json(silent=True), self.filter_columns,
+                               self.bulk_update_columns, after_write=record_risk_changes)
+        except BulkRequestError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+
+    def delete(self):
+        """
+        Delete many enrollments selected by an ``ids`` list or a ``filter`` object.
+        ---
+        parameters:
+            - in: body
+              name: body
+              required: true
+              schema:
+                  type: object
+                  properties:
+                      ids:
+                          type: array
+                          items:
+                              type: integer
+                      filter:
+                          type: object
+        responses:
+            200:
+                description: Number and IDs of deleted enrollments
+            400:
+                description: Missing or invalid target
+            500:
+                description: Internal server error
+        """
+        try:
+            return bulk_delete(Enrollment, request.get_json(silent=True), self.filter_columns,
+                               after_write=record_risk_changes)
+        except BulkRequestError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+
 
 class EnrollmentByID(Resource):
     """Resource for managing a specific enrollment by ID."""
 
+    expand_paths = ('course', 'student', 'course.instructor')
+
     def get(self, enrollment_id):
         """
         Get enrollment by ID
@@ -95,16 +223,39 @@ class EnrollmentByID(Resource):
               type: integer
               required: true
               description: The ID of the enrollment to retrieve
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. course.instructor
         responses:
             200:
                 description: Enrollment data
+            304:
+                description: Not modified since the ETag in If-None-Match
             404:
                 description: Enrollment not found
         """
-        enrollment = Enrollment.query.filter_by(id=enrollment_id).first()
+        try:
+            fields = parse_fields(Enrollment)
+            expand = parse_expand(Enrollment, self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        cached = not_modified(Enrollment, enrollment_id, fields, expand)
+        if cached is not None:
+            return cached
+        query = Enrollment.query.options(*field_options(Enrollment, fields),
+                                         *expand_options(Enrollment, expand))
+        enrollment = query.filter_by(id=enrollment_id).first()
         if enrollment is None:
             return make_response(jsonify({"error": "Enrollment not found"}), 404)
-        return make_response(jsonify(enrollment.to_dict()), 200)
+        response = make_response(jsonify(serialize(enrollment, fields, expand)), 200)
+        return with_etag(response, Enrollment, enrollment, fields, expand)
 
     def patch(self, enrollment_id):
         """
@@ -131,14 +282,19 @@ class EnrollmentByID(Resource):
             return make_response(jsonify({"error": "Enrollment not found"}), 400)
 
         data = request.get_json()
+        error = patch_error(Enrollment, data)
+        if error:
+            return make_response(jsonify({"error": error}), 400)
         for attr, value in data.items():
-            if hasattr(record, attr):
-                setattr(record, attr, value)
+            setattr(record, attr, value)
 
         try:
             db.session.commit()
             response_dict = record.to_dict()
             return make_response(jsonify(response_dict), 200)
+        except StaleDataError:
+            db.session.rollback()
+            return stale_response(Enrollment)
         except SQLAlchemyError as e:
             db.session.rollback()
             return make_response(jsonify({"error": "Unable to update enrollment",
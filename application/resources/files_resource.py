@@ -6,8 +6,13 @@ from datetime import datetime
 from flask import jsonify, request, make_response
 from flask_restful import Resource
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from database import db
 from application.models.files import File
+from application.resources.collection import (collection_response, field_options,
+                                               parse_fields, QueryParameterError)
+from application.resources.conditional import (not_modified, patch_error, stale_response,
+                                                with_etag)
 
 
 class FilesResource(Resource):
@@ -15,10 +20,39 @@ class FilesResource(Resource):
     Resource for handling file-related operations.
     """
 
+    filter_columns = ('related_to', 'upload_date')
+    sort_columns = ('upload_date',)
+
     def get(self):
         """
         Get all files
         ---
+        parameters:
+            - in: query
+              name: limit
+              type: integer
+              required: false
+              description: Page size; enables cursor pagination
+            - in: query
+              name: after
+              type: string
+              required: false
+              description: Cursor returned as next_cursor by the previous page
+            - in: query
+              name: sort
+              type: string
+              required: false
+              description: Comma separated sort columns, prefix with - for descending
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: stream
+              type: boolean
+              required: false
+              description: Stream the full collection in chunks
         responses:
             200:
                 description: A list of files
@@ -30,8 +64,10 @@ class FilesResource(Resource):
                 description: Internal Server Error
         """
         try:
-            files = File.query.all()
-            return jsonify([file.to_dict() for file in files])
+            return collection_response(File, filters=self.filter_columns,
+                                       sorts=self.sort_columns)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
         except SQLAlchemyError as e:
             print(f"An error occurred while retrieving files: {e}")
             return {"message": "Internal Server Error"}, 500
@@ -107,19 +143,35 @@ class FileByID(Resource):
               type: integer
               required: true
               description: The ID of the file to retrieve
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
         responses:
             200:
                 description: File data
+            304:
+                description: Not modified since the ETag in If-None-Match
             404:
                 description: File not found
         """
-        file_record = File.query.filter_by(id=file_id).first()
+        try:
+            fields = parse_fields(File)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        cached = not_modified(File, file_id, fields)
+        if cached is not None:
+            return cached
+        query = File.query.options(*field_options(File, fields))
+        file_record = query.filter_by(id=file_id).first()
         if not file_record:
             return make_response(jsonify({"error": "File not found"}), 404)
 
-        return make_response(file_record.to_dict(), 200)
+        response = make_response(file_record.to_dict(fields), 200)
+        return with_etag(response, File, file_record, fields)
 
-    def patch(self, file_id):
+    def patch(self, file_id):  # pylint: disable=too-many-return-statements
         """
         Update file by ID
         ---
@@ -146,6 +198,9 @@ class FileByID(Resource):
         data = request.get_json()
         if not data:
             return make_response(jsonify({"error": "Invalid data"}), 400)
+        error = patch_error(File, data)
+        if error:
+            return make_response(jsonify({"error": error}), 400)
 
         for attr, value in data.items():
             if attr == 'upload_date' and value:
@@ -154,13 +209,15 @@ class FileByID(Resource):
                 except ValueError:
                     return make_response(jsonify({"error": "Invalid date format"}),
                                         400)
-            if hasattr(record, attr):
-                setattr(record, attr, value)
+            setattr(record, attr, value)
 
         try:
             db.session.commit()
             response_dict = record.to_dict()
             return make_response(jsonify(response_dict), 200)
+        except StaleDataError:
+            db.session.rollback()
+            return stale_response(File)
         except SQLAlchemyError as e:
             db.session.rollback()
             return make_response(jsonify({"error": "Unable to update file",
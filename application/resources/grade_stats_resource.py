@@ -0,0 +1,244 @@
+"""
+Module for handling course grade statistics and grade distribution endpoints.
+"""
+
+from flask import jsonify, request, make_response
+from flask_restful import Resource
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from database import db
+from application.distributions import (DEFAULT_BIN_WIDTH, MAX_GRADE, distribution_report,
+                                        grade_arrays, grade_distribution)
+from application.grade_stats import DEFAULT_PERCENTILES, course_grade_stats
+from application.models.course import Course
+from application.resources.collection import QueryParameterError
+
+
+def parse_id_list(name):
+    """Read a comma separated list of integer IDs from the query string."""
+    raw = request.args.get(name)
+    if not raw:
+        return None
+    try:
+        return list(dict.fromkeys(int(value) for value in raw.split(',') if value.strip()))
+    except ValueError as e:
+        raise QueryParameterError(f"{name} must be a comma separated list of integers") from e
+
+
+def parse_percentiles():
+    """Read the optional ``?percentiles=`` list, defaulting to DEFAULT_PERCENTILES."""
+    raw = request.args.get('percentiles')
+    if not raw:
+        return DEFAULT_PERCENTILES
+    try:
+        percentiles = tuple(float(value) for value in raw.split(','))
+    except ValueError as e:
+        raise QueryParameterError("percentiles must be a comma separated list of numbers") from e
+    if not all(0 <= p <= 100 for p in percentiles):
+        raise QueryParameterError("percentiles must be between 0 and 100")
+    return percentiles
+
+
+def parse_bin_width():
+    """Read the optional ``?bin_width=`` histogram bin width in grade points."""
+    raw = request.args.get('bin_width')
+    if raw is None:
+        return DEFAULT_BIN_WIDTH
+    try:
+        bin_width = int(raw)
+    except ValueError as e:
+        raise QueryParameterError("bin_width must be an integer") from e
+    if bin_width < 1 or bin_width > MAX_GRADE:
+        raise QueryParameterError(f"bin_width must be between 1 and {MAX_GRADE}")
+    return bin_width
+
+
+def existing_courses(course_ids):
+    """Return the subset of ``course_ids`` that exist."""
+    return set(db.session.execute(
+        select(Course.id).where(Course.id.in_(course_ids))
+    ).scalars())
+
+
+class CourseGradeStats(Resource):
+    """
+    Resource for the grade statistics of a single course.
+    """
+
+    def get(self, course_id):
+        """
+        Get grade statistics for a course.
+        ---
+        parameters:
+            - in: path
+              name: course_id
+              type: integer
+              required: true
+              description: The ID of the course
+            - in: query
+              name: percentiles
+              type: string
+              required: false
+              description: Comma separated percentiles to report, defaults to 10,25,50,75,90
+        responses:
+            200:
+                description: Count, mean, median, standard deviation, min, max and percentiles
+            400:
+                description: Invalid percentiles
+            404:
+                description: Course not found
+            500:
+                description: Internal Server Error
+        """
+        try:
+            percentiles = parse_percentiles()
+            if not existing_courses([course_id]):
+                return make_response(jsonify({"error": "Course not found"}), 404)
+            stats = course_grade_stats([course_id], percentiles)[course_id]
+            return make_response(jsonify({"course_id": course_id, **stats}), 200)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        except SQLAlchemyError as e:
+            print(f"Error computing grade statistics: {e}")
+            return {"message": "Internal server Error"}, 500
+
+
+class GradeStatsResource(Resource):
+    """
+    Resource for the grade statistics of several courses at once.
+    """
+
+    def get(self):
+        """
+        Get grade statistics for many courses.
+        ---
+        parameters:
+            - in: query
+              name: course_id
+              type: string
+              required: false
+              description: Comma separated course IDs; every course with grades when omitted
+            - in: query
+              name: percentiles
+              type: string
+              required: false
+              description: Comma separated percentiles to report, defaults to 10,25,50,75,90
+        responses:
+            200:
+                description: A list of per-course grade statistics
+            400:
+                description: Invalid course IDs or percentiles
+            500:
+                description: Internal Server Error
+        """
+        try:
+            course_ids = parse_id_list('course_id')
+            percentiles = parse_percentiles()
+            if course_ids is not None:
+                found = existing_courses(course_ids)
+                course_ids = [course_id for course_id in course_ids if course_id in found]
+            stats = course_grade_stats(course_ids, percentiles)
+            return make_response(jsonify([{"course_id": course_id, **values}
+                                          for course_id, values in stats.items()]), 200)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        except SQLAlchemyError as e:
+            print(f"Error computing grade statistics: {e}")
+            return {"message": "Internal server Error"}, 500
+
+
+class CourseGradeDistribution(Resource):
+    """
+    Resource for the grade histogram, letter grades and z-scores of a single course.
+    """
+
+    def get(self, course_id):
+        """
+        Get the grade distribution of a course.
+        ---
+        parameters:
+            - in: path
+              name: course_id
+              type: integer
+              required: true
+              description: The ID of the course
+            - in: query
+              name: bin_width
+              type: integer
+              required: false
+              description: Width of the histogram bins in grade points, defaults to 10
+        responses:
+            200:
+                description: Histogram, letter-grade counts and the z-score of every grade
+            400:
+                description: Invalid bin width
+            404:
+                description: Course not found
+            500:
+                description: Internal Server Error
+        """
+        try:
+            bin_width = parse_bin_width()
+            if not existing_courses([course_id]):
+                return make_response(jsonify({"error": "Course not found"}), 404)
+            distribution = grade_distribution(*grade_arrays([course_id]), bin_width)
+            report = distribution_report(distribution, bin_width, z_scores=True,
+                                         course_ids=[course_id])
+            return make_response(jsonify(report[0]), 200)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        except SQLAlchemyError as e:
+            print(f"Error computing grade distribution: {e}")
+            return {"message": "Internal server Error"}, 500
+
+
+class GradeDistributionResource(Resource):
+    """
+    Resource for the grade histograms and letter grades of several courses at once.
+    """
+
+    def get(self):
+        """
+        Get grade distributions for many courses.
+        ---
+        parameters:
+            - in: query
+              name: course_id
+              type: string
+              required: false
+              description: Comma separated course IDs; every course with grades when omitted
+            - in: query
+              name: bin_width
+              type: integer
+              required: false
+              description: Width of the histogram bins in grade points, defaults to 10
+            - in: query
+              name: z_scores
+              type: boolean
+              required: false
+              description: Also list the z-score of every grade of each course
+        responses:
+            200:
+                description: A list of per-course histograms and letter-grade counts
+            400:
+                description: Invalid course IDs or bin width
+            500:
+                description: Internal Server Error
+        """
+        try:
+            course_ids = parse_id_list('course_id')
+            bin_width = parse_bin_width()
+            if course_ids is not None:
+                found = existing_courses(course_ids)
+                course_ids = [course_id for course_id in course_ids if course_id in found]
+            distribution = grade_distribution(*grade_arrays(course_ids), bin_width)
+            report = distribution_report(
+                distribution, bin_width, course_ids=course_ids,
+                z_scores=request.args.get('z_scores', '').lower() in ('1', 'true')
+            )
+            return make_response(jsonify(report), 200)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        except SQLAlchemyError as e:
+            print(f"Error computing grade distributions: {e}")
+            return {"message": "Internal server Error"}, 500
@@ -6,18 +6,75 @@ from datetime import datetime
 from flask import jsonify, request, make_response
 from flask_restful import Resource
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from database import db
 from application.models.grades import Grade
+from application.leaderboard import (LEADERBOARD_SIZE, read_leaderboard,
+                                     refresh_course_standings)
+from application.resources.collection import (collection_response, expand_options,
+                                               field_options, parse_expand, parse_fields,
+                                               parse_limit, serialize, QueryParameterError)
+from application.resources.bulk import (bulk_create, bulk_update,
+                                         BulkRequestError)
+from application.resources.conditional import (not_modified, patch_error, stale_response,
+                                                with_etag)
+from application.resources.grade_stats_resource import existing_courses
+from application.risk import record_risk_changes
+
+
+def refresh_derived_data(student_ids):
+    """Refresh the course standings and queue the risk scan of students touched by a bulk write."""
+    refresh_course_standings(student_ids)
+    record_risk_changes(student_ids)
+
 
 class GradesResource(Resource):
     """
     Resource for handling grades.
     """
 
+    filter_columns = ('student_id', 'course_id', 'grade', 'date_posted')
+    sort_columns = ('date_posted', 'grade')
+    expand_paths = ('student', 'course', 'course.instructor')
+    bulk_required = ('student_id', 'course_id', 'grade')
+    bulk_defaults = {'date_posted': datetime.now}
+    bulk_update_columns = ('grade',)
+
     def get(self):
         """
         Get all grades.
         ---
+        parameters:
+            - in: query
+              name: limit
+              type: integer
+              required: false
+              description: Page size; enables cursor pagination
+            - in: query
+              name: after
+              type: string
+              required: false
+              description: Cursor returned as next_cursor by the previous page
+            - in: query
+              name: sort
+              type: string
+              required: false
+              description: Comma separated sort columns, prefix with - for descending
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: stream
+              type: boolean
+              required: false
+              description: Stream the full collection in chunks
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. course.instructor
         responses:
             200:
                 description: A list of grades
@@ -29,8 +86,10 @@ class GradesResource(Resource):
                 description: Internal Server Error
         """
         try:
-            grades = Grade.query.all()
-            return jsonify([grade.to_dict() for grade in grades])
+            return collection_response(Grade, filters=self.filter_columns,
+                                       sorts=self.sort_columns, expand=self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
         except SQLAlchemyError as e:
             print(f"An error occurred: {e}")
             return {"message": "Internal server Error"}, 500
@@ -38,6 +97,9 @@ class GradesResource(Resource):
     def post(self):
         """
         Create a new grade.
+
+        Send a JSON array instead of form data to create many grades in one
+        transaction.
         ---
         parameters:
             - in: formData
@@ -62,6 +124,12 @@ class GradesResource(Resource):
               required: true
               description: Date posted for grade
         """
+        if request.is_json:
+            try:
+                return bulk_create(Grade, request.get_json(), self.bulk_required,
+                                   self.bulk_defaults, after_write=refresh_derived_data)
+            except BulkRequestError as e:
+                return make_response(jsonify({"error": str(e)}), 400)
         try:
             date_posted_str = request.form.get('date_posted')
             date_posted = datetime.fromisoformat(date_posted_str) if date_posted_str else datetime.now()
@@ -86,11 +154,51 @@ class GradesResource(Resource):
             return make_response(jsonify({"error": "Unable to create grade",
                                         "details": str(e)}), 500)
 
+    def patch(self):
+        """
+        Apply the same changes to many grades.
+
+        The rows are selected by an ``ids`` list or a ``filter`` object and
+        updated with one statement, e.g.
+        ``{"ids": [1, 2], "changes": {"grade": 70}}``.
+        ---
+        parameters:
+            - in: body
+              name: body
+              required: true
+              schema:
+                  type: object
+                  properties:
+                      ids:
+                          type: array
+                          items:
+                              type: integer
+                      filter:
+                          type: object
+                      changes:
+                          type: object
+        responses:
+            200:
+                description: Number and IDs of updated grades
+            400:
+                description: Invalid target or changes
+            500:
+                description: Internal server error
+        """
+        try:
+            return bulk_update(Grade, request.get_json(silent=True), self.filter_columns,
+                               self.bulk_update_columns, after_write=refresh_derived_data)
+        except BulkRequestError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+
+
 class GradeByID(Resource):
     """
     Resource for handling operations on a single grade by ID.
     """
 
+    expand_paths = ('student', 'course', 'course.instructor')
+
     def get(self, grade_id):
         """
         Get grade by ID.
@@ -101,18 +209,41 @@ class GradeByID(Resource):
               type: integer
               required: true
               description: The ID of the grade to retrieve
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. course.instructor
         responses:
             200:
                 description: Grade data
+            304:
+                description: Not modified since the ETag in If-None-Match
             404:
                 description: Grade not found
         """
-        grade = Grade.query.filter_by(id=grade_id).first()
+        try:
+            fields = parse_fields(Grade)
+            expand = parse_expand(Grade, self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        cached = not_modified(Grade, grade_id, fields, expand)
+        if cached is not None:
+            return cached
+        query = Grade.query.options(*field_options(Grade, fields),
+                                    *expand_options(Grade, expand))
+        grade = query.filter_by(id=grade_id).first()
         if not grade:
             return make_response(jsonify({"error": "Grade not found"}), 404)
-        return make_response(jsonify(grade.to_dict()), 200)
+        response = make_response(jsonify(serialize(grade, fields, expand)), 200)
+        return with_etag(response, Grade, grade, fields, expand)
 
-    def patch(self, grade_id):
+    def patch(self, grade_id):  # pylint: disable=too-many-return-statements
         """
         Update grade by ID.
         ---
@@ -138,6 +269,9 @@ class GradeByID(Resource):
         data = request.get_json()
         if not data:
             return make_response(jsonify({"error": "Invalid data format"}), 400)
+        error = patch_error(Grade, data)
+        if error:
+            return make_response(jsonify({"error": error}), 400)
         for attr, value in data.items():
             if attr == 'date_posted' and value:
                 try:
@@ -145,11 +279,13 @@ class GradeByID(Resource):
                 except ValueError:
                     return make_response(jsonify({"error": "Invalid date format"}),
                                         400)
-            if hasattr(record, attr):
-                setattr(record, attr, value)
+            setattr(record, attr, value)
         try:
             db.session.commit()
             return make_response(jsonify(record.to_dict()), 200)
+        except StaleDataError:
+            db.session.rollback()
+            return stale_response(Grade)
         except SQLAlchemyError as e:
             db.session.rollback()
             print(f"Error updating grade: {e}")
@@ -184,3 +320,95 @@ class GradeByID(Resource):
             print(f"Error deleting grade: {e}")
             return make_response(jsonify({"error": "Unable to delete grade",
                                         "details": str(e)}), 500)
+
+
+class CourseLeaderboard(Resource):
+    """
+    Resource for the students of a course ranked by average grade.
+    """
+
+    def get(self, course_id):
+        """
+        Get the leaderboard of a course.
+        ---
+        parameters:
+            - in: path
+              name: course_id
+              type: integer
+              required: true
+              description: The ID of the course
+            - in: query
+              name: limit
+              type: integer
+              required: false
+              description: Number of students to return, defaults to 10
+        responses:
+            200:
+                description: The best placed students with their rank, average and grade count
+            400:
+                description: Invalid limit
+            404:
+                description: Course not found
+            500:
+                description: Internal Server Error
+        """
+        try:
+            limit = parse_limit() or LEADERBOARD_SIZE
+            if not existing_courses([course_id]):
+                return make_response(jsonify({"error": "Course not found"}), 404)
+            students, leaders = read_leaderboard(
+                course_id, lambda board: (len(board), board.top(limit)))
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        except SQLAlchemyError as e:
+            print(f"Error fetching leaderboard: {e}")
+            return {"message": "Internal server Error"}, 500
+        return make_response(jsonify({"course_id": course_id, "students": students,
+                                      "leaderboard": leaders}), 200)
+
+
+class StudentCourseRank(Resource):
+    """
+    Resource for a student's rank in the leaderboard of one course.
+    """
+
+    def get(self, student_id):
+        """
+        Get a student's rank in a course.
+        ---
+        parameters:
+            - in: path
+              name: student_id
+              type: integer
+              required: true
+              description: The ID of the student
+            - in: query
+              name: course_id
+              type: integer
+              required: true
+              description: The ID of the course
+        responses:
+            200:
+                description: Rank, average and grade count of the student
+            400:
+                description: Missing or invalid course ID
+            404:
+                description: The student has no grades in the course
+            500:
+                description: Internal Server Error
+        """
+        try:
+            course_id = int(request.args['course_id'])
+        except (KeyError, ValueError):
+            return make_response(jsonify({"error": "course_id must be an integer"}), 400)
+        try:
+            students, entry = read_leaderboard(
+                course_id, lambda board: (len(board), board.entry(student_id)))
+        except SQLAlchemyError as e:
+            print(f"Error fetching rank: {e}")
+            return {"message": "Internal server Error"}, 500
+        if entry is None:
+            return make_response(jsonify({"error": "No grades for this student in the course"}),
+                                 404)
+        return make_response(jsonify({"course_id": course_id, "students": students, **entry}),
+                             200)
@@ -4,18 +4,67 @@ Module for handling instructors endpoints.
 
 from flask import jsonify, request, make_response
 from flask_restful import Resource
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from database import db
+from application.dashboard import instructor_dashboard
 from application.models.instructors import Instructor
+from application.resources.collection import (collection_response, expand_options,
+                                               field_options, parse_expand, parse_fields,
+                                               serialize, QueryParameterError)
+from application.resources.bulk import bulk_create, BulkRequestError, VALIDATION_ERRORS
+from application.resources.conditional import (not_modified, patch_error, stale_response,
+                                                with_etag)
+from application.resources.conflicts import conflict_response
+from application.cache import cached_response
 
 
 class InstructorResource(Resource):
     """Resource for managing multiple instructors."""
 
+    filter_columns = ('department', 'email')
+    sort_columns = ('name', 'department')
+    expand_paths = ('course', 'lecture')
+    bulk_required = ('name', 'email', 'password_hash', 'profile_picture', 'department',
+                     'bio')
+    bulk_hashed = {'password_hash': '_password_hash'}
+
+    @cached_response(Instructor)
     def get(self):
         """
         Get all instructors
         ---
+        parameters:
+            - in: query
+              name: limit
+              type: integer
+              required: false
+              description: Page size; enables cursor pagination
+            - in: query
+              name: after
+              type: string
+              required: false
+              description: Cursor returned as next_cursor by the previous page
+            - in: query
+              name: sort
+              type: string
+              required: false
+              description: Comma separated sort columns, prefix with - for descending
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: stream
+              type: boolean
+              required: false
+              description: Stream the full collection in chunks
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. lecture
         responses:
             200:
                 description: A list of instructors
@@ -27,8 +76,10 @@ class InstructorResource(Resource):
                 description: Internal Server Error
         """
         try:
-            instructors = Instructor.query.all()
-            return jsonify([instructor.to_dict() for instructor in instructors])
+            return collection_response(Instructor, filters=self.filter_columns,
+                                       sorts=self.sort_columns, expand=self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
         except SQLAlchemyError as e:
             print(f"An SQLAlchemy error occurred: {e}")
             return {"message": "Internal server Error"}, 500
@@ -36,9 +87,12 @@ class InstructorResource(Resource):
             print(f"An unexpected error occurred: {e}")
             return {"message": "Internal server Error"}, 500
 
-    def post(self):
+    def post(self):  # pylint: disable=too-many-return-statements
         """
         Create a new instructor
+        Send a JSON array instead of form data to create many instructors in one
+        transaction; each row carries the password as ``password_hash``. Rows
+        whose unique values are taken are listed with a 409.
         ---
         parameters:
             - in: formData
@@ -75,15 +129,23 @@ class InstructorResource(Resource):
             201:
                 description: Instructor successfully created
             400:
-                description: Missing required field
+                description: Missing required field or invalid value
+            409:
+                description: Email already in use
             500:
                 description: Internal server error
         """
+        if request.is_json:
+            try:
+                return bulk_create(Instructor, request.get_json(), self.bulk_required,
+                                   check_unique=True, hashed=self.bulk_hashed)
+            except BulkRequestError as e:
+                return make_response(jsonify({"error": str(e)}), 400)
         try:
             new_instructor = Instructor(
                 name=request.form['name'],
                 email=request.form['email'],
-                _password_hash=request.form['_password_hash'],
+                password_hash=request.form['_password_hash'],
                 profile_picture=request.form['profile_picture'],
                 department=request.form['department'],
                 bio=request.form['bio'],
@@ -97,6 +159,12 @@ class InstructorResource(Resource):
             print(f"Missing: {ke}")
             return make_response(jsonify({"error": f"Missing required field: {ke}"}),
                                 400)
+        except VALIDATION_ERRORS as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        except IntegrityError as ie:
+            db.session.rollback()
+            print(f"Integrity error creating instructor: {ie}")
+            return conflict_response(Instructor, ie)
         except SQLAlchemyError as e:
             db.session.rollback()
             print(f"SQLAlchemy error creating instructor: {e}")
@@ -112,6 +180,9 @@ class InstructorResource(Resource):
 class InstructorByID(Resource):
     """Resource for managing a specific instructor by ID."""
 
+    expand_paths = ('course', 'lecture')
+
+    @cached_response(Instructor)
     def get(self, instructor_id):
         """
         Get instructor by ID
@@ -122,19 +193,42 @@ class InstructorByID(Resource):
               type: integer
               required: true
               description: The ID of the instructor to retrieve
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. lecture
         responses:
             200:
                 description: Instructor data
+            304:
+                description: Not modified since the ETag in If-None-Match
             404:
                 description: Instructor not found
         """
-        instructor = Instructor.query.filter_by(id=instructor_id).first()
+        try:
+            fields = parse_fields(Instructor)
+            expand = parse_expand(Instructor, self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        cached = not_modified(Instructor, instructor_id, fields, expand)
+        if cached is not None:
+            return cached
+        query = Instructor.query.options(*field_options(Instructor, fields),
+                                         *expand_options(Instructor, expand))
+        instructor = query.filter_by(id=instructor_id).first()
         if instructor is None:
             return make_response(jsonify({"error": "Instructor not found"}),
                                 404)
-        return make_response(jsonify(instructor.to_dict()), 200)
+        response = make_response(jsonify(serialize(instructor, fields, expand)), 200)
+        return with_etag(response, Instructor, instructor, fields, expand)
 
-    def patch(self, instructor_id):
+    def patch(self, instructor_id):  # pylint: disable=too-many-return-statements
         """
         Update instructor by ID
         ---
@@ -153,6 +247,8 @@ class InstructorByID(Resource):
                 description: Instructor successfully updated
             400:
                 description: Invalid data or instructor not found
+            409:
+                description: Email already in use
         """
         record = Instructor.query.filter_by(id=instructor_id).first()
         if not record:
@@ -160,13 +256,26 @@ class InstructorByID(Resource):
         data = request.get_json()
         if not data:
             return make_response(jsonify({"error": "Invalid data format"}), 400)
-        for attr, value in data.items():
-            if hasattr(record, attr):
+        error = patch_error(Instructor, data)
+        if error:
+            return make_response(jsonify({"error": error}), 400)
+        try:
+            for attr, value in data.items():
                 setattr(record, attr, value)
+        except VALIDATION_ERRORS as e:
+            db.session.rollback()
+            return make_response(jsonify({"error": str(e)}), 400)
         try:
             db.session.commit()
             response_dict = record.to_dict()
             return make_response(jsonify(response_dict), 200)
+        except StaleDataError:
+            db.session.rollback()
+            return stale_response(Instructor)
+        except IntegrityError as ie:
+            db.session.rollback()
+            print(f"Integrity error updating instructor: {ie}")
+            return conflict_response(Instructor, ie)
         except SQLAlchemyError as e:
             db.session.rollback()
             print(f"SQLAlchemy error updating instructor: {e}")
@@ -213,3 +322,36 @@ class InstructorByID(Resource):
             print(f"Unexpected error deleting instructor: {e}")
             return make_response(jsonify({"error": "Unable to delete instructor",
                                         "details": str(e)}), 500)
+
+
+class InstructorDashboard(Resource):
+    """Resource for an instructor's landing page figures."""
+
+    def get(self, instructor_id):
+        """
+        Get the dashboard of an instructor
+        ---
+        parameters:
+            - in: path
+              name: instructor_id
+              type: integer
+              required: true
+              description: The ID of the instructor
+        responses:
+            200:
+                description: Course, lecture, enrolled student, submission, attendance and
+                    unread notification figures
+            404:
+                description: Instructor not found
+            500:
+                description: Internal server error
+        """
+        try:
+            dashboard = instructor_dashboard(instructor_id)
+        except SQLAlchemyError as e:
+            print(f"SQLAlchemy error building instructor dashboard: {e}")
+            return make_response(jsonify({"error": "Unable to build dashboard",
+                                        "details": str(e)}), 500)
+        if dashboard is None:
+            return make_response(jsonify({"error": "Instructor not found"}), 404)
+        return make_response(jsonify(dashboard), 200)
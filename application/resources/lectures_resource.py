@@ -6,8 +6,15 @@ from datetime import datetime
 from flask import jsonify, request, make_response
 from flask_restful import Resource
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from database import db
 from application.models.lectures import Lecture
+from application.resources.collection import (collection_response, expand_options,
+                                               field_options, parse_expand, parse_fields,
+                                               serialize, QueryParameterError)
+from application.resources.conditional import (not_modified, patch_error, stale_response,
+                                                with_etag)
+from application.cache import cached_response
 
 
 class LecturesResource(Resource):
@@ -15,10 +22,46 @@ class LecturesResource(Resource):
     Resource for managing lectures.
     """
 
+    filter_columns = ('instructor_id', 'created_at')
+    sort_columns = ('created_at', 'updated_at')
+    expand_paths = ('instructor',)
+
+    @cached_response(Lecture)
     def get(self):
         """
         Get all lectures.
         ---
+        parameters:
+            - in: query
+              name: limit
+              type: integer
+              required: false
+              description: Page size; enables cursor pagination
+            - in: query
+              name: after
+              type: string
+              required: false
+              description: Cursor returned as next_cursor by the previous page
+            - in: query
+              name: sort
+              type: string
+              required: false
+              description: Comma separated sort columns, prefix with - for descending
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: stream
+              type: boolean
+              required: false
+              description: Stream the full collection in chunks
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. instructor
         responses:
             200:
                 description: A list of lectures
@@ -30,8 +73,10 @@ class LecturesResource(Resource):
                 description: Internal Server Error
         """
         try:
-            lectures = Lecture.query.all()
-            return jsonify([lecture.to_dict() for lecture in lectures])
+            return collection_response(Lecture, filters=self.filter_columns,
+                                       sorts=self.sort_columns, expand=self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
         except SQLAlchemyError as e:
             print(f"Database error: {e}")
             return {"message": "Internal server error"}, 500
@@ -120,6 +165,9 @@ class LectureByID(Resource):
     Resource for managing individual lectures by ID.
     """
 
+    expand_paths = ('instructor',)
+
+    @cached_response(Lecture)
     def get(self, lecture_id):
         """
         Get lecture by ID.
@@ -130,19 +178,42 @@ class LectureByID(Resource):
               type: integer
               required: true
               description: The ID of the lecture to retrieve
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. instructor
         responses:
             200:
                 description: Lecture data
+            304:
+                description: Not modified since the ETag in If-None-Match
             404:
                 description: Lecture not found
         """
-        lecture = Lecture.query.filter_by(id=lecture_id).first()
+        try:
+            fields = parse_fields(Lecture)
+            expand = parse_expand(Lecture, self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        cached = not_modified(Lecture, lecture_id, fields, expand)
+        if cached is not None:
+            return cached
+        query = Lecture.query.options(*field_options(Lecture, fields),
+                                      *expand_options(Lecture, expand))
+        lecture = query.filter_by(id=lecture_id).first()
         if lecture is None:
             return make_response(jsonify({"error": "Lecture not found"}), 404)
 
-        return make_response(jsonify(lecture.to_dict()), 200)
+        response = make_response(jsonify(serialize(lecture, fields, expand)), 200)
+        return with_etag(response, Lecture, lecture, fields, expand)
 
-    def patch(self, lecture_id):
+    def patch(self, lecture_id):  # pylint: disable=too-many-return-statements
         """
         Update lecture by ID.
         ---
@@ -169,6 +240,9 @@ class LectureByID(Resource):
         data = request.get_json()
         if not data:
             return make_response(jsonify({"error": "Invalid data format"}), 400)
+        error = patch_error(Lecture, data)
+        if error:
+            return make_response(jsonify({"error": error}), 400)
 
         for attr, value in data.items():
             if attr in ['created_at', 'updated_at'] and value:
@@ -177,12 +251,14 @@ class LectureByID(Resource):
                 except ValueError:
                     return make_response(jsonify({"error": "Invalid date format"}),
                                         400)
-            if hasattr(record, attr):
-                setattr(record, attr, value)
+            setattr(record, attr, value)
 
         try:
             db.session.commit()
             return make_response(jsonify(record.to_dict()), 200)
+        except StaleDataError:
+            db.session.rollback()
+            return stale_response(Lecture)
         except SQLAlchemyError as e:
             db.session.rollback()
             print(f"Database error: {e}")
@@ -0,0 +1,23 @@
+"""
+Module for handling service metrics endpoints.
+"""
+
+from flask import jsonify, make_response
+from flask_restful import Resource
+from application.hashing import password_hashing
+
+
+class HashingMetrics(Resource):
+    """
+    Resource for the load of the password hashing pool.
+    """
+
+    def get(self):
+        """
+        Get password hashing pool metrics.
+        ---
+        responses:
+            200:
+                description: Pool size, queue limit, current and peak queue depth and rejected calls
+        """
+        return make_response(jsonify(password_hashing.stats()), 200)
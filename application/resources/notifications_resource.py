@@ -1,20 +1,64 @@
 """Module for handling notifications endpoints."""
 
-from datetime import datetime
-from flask import jsonify, request, make_response
+from datetime import datetime, timedelta
+from flask import current_app, jsonify, request, make_response
 from flask_restful import Resource
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from database import db
 from application.models.notifications import Notification
+from application.resources.collection import (collection_response, expand_options,
+                                               field_options, parse_expand, parse_fields,
+                                               serialize, QueryParameterError)
+from application.resources.bulk import bulk_delete, bulk_update, BulkRequestError
+from application.resources.conditional import (not_modified, patch_error, stale_response,
+                                                with_etag)
+from application.read_latency import PERCENTILES, UNITS, read_latency, reset_read_latency_cache
 
 
 class NotificationsResource(Resource):
     """Resource for handling notifications."""
 
+    filter_columns = ('student_id', 'instructor_id', 'read_status', 'sent_date')
+    sort_columns = ('sent_date', 'read_date')
+    expand_paths = ('student', 'instructor')
+    bulk_update_columns = ('read_status', 'read_date')
+
     def get(self):
         """
         Get all notifications
         ---
+        parameters:
+            - in: query
+              name: limit
+              type: integer
+              required: false
+              description: Page size; enables cursor pagination
+            - in: query
+              name: after
+              type: string
+              required: false
+              description: Cursor returned as next_cursor by the previous page
+            - in: query
+              name: sort
+              type: string
+              required: false
+              description: Comma separated sort columns, prefix with - for descending
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: stream
+              type: boolean
+              required: false
+              description: Stream the full collection in chunks
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. instructor
         responses:
             200:
                 description: A list of notifications
@@ -26,8 +70,10 @@ class NotificationsResource(Resource):
                 description: Internal Server Error
         """
         try:
-            notifications = Notification.query.all()
-            return jsonify([n.to_dict() for n in notifications])
+            return collection_response(Notification, filters=self.filter_columns,
+                                       sorts=self.sort_columns, expand=self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
         except SQLAlchemyError as e:
             db.session.rollback()
             print(f"Error fetching notifications: {e}")
@@ -127,10 +173,80 @@ class NotificationsResource(Resource):
                         "details": str(e)}), 500
             )
 
+    def patch(self):
+        """
+        Apply the same changes to many notifications.
+
+        The rows are selected by an ``ids`` list or a ``filter`` object and
+        updated with one statement, e.g.
+        ``{"filter": {"student_id": 3}, "changes": {"read_status": "read"}}``.
+        ---
+        parameters:
+            - in: body
+              name: body
+              required: true
+              schema:
+                  type: object
+                  properties:
+                      ids:
+                          type: array
+                          items:
+                              type: integer
+                      filter:
+                          type: object
+                      changes:
+                          type: object
+        responses:
+            200:
+                description: Number and IDs of updated notifications
+            400:
+                description: Invalid target or changes
+            500:
+                description: Internal server error
+        """
+        try:
+            return bulk_update(Notification, request.get_json(silent=True), self.filter_columns,
+                               self.bulk_update_columns, after_write=reset_read_latency_cache)
+        except BulkRequestError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+
+    def delete(self):
+        """
+        Delete many notifications selected by an ``ids`` list or a ``filter`` object.
+        ---
+        parameters:
+            - in: body
+              name: body
+              required: true
+              schema:
+                  type: object
+                  properties:
+                      ids:
+                          type: array
+                          items:
+                              type: integer
+                      filter:
+                          type: object
+        responses:
+            200:
+                description: Number and IDs of deleted notifications
+            400:
+                description: Missing or invalid target
+            500:
+                description: Internal server error
+        """
+        try:
+            return bulk_delete(Notification, request.get_json(silent=True), self.filter_columns,
+                               after_write=reset_read_latency_cache)
+        except BulkRequestError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+
 
 class NotificationByID(Resource):
     """Resource for handling individual notifications by ID."""
 
+    expand_paths = ('student', 'instructor')
+
     def get(self, notification_id):
         """
         Get notification by ID
@@ -141,20 +257,43 @@ class NotificationByID(Resource):
               type: integer
               required: true
               description: The ID of the notification to retrieve
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. instructor
         responses:
             200:
                 description: Notification data
+            304:
+                description: Not modified since the ETag in If-None-Match
             404:
                 description: Notification not found
         """
-        notification = Notification.query.filter_by(id=notification_id).first()
+        try:
+            fields = parse_fields(Notification)
+            expand = parse_expand(Notification, self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        cached = not_modified(Notification, notification_id, fields, expand)
+        if cached is not None:
+            return cached
+        query = Notification.query.options(*field_options(Notification, fields),
+                                           *expand_options(Notification, expand))
+        notification = query.filter_by(id=notification_id).first()
         if notification:
-            return make_response(jsonify(notification.to_dict()), 200)
+            response = make_response(jsonify(serialize(notification, fields, expand)), 200)
+            return with_etag(response, Notification, notification, fields, expand)
         return make_response(
             jsonify({"error": "Notification not found"}), 404
         )
 
-    def patch(self, notification_id):
+    def patch(self, notification_id):  # pylint: disable=too-many-return-statements
         """
         Update notification by ID
         ---
@@ -183,6 +322,9 @@ class NotificationByID(Resource):
         if not data:
             return make_response(jsonify({"error": "Invalid data format"}),
                                 400)
+        error = patch_error(Notification, data)
+        if error:
+            return make_response(jsonify({"error": error}), 400)
 
         for attr, value in data.items():
             if attr in ['sent_date', 'read_date'] and value:
@@ -191,12 +333,14 @@ class NotificationByID(Resource):
                 except ValueError:
                     return make_response(jsonify({"error": "Invalid date format"}),
                                         400)
-            if hasattr(record, attr):
-                setattr(record, attr, value)
+            setattr(record, attr, value)
 
         try:
             db.session.commit()
             return make_response(jsonify(record.to_dict()), 200)
+        except StaleDataError:
+            db.session.rollback()
+            return stale_response(Notification)
         except SQLAlchemyError as e:
             db.session.rollback()
             print(f"Error updating notification: {e}")
@@ -251,3 +395,91 @@ class NotificationByID(Resource):
                 jsonify({"error": "Internal server error",
                         "details": str(e)}), 500
             )
+
+
+def parse_time(name, default):
+    """Read an optional ISO 8601 timestamp from the query string."""
+    raw = request.args.get(name)
+    if raw is None:
+        return default
+    try:
+        return datetime.fromisoformat(raw)
+    except ValueError as e:
+        raise QueryParameterError(f"{name} must be an ISO 8601 timestamp") from e
+
+
+def parse_instructor_id():
+    """Read the optional ``?instructor_id=`` filter from the query string."""
+    raw = request.args.get('instructor_id')
+    if raw is None:
+        return None
+    try:
+        return int(raw)
+    except ValueError as e:
+        raise QueryParameterError("instructor_id must be an integer") from e
+
+
+class NotificationReadLatency(Resource):
+    """Resource for read-latency percentiles of notifications over time."""
+
+    def get(self):
+        """
+        Get read-latency percentiles per time bucket and instructor
+        ---
+        parameters:
+            - in: query
+              name: bucket
+              type: string
+              required: false
+              description: Bucket size, hour or day (default day)
+            - in: query
+              name: start
+              type: string
+              required: false
+              description: ISO 8601 start of the sent_date range, defaults to 30 days before end
+            - in: query
+              name: end
+              type: string
+              required: false
+              description: ISO 8601 end of the sent_date range, defaults to now
+            - in: query
+              name: instructor_id
+              type: integer
+              required: false
+              description: Only notifications sent by this instructor
+        responses:
+            200:
+                description: Count, mean and percentiles of read latency in seconds per bucket
+            400:
+                description: Invalid bucket, range or instructor ID
+            500:
+                description: Internal server error
+        """
+        try:
+            unit = request.args.get('bucket', 'day')
+            if unit not in UNITS:
+                raise QueryParameterError(f"bucket must be one of {', '.join(UNITS)}")
+            now = datetime.now()
+            end = parse_time('end', now)
+            start = parse_time('start', end - timedelta(days=30))
+            if start >= end:
+                raise QueryParameterError("start must be before end")
+            max_buckets = current_app.config.get('READ_LATENCY_MAX_BUCKETS', 2000)
+            if (end - start) / UNITS[unit] > max_buckets:
+                raise QueryParameterError(f"The range spans more than {max_buckets} buckets")
+            instructor_id = parse_instructor_id()
+            series = read_latency(start, end, unit, now, instructor_id)
+            db.session.commit()
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            print(f"Error computing read latency: {e}")
+            return {"message": "Internal server error"}, 500
+        return make_response(jsonify({
+            "bucket": unit,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "percentiles": list(PERCENTILES),
+            "series": series
+        }), 200)
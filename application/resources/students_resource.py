@@ -4,17 +4,70 @@ Module for managing students endpoints.
 
 from flask import jsonify, request, make_response
 from flask_restful import Resource
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import and_, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from database import db
+from application.cache import cached_response, entity_tag, owner_tag, table_tag
+from application.models.course import Course
+from application.models.enrollments import Enrollment
+from application.models.grades import Grade
+from application.models.student_risk import StudentRisk
 from application.models.students import Student
+from application.resources.collection import (collection_response, expand_options,
+                                               field_options, paginate, parse_expand,
+                                               parse_fields, parse_limit, serialize,
+                                               DEFAULT_PAGE_SIZE, QueryParameterError)
+from application.resources.bulk import bulk_create, BulkRequestError, VALIDATION_ERRORS
+from application.resources.conditional import (not_modified, patch_error, stale_response,
+                                                with_etag)
+from application.resources.conflicts import conflict_response
 
 class StudentResource(Resource):
     """Resource for managing student data."""
 
+    filter_columns = ('username', 'email')
+    sort_columns = ('username', 'last_name')
+    expand_paths = ('enrollment', 'enrollment.course')
+    bulk_required = ('username', 'first_name', 'last_name', 'email', 'password_hash',
+                     'profile_picture')
+    bulk_hashed = {'password_hash': '_password_hash'}
+
     def get(self):
         """
         Get all students
         ---
+        parameters:
+            - in: query
+              name: limit
+              type: integer
+              required: false
+              description: Page size; enables cursor pagination
+            - in: query
+              name: after
+              type: string
+              required: false
+              description: Cursor returned as next_cursor by the previous page
+            - in: query
+              name: sort
+              type: string
+              required: false
+              description: Comma separated sort columns, prefix with - for descending
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: stream
+              type: boolean
+              required: false
+              description: Stream the full collection in chunks
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. enrollment.course
         responses:
             200:
                 description: A list of students
@@ -26,15 +79,20 @@ class StudentResource(Resource):
                 description: Internal Server Error
         """
         try:
-            students = Student.query.all()
-            return jsonify([student.to_dict() for student in students])
+            return collection_response(Student, filters=self.filter_columns,
+                                       sorts=self.sort_columns, expand=self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
         except SQLAlchemyError as e:
             print(f"An error occurred: {e}")
             return {"message": "Internal server Error"}, 500
 
-    def post(self):
+    def post(self):  # pylint: disable=too-many-return-statements
         """
         Create new student
+        Send a JSON array instead of form data to create many students in one
+        transaction; each row carries the password as ``password_hash``. Rows
+        whose unique values are taken are listed with a 409.
         ---
         parameters:
             - in: formData
@@ -71,17 +129,25 @@ class StudentResource(Resource):
             201:
                 description: Student successfully created
             400:
-                description: Missing required field
+                description: Missing required field or invalid value
+            409:
+                description: Username or email already in use
             500:
                 description: Internal server error
         """
+        if request.is_json:
+            try:
+                return bulk_create(Student, request.get_json(), self.bulk_required,
+                                   check_unique=True, hashed=self.bulk_hashed)
+            except BulkRequestError as e:
+                return make_response(jsonify({"error": str(e)}), 400)
         try:
             new_student = Student(
                 username=request.form['username'],
                 first_name=request.form['first_name'],
                 last_name=request.form['last_name'],
                 email=request.form['email'],
-                _password_hash=request.form['_password_hash'],
+                password_hash=request.form['_password_hash'],
                 profile_picture=request.form['profile_picture'],
             )
             db.session.add(new_student)
@@ -93,6 +159,12 @@ class StudentResource(Resource):
             return make_response(
                 jsonify({"error": f"Missing required field: {ke}"}), 400
             )
+        except VALIDATION_ERRORS as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        except IntegrityError as ie:
+            db.session.rollback()
+            print(f"Integrity error creating student: {ie}")
+            return conflict_response(Student, ie)
         except SQLAlchemyError as e:
             db.session.rollback()
             print(f"Error creating student: {e}")
@@ -104,6 +176,8 @@ class StudentResource(Resource):
 class StudentByID(Resource):
     """Resource for managing a student by ID."""
 
+    expand_paths = ('enrollment', 'enrollment.course')
+
     def get(self, student_id):
         """
         Get student by ID
@@ -114,19 +188,42 @@ class StudentByID(Resource):
               type: integer
               required: true
               description: The ID of the student to retrieve
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. enrollment.course
         responses:
             200:
                 description: Student data
+            304:
+                description: Not modified since the ETag in If-None-Match
             404:
                 description: Student not found
         """
-        student = Student.query.filter_by(id=student_id).first()
+        try:
+            fields = parse_fields(Student)
+            expand = parse_expand(Student, self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        cached = not_modified(Student, student_id, fields, expand)
+        if cached is not None:
+            return cached
+        query = Student.query.options(*field_options(Student, fields),
+                                      *expand_options(Student, expand))
+        student = query.filter_by(id=student_id).first()
         if student is None:
             return make_response(jsonify({"error": "Student not found"}),
                                 404)
-        return make_response(jsonify(student.to_dict()), 200)
+        response = make_response(jsonify(serialize(student, fields, expand)), 200)
+        return with_etag(response, Student, student, fields, expand)
 
-    def patch(self, student_id):
+    def patch(self, student_id):  # pylint: disable=too-many-return-statements
         """
         Update student by ID
         ---
@@ -145,6 +242,8 @@ class StudentByID(Resource):
                 description: Student successfully updated
             400:
                 description: Invalid data or student not found
+            409:
+                description: Username or email already in use
         """
         student = Student.query.filter_by(id=student_id).first()
         if not student:
@@ -154,14 +253,26 @@ class StudentByID(Resource):
         data = request.get_json()
         if not data:
             return make_response(jsonify({"error": "Invalid data"}), 400)
+        error = patch_error(Student, data)
+        if error:
+            return make_response(jsonify({"error": error}), 400)
 
-        for attr, value in data.items():
-            if hasattr(student, attr):
+        try:
+            for attr, value in data.items():
                 setattr(student, attr, value)
+        except VALIDATION_ERRORS as e:
+            db.session.rollback()
+            return make_response(jsonify({"error": str(e)}), 400)
 
         try:
             db.session.commit()
             return make_response(jsonify(student.to_dict()), 200)
+        except StaleDataError:
+            db.session.rollback()
+            return stale_response(Student)
+        except IntegrityError as ie:
+            db.session.rollback()
+            return conflict_response(Student, ie)
         except SQLAlchemyError as e:
             db.session.rollback()
             return make_response(
@@ -201,3 +312,133 @@ class StudentByID(Resource):
                 jsonify({"error": "Unable to delete student",
                         "details": str(e)}), 500
             )
+
+
+def transcript_tags(student_id):
+    """Cache tags of a transcript: the student, their enrollments and grades, and courses."""
+    return [entity_tag('students', student_id),
+            owner_tag('enrollments', student_id),
+            owner_tag('grades', student_id),
+            table_tag('courses')]
+
+
+def transcript_query(student_id):
+    """
+    Select a student's enrollments with their course and grades in one query.
+
+    The student is the driving row so an unknown student yields no rows at
+    all, while a student without enrollments yields one row of NULLs.
+    """
+    return (
+        select(Student.id, Enrollment.status, Course.id, Course.course_info,
+               Course.instructor_id, Course.schedule, Grade.id, Grade.grade,
+               Grade.date_posted)
+        .outerjoin(Enrollment, Enrollment.student_id == Student.id)
+        .outerjoin(Course, Course.id == Enrollment.course_id)
+        .outerjoin(Grade, and_(Grade.student_id == Enrollment.student_id,
+                               Grade.course_id == Enrollment.course_id))
+        .where(Student.id == student_id)
+        .order_by(Enrollment.course_id, Grade.date_posted, Grade.id)
+    )
+
+
+class StudentTranscript(Resource):
+    """Resource for a student's transcript."""
+
+    @cached_response(Student, tags=transcript_tags, ttl_setting='TRANSCRIPT_CACHE_TTL')
+    def get(self, student_id):
+        """
+        Get a student's transcript
+        ---
+        parameters:
+            - in: path
+              name: student_id
+              type: integer
+              required: true
+              description: The ID of the student
+        responses:
+            200:
+                description: Enrolled courses with enrollment status, course info and grades
+            404:
+                description: Student not found
+            500:
+                description: Internal server error
+        """
+        try:
+            rows = db.session.execute(transcript_query(student_id)).all()
+        except SQLAlchemyError as e:
+            print(f"Error fetching transcript: {e}")
+            return {"message": "Internal server error"}, 500
+        if not rows:
+            return make_response(jsonify({"error": "Student not found"}), 404)
+
+        courses = {}
+        for (_, status, course_id, course_info, instructor_id, schedule,
+             grade_id, grade, date_posted) in rows:
+            if course_id is None:
+                continue
+            entry = courses.setdefault(course_id, {
+                "course": {"id": course_id, "course_info": course_info,
+                           "instructor_id": instructor_id, "schedule": schedule},
+                "status": status,
+                "grades": []
+            })
+            if grade_id is not None:
+                entry["grades"].append({"id": grade_id, "grade": grade,
+                                        "date_posted": date_posted})
+        return make_response(jsonify({"student_id": student_id,
+                                      "courses": list(courses.values())}), 200)
+
+
+class AtRiskStudents(Resource):
+    """Resource for the students flagged by the last at-risk scan."""
+
+    reasons = ('falling_grades', 'low_attendance')
+
+    def get(self):
+        """
+        Get students at risk
+        ---
+        parameters:
+            - in: query
+              name: reason
+              type: string
+              required: false
+              description: Only students flagged for falling_grades or low_attendance
+            - in: query
+              name: limit
+              type: integer
+              required: false
+              description: Page size
+            - in: query
+              name: after
+              type: string
+              required: false
+              description: Cursor returned as next_cursor by the previous page
+        responses:
+            200:
+                description: A page of risk features ordered by student ID
+            400:
+                description: Invalid reason, limit or cursor
+            500:
+                description: Internal server error
+        """
+        try:
+            query = StudentRisk.query.filter(StudentRisk.at_risk.is_(True))
+            reason = request.args.get('reason')
+            if reason is not None:
+                if reason not in self.reasons:
+                    raise QueryParameterError(
+                        f"reason must be one of {', '.join(self.reasons)}"
+                    )
+                query = query.filter(getattr(StudentRisk, reason).is_(True))
+            rows, next_cursor = paginate(query, [(StudentRisk.student_id, False)],
+                                         parse_limit() or DEFAULT_PAGE_SIZE,
+                                         request.args.get('after'))
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        except SQLAlchemyError as e:
+            print(f"Error fetching students at risk: {e}")
+            return {"message": "Internal server error"}, 500
+        return make_response(jsonify({"items": [row.to_dict() for row in rows],
+                                      "next_cursor": next_cursor}), 200)
@@ -6,17 +6,58 @@ from flask import jsonify, request, make_response
 from flask_restful import Resource
 from datetime import datetime
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from database import db
 from application.models.submission import Submission
+from application.resources.collection import (collection_response, expand_options,
+                                               field_options, parse_expand, parse_fields,
+                                               serialize, QueryParameterError)
+from application.resources.conditional import (not_modified, patch_error, stale_response,
+                                                with_etag)
 
 
 class SubmissionResource(Resource):
     """Resource for handling submission-related requests."""
 
+    filter_columns = ('assignment_id', 'student_id', 'grade_id', 'date')
+    sort_columns = ('date',)
+    expand_paths = ('assignment', 'student', 'grade')
+
     def get(self):
         """
         Get all submissions.
         ---
+        parameters:
+            - in: query
+              name: limit
+              type: integer
+              required: false
+              description: Page size; enables cursor pagination
+            - in: query
+              name: after
+              type: string
+              required: false
+              description: Cursor returned as next_cursor by the previous page
+            - in: query
+              name: sort
+              type: string
+              required: false
+              description: Comma separated sort columns, prefix with - for descending
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: stream
+              type: boolean
+              required: false
+              description: Stream the full collection in chunks
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. grade
         responses:
             200:
                 description: A list of submissions
@@ -28,10 +69,10 @@ class SubmissionResource(Resource):
                 description: Internal Server Error
         """
         try:
-            submissions = Submission.query.all()
-            return jsonify(
-                [submission.to_dict() for submission in submissions]
-            )
+            return collection_response(Submission, filters=self.filter_columns,
+                                       sorts=self.sort_columns, expand=self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
         except SQLAlchemyError as e:
             print(f"An error occurred: {e}")
             return {"message": "Internal server Error"}, 500
@@ -113,6 +154,8 @@ class SubmissionResource(Resource):
 class SubmissionByID(Resource):
     """Resource for handling submissions by ID."""
 
+    expand_paths = ('assignment', 'student', 'grade')
+
     def get(self, submission_id):
         """
         Get submission by ID.
@@ -123,18 +166,41 @@ class SubmissionByID(Resource):
               type: integer
               required: true
               description: The ID of the submission to retrieve
+            - in: query
+              name: fields
+              type: string
+              required: false
+              description: Comma separated list of fields to return
+            - in: query
+              name: expand
+              type: string
+              required: false
+              description: Comma separated related entities to embed, e.g. grade
         responses:
             200:
                 description: Submission data
+            304:
+                description: Not modified since the ETag in If-None-Match
             404:
                 description: Submission not found
         """
-        submission = Submission.query.filter_by(id=submission_id).first()
+        try:
+            fields = parse_fields(Submission)
+            expand = parse_expand(Submission, self.expand_paths)
+        except QueryParameterError as e:
+            return make_response(jsonify({"error": str(e)}), 400)
+        cached = not_modified(Submission, submission_id, fields, expand)
+        if cached is not None:
+            return cached
+        query = Submission.query.options(*field_options(Submission, fields),
+                                         *expand_options(Submission, expand))
+        submission = query.filter_by(id=submission_id).first()
         if submission:
-            return make_response(jsonify(submission.to_dict()), 200)
+            response = make_response(jsonify(serialize(submission, fields, expand)), 200)
+            return with_etag(response, Submission, submission, fields, expand)
         return make_response(jsonify({"error": "Submission not found"}), 404)
 
-    def patch(self, submission_id):
+    def patch(self, submission_id):  # pylint: disable=too-many-return-statements
         """
         Update submission by ID.
         ---
@@ -163,6 +229,9 @@ class SubmissionByID(Resource):
         if not data:
             return make_response(jsonify({"error": "Invalid data format"}),
                                 400)
+        error = patch_error(Submission, data)
+        if error:
+            return make_response(jsonify({"error": error}), 400)
 
         for attr, value in data.items():
             if attr == 'date' and value:
@@ -173,12 +242,14 @@ class SubmissionByID(Resource):
                         jsonify({"error": "Invalid date format"}),
                         400
                     )
-            if hasattr(record, attr):
-                setattr(record, attr, value)
+            setattr(record, attr, value)
 
         try:
             db.session.commit()
             return make_response(jsonify(record.to_dict()), 200)
+        except StaleDataError:
+            db.session.rollback()
+            return stale_response(Submission)
         except SQLAlchemyError as e:
             db.session.rollback()
             return make_response(
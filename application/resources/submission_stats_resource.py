@@ -0,0 +1,79 @@
+"""
+Module for handling assignment submission statistics endpoints.
+"""
+
+from flask import jsonify, make_response
+from flask_restful import Resource
+from sqlalchemy.exc import SQLAlchemyError
+from application.submissions import submission_stats
+from application.models.assignment import Assignment
+from application.resources.grade_stats_resource import existing_courses
+
+
+class AssignmentSubmissionStats(Resource):
+    """
+    Resource for the submission statistics of a single assignment.
+    """
+
+    def get(self, assignment_id):
+        """
+        Get submission statistics for an assignment.
+        ---
+        parameters:
+            - in: path
+              name: assignment_id
+              type: integer
+              required: true
+              description: The ID of the assignment
+        responses:
+            200:
+                description: Submitted, on-time, late and missing students and median lateness
+            404:
+                description: Assignment not found
+            500:
+                description: Internal Server Error
+        """
+        try:
+            stats = submission_stats(Assignment.id == assignment_id)
+        except SQLAlchemyError as e:
+            print(f"Error computing submission statistics: {e}")
+            return {"message": "Internal server Error"}, 500
+        if not stats:
+            return make_response(jsonify({"error": "Assignment not found"}), 404)
+        return make_response(jsonify(stats[0]), 200)
+
+
+class CourseSubmissionStats(Resource):
+    """
+    Resource for the submission statistics of every assignment of a course.
+    """
+
+    def get(self, course_id):
+        """
+        Get submission statistics for every assignment of a course.
+        ---
+        parameters:
+            - in: path
+              name: course_id
+              type: integer
+              required: true
+              description: The ID of the course
+        responses:
+            200:
+                description: Per-assignment statistics and their totals for the course
+            404:
+                description: Course not found
+            500:
+                description: Internal Server Error
+        """
+        try:
+            if not existing_courses([course_id]):
+                return make_response(jsonify({"error": "Course not found"}), 404)
+            stats = submission_stats(Assignment.course_id == course_id)
+        except SQLAlchemyError as e:
+            print(f"Error computing submission statistics: {e}")
+            return {"message": "Internal server Error"}, 500
+        totals = {key: sum(entry[key] for entry in stats)
+                  for key in ('submitted', 'on_time', 'late', 'missing')}
+        return make_response(jsonify({"course_id": course_id, "totals": totals,
+                                      "assignments": stats}), 200)
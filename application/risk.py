@@ -0,0 +1,248 @@
+"""
+Batch detection of students at risk.
+
+``flask scan-at-risk-students`` computes risk features per student from the
+grade, attendance and enrollment tables and stores them in student_risks,
+which ``/students/at-risk`` pages through. A student is at risk when they
+are enrolled in at least one course and either the mean of their most
+recent grades dropped by RISK_GRADE_DROP points or more compared to the
+grades before, or their attendance rate is below RISK_ATTENDANCE_THRESHOLD.
+
+The three tables are read as result streams ordered by student ID,
+RISK_SCAN_BATCH_SIZE rows at a time, and merged on the student ID, so each
+student's features are computed in a single pass over the tables while at
+most one chunk of every stream is held in memory. Attendance and active
+enrollments are aggregated per student by the database.
+
+Every flush that writes one of the three tables queues the owning students
+in student_risk_changes, and the bulk endpoints do the same through
+``record_risk_changes``. The queue holds at most one row per student:
+queueing a student again bumps the row's version. An incremental scan
+recomputes only the queued students and then removes the rows whose
+version it read, so a student changed while the scan ran stays queued;
+``--full`` recomputes every student.
+"""
+
+import heapq
+from datetime import datetime
+from itertools import chain, groupby
+from operator import itemgetter
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import case, delete, event, func, insert, select, tuple_
+from sqlalchemy.orm import Session
+from database import db
+from application.cache import owner_ids
+from application.models.attendance import Attendance
+from application.models.enrollments import Enrollment
+from application.models.grades import Grade
+from application.models.student_risk import StudentRisk, StudentRiskChange
+from application.rollups import UPSERTS
+
+TRACKED_MODELS = (Grade, Attendance, Enrollment)
+RECENT_GRADES = 3
+GRADE_DROP = 10
+ATTENDANCE_THRESHOLD = 0.75
+SCAN_BATCH_SIZE = 1000
+
+
+def record_risk_changes(student_ids, connection=None):
+    """Queue ``student_ids`` for the next incremental scan, bumping already queued ones."""
+    rows = [{'student_id': student_id} for student_id in sorted(set(student_ids))]
+    if rows:
+        connection = connection if connection is not None else db.session.connection()
+        table = StudentRiskChange.__table__
+        statement = UPSERTS[connection.dialect.name](table).on_conflict_do_update(
+            index_elements=['student_id'], set_={'version': table.c.version + 1}
+        )
+        connection.execute(statement, rows)
+
+
+@event.listens_for(Session, 'after_flush')
+def _queue_risk_changes(session, _flush_context):
+    """Queue the owners of the grade, attendance and enrollment rows written by this flush."""
+    owners = set()
+    written = chain(session.new, session.deleted,
+                    [instance for instance in session.dirty if session.is_modified(instance)])
+    for instance in written:
+        if isinstance(instance, TRACKED_MODELS):
+            owners.update(owner_ids(instance))
+    record_risk_changes(owners, session.connection())
+
+
+def risk_settings():
+    """Read the scan thresholds from the app config."""
+    config = current_app.config
+    return {
+        'recent_grades': config.get('RISK_RECENT_GRADES', RECENT_GRADES),
+        'grade_drop': config.get('RISK_GRADE_DROP', GRADE_DROP),
+        'attendance_threshold': config.get('RISK_ATTENDANCE_THRESHOLD', ATTENDANCE_THRESHOLD),
+        'batch_size': config.get('RISK_SCAN_BATCH_SIZE', SCAN_BATCH_SIZE)
+    }
+
+
+def risk_streams(student_ids, batch_size):
+    """
+    Open the grade, attendance and enrollment streams, each ordered by student ID.
+
+    Grades are ordered by posting date within a student. All students are
+    read when ``student_ids`` is None.
+    """
+    def only_selected(column):
+        return [] if student_ids is None else [column.in_(student_ids)]
+
+    grades = (select(Grade.student_id, Grade.grade)
+              .where(*only_selected(Grade.student_id))
+              .order_by(Grade.student_id, Grade.date_posted, Grade.id))
+    attendance = (select(Attendance.student_id,
+                         func.sum(case((Attendance.attendance_status == 'present', 1), else_=0)),
+                         func.count())
+                  .where(*only_selected(Attendance.student_id))
+                  .group_by(Attendance.student_id)
+                  .order_by(Attendance.student_id))
+    enrollments = (select(Enrollment.student_id, func.count())
+                   .where(Enrollment.status == 'enrolled', *only_selected(Enrollment.student_id))
+                   .group_by(Enrollment.student_id)
+                   .order_by(Enrollment.student_id))
+    return [db.session.execute(query.execution_options(yield_per=batch_size))
+            for query in (grades, attendance, enrollments)]
+
+
+def student_groups(position, stream):
+    """Yield ``(student_id, position, rows)`` for each student of a stream."""
+    for student_id, rows in groupby(stream, key=itemgetter(0)):
+        yield student_id, position, list(rows)
+
+
+def merge_by_student(*streams):
+    """
+    Merge result streams that are ordered by student ID.
+
+    Yields ``(student_id, groups)`` where ``groups[i]`` holds the rows of
+    ``streams[i]`` for that student, or an empty list if it has none.
+    """
+    merged = heapq.merge(*[student_groups(position, stream)
+                           for position, stream in enumerate(streams)])
+    for student_id, entries in groupby(merged, key=itemgetter(0)):
+        groups = [[] for _ in streams]
+        for _, position, rows in entries:
+            groups[position] = rows
+        yield student_id, groups
+
+
+def mean(values):
+    """Mean of ``values`` rounded to 4 places, or None if there are none."""
+    return round(sum(values) / len(values), 4) if values else None
+
+
+def grade_trend(values, count):
+    """
+    Means of the last ``count`` grades and of the ``count`` grades before them.
+
+    Returns ``(recent, previous, trend)``; the trend is None unless both
+    windows hold at least one grade.
+    """
+    recent, previous = mean(values[-count:]), mean(values[-2 * count:-count])
+    if recent is None or previous is None:
+        return recent, previous, None
+    return recent, previous, round(recent - previous, 4)
+
+
+def risk_features(student_id, groups, settings):
+    """Compute the StudentRisk columns of one student from its merged stream rows."""
+    grades, attendance, enrollments = groups
+    values = [row[1] for row in grades]
+    recent, previous, trend = grade_trend(values, settings['recent_grades'])
+    present, attended = attendance[0][1:] if attendance else (0, 0)
+    rate = round(present / attended, 4) if attended else None
+    active = enrollments[0][1] if enrollments else 0
+    features = {
+        'student_id': student_id,
+        'grade_count': len(values),
+        'recent_grade_mean': recent,
+        'previous_grade_mean': previous,
+        'grade_trend': trend,
+        'attendance_count': attended,
+        'attendance_rate': rate,
+        'active_enrollments': active,
+        'falling_grades': trend is not None and trend <= -settings['grade_drop'],
+        'low_attendance': rate is not None and rate < settings['attendance_threshold']
+    }
+    features['at_risk'] = active > 0 and (features['falling_grades']
+                                          or features['low_attendance'])
+    return features
+
+
+def scan_students(student_ids=None, settings=None):
+    """
+    Recompute the stored risk features of ``student_ids``, or of every student.
+
+    Students without any grade, attendance or enrollment rows left lose
+    their stored features. Returns the number of students written; the
+    caller commits.
+    """
+    settings = settings or risk_settings()
+    table = StudentRisk.__table__
+    clear = delete(table)
+    if student_ids is not None:
+        clear = clear.where(table.c.student_id.in_(student_ids))
+    db.session.execute(clear)
+    computed_at = datetime.utcnow()
+    batch, written = [], 0
+    for student_id, groups in merge_by_student(*risk_streams(student_ids,
+                                                             settings['batch_size'])):
+        batch.append(dict(risk_features(student_id, groups, settings), computed_at=computed_at))
+        if len(batch) >= settings['batch_size']:
+            db.session.execute(insert(table), batch)
+            written, batch = written + len(batch), []
+    if batch:
+        db.session.execute(insert(table), batch)
+    return written + len(batch)
+
+
+def run_risk_scan(full=False):
+    """
+    Run the at-risk scan and return ``(students written, queued changes handled)``.
+
+    An incremental run recomputes the queued students RISK_SCAN_BATCH_SIZE
+    at a time. Queue rows are removed only if their version is still the
+    one read at the start, so students queued again while the scan runs
+    are left for the next run. The caller commits.
+    """
+    settings = risk_settings()
+    size = settings['batch_size']
+    pending = db.session.execute(
+        select(StudentRiskChange.student_id, StudentRiskChange.version)
+        .order_by(StudentRiskChange.student_id)
+    ).all()
+    if full:
+        written = scan_students(settings=settings)
+    else:
+        student_ids = [student_id for student_id, _ in pending]
+        written = sum(scan_students(student_ids[start:start + size], settings)
+                      for start in range(0, len(student_ids), size))
+    handled = 0
+    table = StudentRiskChange.__table__
+    for start in range(0, len(pending), size):
+        handled += db.session.execute(delete(table).where(
+            tuple_(table.c.student_id, table.c.version).in_(
+                [tuple(row) for row in pending[start:start + size]]
+            )
+        )).rowcount
+    return written, handled
+
+
+@click.command('scan-at-risk-students')
+@click.option('--full', is_flag=True,
+              help='Recompute every student instead of only those with queued changes.')
+@with_appcontext
+def scan_at_risk_students_command(full):
+    """Recompute the risk features of students whose records changed."""
+    written, handled = run_risk_scan(full)
+    db.session.commit()
+    flagged = db.session.execute(
+        select(func.count()).select_from(StudentRisk).where(StudentRisk.at_risk.is_(True))
+    ).scalar()
+    click.echo(f"Scanned {written} students from {handled} queued changes; "
+               f"{flagged} students at risk.")
@@ -0,0 +1,180 @@
+"""
+Incremental maintenance of the attendance rollup tables.
+
+Every flush that inserts, updates or deletes Attendance rows through the
+ORM turns them into +1/-1 deltas on the matching AttendanceRollup rows and
+on the students' StudentAttendanceTotal rows, and applies them with an
+upsert in the same transaction, so the rollups commit or roll back
+together with the attendance change. Rows whose counts drop to zero are
+deleted, and rows of students, lectures or instructors deleted in the
+same flush are dropped. Bulk statements bypass the unit of work; the bulk
+endpoints instead recompute the rollups of the students they touched.
+``flask rebuild-attendance-rollups`` recomputes both tables, e.g. after a
+backfill or when first deploying them.
+"""
+
+from collections import Counter, defaultdict
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import case, delete, event, func, insert, inspect, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from database import db
+from application.models.attendance import Attendance
+from application.models.attendance_rollup import AttendanceRollup, StudentAttendanceTotal
+from application.models.instructors import Instructor
+from application.models.lectures import Lecture
+from application.models.students import Student
+
+KEY_COLUMNS = ('student_id', 'lecture_id', 'instructor_id')
+OWNER_MODELS = {Student: 'student_id', Lecture: 'lecture_id', Instructor: 'instructor_id'}
+STATUS_COLUMNS = {'present': 'present_count', 'absent': 'absent_count'}
+UPSERTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+
+
+def current_key(instance):
+    """Rollup key and status of an attendance row as it is now."""
+    return tuple(getattr(instance, name) for name in KEY_COLUMNS + ('attendance_status',))
+
+
+def previous_key(instance):
+    """Rollup key and status of an attendance row as it was last loaded or flushed."""
+    state = inspect(instance)
+    values = []
+    for name in KEY_COLUMNS + ('attendance_status',):
+        history = state.attrs[name].history
+        previous = history.deleted or history.unchanged
+        values.append(previous[0] if previous else getattr(instance, name))
+    return tuple(values)
+
+
+def attendance_deltas(session):
+    """Count the rollup changes caused by the attendance rows of one flush."""
+    deltas = Counter()
+    for instance in session.new:
+        if isinstance(instance, Attendance):
+            deltas[current_key(instance)] += 1
+    for instance in session.deleted:
+        if isinstance(instance, Attendance):
+            deltas[previous_key(instance)] -= 1
+    for instance in session.dirty:
+        if isinstance(instance, Attendance) and session.is_modified(instance):
+            deltas[previous_key(instance)] -= 1
+            deltas[current_key(instance)] += 1
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+def upsert_counts(connection, table, key_columns, rows):
+    """Add the counts in ``rows`` (keyed by ``key_columns`` values) to ``table``."""
+    statement = UPSERTS[connection.dialect.name](table)
+    statement = statement.on_conflict_do_update(
+        index_elements=list(key_columns),
+        set_={column: table.c[column] + statement.excluded[column]
+              for column in STATUS_COLUMNS.values()}
+    )
+    connection.execute(statement, [dict(zip(key_columns, key), **counts)
+                                   for key, counts in rows.items()])
+    connection.execute(delete(table).where(
+        tuple_(*[table.c[column] for column in key_columns]).in_(list(rows)),
+        *[table.c[column] == 0 for column in STATUS_COLUMNS.values()]
+    ))
+
+
+def apply_deltas(connection, deltas):
+    """Add ``deltas`` to the rollup and total rows, creating and deleting rows on the way."""
+    rows = defaultdict(lambda: dict.fromkeys(STATUS_COLUMNS.values(), 0))
+    totals = defaultdict(lambda: dict.fromkeys(STATUS_COLUMNS.values(), 0))
+    for (*key, status), delta in deltas.items():
+        rows[tuple(key)][STATUS_COLUMNS[status]] += delta
+        totals[(key[0],)][STATUS_COLUMNS[status]] += delta
+    upsert_counts(connection, AttendanceRollup.__table__, KEY_COLUMNS, rows)
+    upsert_counts(connection, StudentAttendanceTotal.__table__, ('student_id',), totals)
+
+
+def deleted_owners(session, owner_models=None):
+    """
+    IDs of the owners deleted by a flush, per column referencing them.
+
+    ``owner_models`` maps each owning model to that column and defaults to
+    the students, lectures and instructors of the rollups.
+    """
+    owner_models = OWNER_MODELS if owner_models is None else owner_models
+    owners = defaultdict(set)
+    for instance in session.deleted:
+        column = owner_models.get(type(instance))
+        if column is not None:
+            owners[column].add(instance.id)
+    return owners
+
+
+def drop_owned_rows(connection, owners):
+    """
+    Delete the rollup rows of deleted students, lectures and instructors.
+
+    The foreign keys cascade on databases that enforce them; this keeps
+    SQLite, which does not, in the same state.
+    """
+    rollups = AttendanceRollup.__table__
+    for column, ids in owners.items():
+        connection.execute(delete(rollups).where(rollups.c[column].in_(ids)))
+    if owners.get('student_id'):
+        totals = StudentAttendanceTotal.__table__
+        connection.execute(delete(totals).where(totals.c.student_id.in_(owners['student_id'])))
+
+
+@event.listens_for(Session, 'after_flush')
+def _maintain_rollups(session, _flush_context):
+    """Apply the rollup deltas of the attendance rows written by this flush."""
+    deltas = attendance_deltas(session)
+    owners = deleted_owners(session)
+    # Rows of deleted owners are dropped outright rather than decremented,
+    # which would re-insert them against a missing foreign key.
+    deltas = {key: delta for key, delta in deltas.items()
+              if not any(key[index] in owners.get(column, ())
+                         for index, column in enumerate(KEY_COLUMNS))}
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+    if owners:
+        drop_owned_rows(session.connection(), owners)
+
+
+def rollup_query(student_ids=None, key_columns=KEY_COLUMNS):
+    """Aggregate attendance rows per ``key_columns``, optionally for some students only."""
+    counts = [func.sum(case((Attendance.attendance_status == status, 1), else_=0))
+              for status in STATUS_COLUMNS]
+    query = (select(*[getattr(Attendance, name) for name in key_columns], *counts)
+             .group_by(*[getattr(Attendance, name) for name in key_columns]))
+    if student_ids is not None:
+        query = query.where(Attendance.student_id.in_(student_ids))
+    return query
+
+
+def refresh_attendance_rollups(student_ids=None):
+    """
+    Recompute rollup and total rows from the attendance table.
+
+    Only the rows of ``student_ids`` are rebuilt when it is given, otherwise
+    the whole tables. The caller commits.
+    """
+    if student_ids is not None:
+        student_ids = list(student_ids)
+    for model, key_columns in ((AttendanceRollup, KEY_COLUMNS),
+                               (StudentAttendanceTotal, ('student_id',))):
+        table = model.__table__
+        clear = delete(table)
+        if student_ids is not None:
+            clear = clear.where(table.c.student_id.in_(student_ids))
+        db.session.execute(clear)
+        db.session.execute(insert(table).from_select(
+            list(key_columns) + list(STATUS_COLUMNS.values()),
+            rollup_query(student_ids, key_columns)
+        ))
+
+
+@click.command('rebuild-attendance-rollups')
+@with_appcontext
+def rebuild_attendance_rollups_command():
+    """Recompute every attendance rollup from the attendance table."""
+    refresh_attendance_rollups()
+    db.session.commit()
+    click.echo(f"Rebuilt {db.session.query(AttendanceRollup).count()} attendance rollups.")
@@ -0,0 +1,29 @@
+"""
+SQL functions that need a different spelling per database.
+"""
+
+from sqlalchemy import Float
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class SecondsBetween(FunctionElement):  # pylint: disable=too-many-ancestors
+    """``SecondsBetween(end, start)``: seconds elapsed from ``start`` to ``end``."""
+
+    type = Float()
+    name = 'seconds_between'
+    inherit_cache = True
+
+
+@compiles(SecondsBetween)
+def _seconds_between(element, compiler, **kw):
+    end, start = list(element.clauses)
+    return (f"EXTRACT(EPOCH FROM ({compiler.process(end, **kw)} - "
+            f"{compiler.process(start, **kw)}))")
+
+
+@compiles(SecondsBetween, 'sqlite')
+def _seconds_between_sqlite(element, compiler, **kw):
+    end, start = list(element.clauses)
+    return (f"((julianday({compiler.process(end, **kw)}) - "
+            f"julianday({compiler.process(start, **kw)})) * 86400.0)")
@@ -26,8 +26,53 @@ class Config:
     )
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    REJECT_UNINDEXED_FILTERS = os.getenv('REJECT_UNINDEXED_FILTERS', 'false').lower() == 'true'
+
+    EXPAND_MAX_DEPTH = int(os.getenv('EXPAND_MAX_DEPTH', '2'))
+    BULK_MAX_ROWS = int(os.getenv('BULK_MAX_ROWS', '5000'))
+
+    RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_PATH = os.getenv(
+        'RESPONSE_CACHE_PATH', os.path.join(BASE_DIR, 'response_cache.sqlite3')
+    )
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', '60'))
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', '1024'))
+    TRANSCRIPT_CACHE_TTL = int(os.getenv('TRANSCRIPT_CACHE_TTL', '30'))
+
+    RISK_RECENT_GRADES = int(os.getenv('RISK_RECENT_GRADES', '3'))
+    RISK_GRADE_DROP = float(os.getenv('RISK_GRADE_DROP', '10'))
+    RISK_ATTENDANCE_THRESHOLD = float(os.getenv('RISK_ATTENDANCE_THRESHOLD', '0.75'))
+    RISK_SCAN_BATCH_SIZE = int(os.getenv('RISK_SCAN_BATCH_SIZE', '1000'))
+
+    READ_LATENCY_MAX_BUCKETS = int(os.getenv('READ_LATENCY_MAX_BUCKETS', '2000'))
+
+    HASHING_WORKERS = int(os.getenv('HASHING_WORKERS', str(os.cpu_count() or 1)))
+    HASHING_MAX_PENDING = int(os.getenv('HASHING_MAX_PENDING', '64'))
+    HASHING_QUEUE_TIMEOUT = float(os.getenv('HASHING_QUEUE_TIMEOUT', '2'))
+    ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', '3'))
+    ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', '65536'))
+    ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', '4'))
+
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'your_jwt_secret_key')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=15)
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=7)
+    JWT_VERIFIED_CACHE_SIZE = int(os.getenv('JWT_VERIFIED_CACHE_SIZE', '4096'))
+    JWT_VERIFIED_CACHE_TTL = int(os.getenv('JWT_VERIFIED_CACHE_TTL', '60'))
+
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'memory')
+    RATE_LIMIT_PATH = os.getenv(
+        'RATE_LIMIT_PATH', os.path.join(BASE_DIR, 'rate_limits.sqlite3')
+    )
+    RATE_LIMIT_MAX_KEYS = int(os.getenv('RATE_LIMIT_MAX_KEYS', '10000'))
+    RATE_LIMITS = {
+        'auth_login': {'ip': '20/minute', 'username': '5/minute'},
+        'auth_refresh': {'ip': '60/minute'},
+        'POST': {'ip': '120/minute'},
+        'PUT': {'ip': '120/minute'},
+        'PATCH': {'ip': '120/minute'},
+        'DELETE': {'ip': '120/minute'},
+    }
 
     def __repr__(self):
         return f"<Config {self.API_TITLE}, Version: {self.API_VERSION}>"
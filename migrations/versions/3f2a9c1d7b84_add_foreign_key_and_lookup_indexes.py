@@ -0,0 +1,51 @@
+"""add foreign key and lookup indexes
+
+Revision ID: 3f2a9c1d7b84
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c1d7b84'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# Tables are created with db.create_all(), which already builds these indexes
+# for new databases, so every operation is guarded with if_not_exists/if_exists.
+INDEXES = [
+    ('ix_assignments_course_id', 'assignments', ['course_id']),
+    ('ix_attendances_student_id', 'attendances', ['student_id']),
+    ('ix_attendances_lecture_id', 'attendances', ['lecture_id']),
+    ('ix_attendances_instructor_id', 'attendances', ['instructor_id']),
+    ('ix_comments_discussion_id_posted_at', 'comments', ['discussion_id', 'posted_at']),
+    ('ix_comments_student_id', 'comments', ['student_id']),
+    ('ix_comments_instructor_id', 'comments', ['instructor_id']),
+    ('ix_courses_instructor_id', 'courses', ['instructor_id']),
+    ('ix_discussions_course_id', 'discussions', ['course_id']),
+    ('ix_enrollments_course_id', 'enrollments', ['course_id']),
+    ('ix_enrollments_student_id_course_id', 'enrollments', ['student_id', 'course_id']),
+    ('ix_grades_student_id', 'grades', ['student_id']),
+    ('ix_grades_course_id_grade', 'grades', ['course_id', 'grade']),
+    ('ix_lectures_instructor_id', 'lectures', ['instructor_id']),
+    ('ix_notifications_student_id', 'notifications', ['student_id']),
+    ('ix_notifications_instructor_id', 'notifications', ['instructor_id']),
+    ('ix_notifications_sent_date', 'notifications', ['sent_date']),
+    ('ix_submissions_assignment_id', 'submissions', ['assignment_id']),
+    ('ix_submissions_student_id', 'submissions', ['student_id']),
+    ('ix_submissions_grade_id', 'submissions', ['grade_id']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,38 @@
+"""add row version columns
+
+Revision ID: 8c41e07b2d5a
+Revises: 3f2a9c1d7b84
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c41e07b2d5a'
+down_revision = '3f2a9c1d7b84'
+branch_labels = None
+depends_on = None
+
+
+TABLES = [
+    'assignments', 'attendances', 'comments', 'courses', 'discussions',
+    'enrollments', 'files', 'grades', 'instructors', 'lectures',
+    'notifications', 'students', 'submissions',
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for table in TABLES:
+        columns = {column['name'] for column in inspector.get_columns(table)}
+        if 'version' not in columns:
+            op.add_column(table, sa.Column('version', sa.Integer(), nullable=False,
+                                           server_default='1'))
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('version')
@@ -0,0 +1,46 @@
+"""keep one queued risk change per student
+
+Revision ID: a7d3c9e5f182
+Revises: b1f4d7e92a63
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3c9e5f182'
+down_revision = 'b1f4d7e92a63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.rename_table('student_risk_changes', 'student_risk_changes_old')
+    op.create_table(
+        'student_risk_changes',
+        sa.Column('student_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('student_id')
+    )
+    op.execute(
+        "INSERT INTO student_risk_changes (student_id, version) "
+        "SELECT DISTINCT student_id, 1 FROM student_risk_changes_old"
+    )
+    op.drop_table('student_risk_changes_old')
+
+
+def downgrade():
+    op.rename_table('student_risk_changes', 'student_risk_changes_new')
+    op.create_table(
+        'student_risk_changes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(
+        "INSERT INTO student_risk_changes (student_id) "
+        "SELECT student_id FROM student_risk_changes_new"
+    )
+    op.drop_table('student_risk_changes_new')
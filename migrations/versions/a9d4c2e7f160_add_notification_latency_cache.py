@@ -0,0 +1,47 @@
+"""add notification latency cache
+
+Revision ID: a9d4c2e7f160
+Revises: f6b3d8a2c417
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d4c2e7f160'
+down_revision = 'f6b3d8a2c417'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if 'notification_latency_buckets' not in tables:
+        op.create_table(
+            'notification_latency_buckets',
+            sa.Column('unit', sa.String(), nullable=False),
+            sa.Column('bucket_start', sa.DateTime(), nullable=False),
+            sa.Column('instructor_id', sa.Integer(), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.Column('mean', sa.Float(), nullable=False),
+            sa.Column('p50', sa.Float(), nullable=False),
+            sa.Column('p90', sa.Float(), nullable=False),
+            sa.Column('p99', sa.Float(), nullable=False),
+            sa.ForeignKeyConstraint(['instructor_id'], ['instructors.id']),
+            sa.PrimaryKeyConstraint('unit', 'bucket_start', 'instructor_id')
+        )
+    if 'notification_latency_coverage' not in tables:
+        op.create_table(
+            'notification_latency_coverage',
+            sa.Column('unit', sa.String(), nullable=False),
+            sa.Column('cached_from', sa.DateTime(), nullable=False),
+            sa.Column('cached_until', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('unit')
+        )
+
+
+def downgrade():
+    op.drop_table('notification_latency_coverage')
+    op.drop_table('notification_latency_buckets')
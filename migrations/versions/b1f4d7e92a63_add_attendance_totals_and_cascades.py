@@ -0,0 +1,55 @@
+"""add student attendance totals and cascade rollup foreign keys
+
+Revision ID: b1f4d7e92a63
+Revises: c3e8a5f2d716
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b1f4d7e92a63'
+down_revision = 'c3e8a5f2d716'
+branch_labels = None
+depends_on = None
+
+ROLLUP_FOREIGN_KEYS = (('student_id', 'students'), ('lecture_id', 'lectures'),
+                       ('instructor_id', 'instructors'))
+
+
+def replace_rollup_foreign_keys(ondelete):
+    """Recreate the rollup foreign keys; only PostgreSQL enforces them here."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for column, target in ROLLUP_FOREIGN_KEYS:
+        name = f'attendance_rollups_{column}_fkey'
+        op.drop_constraint(name, 'attendance_rollups', type_='foreignkey')
+        op.create_foreign_key(name, 'attendance_rollups', target, [column], ['id'],
+                              ondelete=ondelete)
+
+
+def upgrade():
+    op.execute("DELETE FROM attendance_rollups WHERE present_count = 0 AND absent_count = 0")
+    replace_rollup_foreign_keys('CASCADE')
+    if 'student_attendance_totals' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'student_attendance_totals',
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('present_count', sa.Integer(), nullable=False),
+        sa.Column('absent_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['student_id'], ['students.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('student_id')
+    )
+    op.execute(
+        "INSERT INTO student_attendance_totals (student_id, present_count, absent_count) "
+        "SELECT student_id, SUM(present_count), SUM(absent_count) "
+        "FROM attendance_rollups GROUP BY student_id"
+    )
+
+
+def downgrade():
+    op.drop_table('student_attendance_totals')
+    replace_rollup_foreign_keys(None)
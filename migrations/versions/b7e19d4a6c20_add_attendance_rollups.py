@@ -0,0 +1,45 @@
+"""add attendance rollups
+
+Revision ID: b7e19d4a6c20
+Revises: 8c41e07b2d5a
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e19d4a6c20'
+down_revision = '8c41e07b2d5a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'attendance_rollups' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'attendance_rollups',
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('lecture_id', sa.Integer(), nullable=False),
+        sa.Column('instructor_id', sa.Integer(), nullable=False),
+        sa.Column('present_count', sa.Integer(), nullable=False),
+        sa.Column('absent_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['student_id'], ['students.id']),
+        sa.ForeignKeyConstraint(['lecture_id'], ['lectures.id']),
+        sa.ForeignKeyConstraint(['instructor_id'], ['instructors.id']),
+        sa.PrimaryKeyConstraint('student_id', 'lecture_id', 'instructor_id')
+    )
+    op.execute(
+        "INSERT INTO attendance_rollups "
+        "(student_id, lecture_id, instructor_id, present_count, absent_count) "
+        "SELECT student_id, lecture_id, instructor_id, "
+        "SUM(CASE WHEN attendance_status = 'present' THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN attendance_status = 'absent' THEN 1 ELSE 0 END) "
+        "FROM attendances GROUP BY student_id, lecture_id, instructor_id"
+    )
+
+
+def downgrade():
+    op.drop_table('attendance_rollups')
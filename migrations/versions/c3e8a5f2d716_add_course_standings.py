@@ -0,0 +1,54 @@
+"""add course standings
+
+Revision ID: c3e8a5f2d716
+Revises: a9d4c2e7f160
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e8a5f2d716'
+down_revision = 'a9d4c2e7f160'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if 'course_standings' not in tables:
+        op.create_table(
+            'course_standings',
+            sa.Column('course_id', sa.Integer(), nullable=False),
+            sa.Column('student_id', sa.Integer(), nullable=False),
+            sa.Column('grade_total', sa.Integer(), nullable=False),
+            sa.Column('grade_count', sa.Integer(), nullable=False),
+            sa.Column('average', sa.Float(), nullable=True),
+            sa.ForeignKeyConstraint(['course_id'], ['courses.id']),
+            sa.ForeignKeyConstraint(['student_id'], ['students.id']),
+            sa.PrimaryKeyConstraint('course_id', 'student_id')
+        )
+        op.create_index('ix_course_standings_course_id_average', 'course_standings',
+                        ['course_id', 'average', 'student_id'], unique=False)
+        op.execute(
+            "INSERT INTO course_standings "
+            "(course_id, student_id, grade_total, grade_count, average) "
+            "SELECT course_id, student_id, SUM(grade), COUNT(*), AVG(grade * 1.0) "
+            "FROM grades GROUP BY course_id, student_id"
+        )
+    if 'course_standing_revisions' not in tables:
+        op.create_table(
+            'course_standing_revisions',
+            sa.Column('course_id', sa.Integer(), nullable=False),
+            sa.Column('revision', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['course_id'], ['courses.id']),
+            sa.PrimaryKeyConstraint('course_id')
+        )
+
+
+def downgrade():
+    op.drop_table('course_standing_revisions')
+    op.drop_index('ix_course_standings_course_id_average', table_name='course_standings')
+    op.drop_table('course_standings')
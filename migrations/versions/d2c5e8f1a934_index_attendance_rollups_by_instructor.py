@@ -0,0 +1,25 @@
+"""index attendance rollups by instructor
+
+Revision ID: d2c5e8f1a934
+Revises: b7e19d4a6c20
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2c5e8f1a934'
+down_revision = 'b7e19d4a6c20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_attendance_rollups_instructor_id', 'attendance_rollups',
+                    ['instructor_id'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_attendance_rollups_instructor_id', table_name='attendance_rollups',
+                  if_exists=True)
@@ -0,0 +1,37 @@
+"""cascade course standing foreign keys
+
+Revision ID: d5b9e1c7a204
+Revises: a7d3c9e5f182
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5b9e1c7a204'
+down_revision = 'a7d3c9e5f182'
+branch_labels = None
+depends_on = None
+
+STANDING_FOREIGN_KEYS = (('course_standings', 'course_id', 'courses'),
+                         ('course_standings', 'student_id', 'students'),
+                         ('course_standing_revisions', 'course_id', 'courses'))
+
+
+def replace_standing_foreign_keys(ondelete):
+    """Recreate the standing foreign keys; only PostgreSQL enforces them here."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, column, target in STANDING_FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, target, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade():
+    replace_standing_foreign_keys('CASCADE')
+
+
+def downgrade():
+    replace_standing_foreign_keys(None)
@@ -0,0 +1,53 @@
+"""add student risk tables
+
+Revision ID: e4a1f7c3b958
+Revises: d2c5e8f1a934
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a1f7c3b958'
+down_revision = 'd2c5e8f1a934'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if 'student_risks' not in tables:
+        op.create_table(
+            'student_risks',
+            sa.Column('student_id', sa.Integer(), nullable=False),
+            sa.Column('grade_count', sa.Integer(), nullable=False),
+            sa.Column('recent_grade_mean', sa.Float(), nullable=True),
+            sa.Column('previous_grade_mean', sa.Float(), nullable=True),
+            sa.Column('grade_trend', sa.Float(), nullable=True),
+            sa.Column('attendance_count', sa.Integer(), nullable=False),
+            sa.Column('attendance_rate', sa.Float(), nullable=True),
+            sa.Column('active_enrollments', sa.Integer(), nullable=False),
+            sa.Column('falling_grades', sa.Boolean(), nullable=False),
+            sa.Column('low_attendance', sa.Boolean(), nullable=False),
+            sa.Column('at_risk', sa.Boolean(), nullable=False),
+            sa.Column('computed_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['student_id'], ['students.id']),
+            sa.PrimaryKeyConstraint('student_id')
+        )
+        op.create_index('ix_student_risks_at_risk_student_id', 'student_risks',
+                        ['at_risk', 'student_id'], unique=False)
+    if 'student_risk_changes' not in tables:
+        op.create_table(
+            'student_risk_changes',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('student_id', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade():
+    op.drop_table('student_risk_changes')
+    op.drop_index('ix_student_risks_at_risk_student_id', table_name='student_risks')
+    op.drop_table('student_risks')
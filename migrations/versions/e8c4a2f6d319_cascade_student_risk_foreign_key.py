@@ -0,0 +1,34 @@
+"""cascade the student risk foreign key
+
+Revision ID: e8c4a2f6d319
+Revises: d5b9e1c7a204
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8c4a2f6d319'
+down_revision = 'd5b9e1c7a204'
+branch_labels = None
+depends_on = None
+
+NAME = 'student_risks_student_id_fkey'
+
+
+def replace_risk_foreign_key(ondelete):
+    """Recreate the student_risks foreign key; only PostgreSQL enforces it here."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_constraint(NAME, 'student_risks', type_='foreignkey')
+    op.create_foreign_key(NAME, 'student_risks', 'students', ['student_id'], ['id'],
+                          ondelete=ondelete)
+
+
+def upgrade():
+    replace_risk_foreign_key('CASCADE')
+
+
+def downgrade():
+    replace_risk_foreign_key(None)
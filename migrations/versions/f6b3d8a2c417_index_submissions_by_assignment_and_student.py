@@ -0,0 +1,25 @@
+"""index submissions by assignment and student
+
+Revision ID: f6b3d8a2c417
+Revises: e4a1f7c3b958
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6b3d8a2c417'
+down_revision = 'e4a1f7c3b958'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_submissions_assignment_id_student_id_date', 'submissions',
+                    ['assignment_id', 'student_id', 'date'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_submissions_assignment_id_student_id_date', table_name='submissions',
+                  if_exists=True)
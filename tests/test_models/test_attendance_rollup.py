@@ -0,0 +1,45 @@
+"""Test suite for the AttendanceRollup model."""
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from app import app
+from database import db
+from application.models.attendance_rollup import AttendanceRollup
+
+
+@pytest.fixture
+def setup_teardown():
+    """Set up the database for testing and tear it down afterward."""
+    with app.app_context():
+        db.create_all()
+        yield
+        db.session.rollback()
+        db.drop_all()
+
+
+class TestAttendanceRollup:
+    """Test case for the AttendanceRollup model."""
+
+    @pytest.mark.usefixtures("setup_teardown")
+    def test_rate(self):
+        """Test the attendance rate derived from the counts."""
+        with app.app_context():
+            rollup = AttendanceRollup(student_id=1, lecture_id=1, instructor_id=1,
+                                      present_count=2, absent_count=1)
+            db.session.add(rollup)
+            db.session.commit()
+            assert rollup.total == 3
+            assert rollup.to_dict()['rate'] == 0.6667
+            assert AttendanceRollup(present_count=0, absent_count=0).rate is None
+
+    @pytest.mark.usefixtures("setup_teardown")
+    def test_one_row_per_student_lecture_and_instructor(self):
+        """Test that the key columns form the primary key."""
+        with app.app_context():
+            db.session.add(AttendanceRollup(student_id=1, lecture_id=1, instructor_id=1,
+                                            present_count=1, absent_count=0))
+            db.session.commit()
+            db.session.add(AttendanceRollup(student_id=1, lecture_id=1, instructor_id=1,
+                                            present_count=0, absent_count=1))
+            with pytest.raises(IntegrityError):
+                db.session.commit()
@@ -0,0 +1,95 @@
+"""Test suite for the foreign key and lookup indexes."""
+
+import importlib.util
+import os
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import inspect, text
+from app import app
+from database import db
+from application.models.assignment import Assignment
+from application.models.attendance import Attendance
+from application.models.comments import Comment
+from application.models.enrollments import Enrollment
+from application.models.grades import Grade
+from application.models.notifications import Notification
+from application.models.submission import Submission
+
+MIGRATION = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'migrations', 'versions',
+    '3f2a9c1d7b84_add_foreign_key_and_lookup_indexes.py'
+)
+
+
+def load_migration():
+    """Import the index migration module from its file."""
+    spec = importlib.util.spec_from_file_location('index_migration', MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def query_plan(query):
+    """Return the EXPLAIN QUERY PLAN details for an ORM query."""
+    compiled = query.statement.compile(dialect=db.engine.dialect,
+                                       compile_kwargs={'literal_binds': True})
+    rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).fetchall()
+    return ' '.join(row[-1] for row in rows)
+
+
+@pytest.fixture
+def setup_teardown():
+    """Set up the database for testing and tear it down afterward."""
+    with app.app_context():
+        db.create_all()
+        yield
+        db.session.rollback()
+        db.drop_all()
+
+
+@pytest.mark.usefixtures("setup_teardown")
+class TestIndexes:
+    """Test case for index coverage of the hot queries."""
+
+    @pytest.mark.parametrize('build', [
+        lambda: Grade.query.filter_by(student_id=1),
+        lambda: Grade.query.filter_by(course_id=1),
+        lambda: Enrollment.query.filter_by(course_id=1),
+        lambda: Enrollment.query.filter_by(student_id=1, course_id=1),
+        lambda: Attendance.query.filter_by(lecture_id=1),
+        lambda: Attendance.query.filter_by(student_id=1),
+        lambda: Comment.query.filter_by(discussion_id=1).order_by(Comment.posted_at),
+        lambda: Notification.query.filter_by(student_id=1),
+        lambda: Submission.query.filter_by(assignment_id=1),
+        lambda: Assignment.query.filter_by(course_id=1),
+    ])
+    def test_hot_queries_use_an_index(self, build):
+        """Test that the hot lookups are answered from an index."""
+        with app.app_context():
+            plan = query_plan(build())
+            assert 'USING INDEX' in plan or 'USING COVERING INDEX' in plan, plan
+
+    def test_models_declare_migration_indexes(self):
+        """Test that the models and the migration define the same indexes."""
+        declared = {
+            index.name for table in db.metadata.tables.values() for index in table.indexes
+        }
+        assert {name for name, _, _ in load_migration().INDEXES} <= declared
+
+    def test_migration_adds_missing_indexes(self):
+        """Test that upgrade restores indexes on a database created without them."""
+        migration = load_migration()
+        with app.app_context():
+            with db.engine.begin() as connection:
+                for name, _, _ in migration.INDEXES:
+                    connection.execute(text(f"DROP INDEX {name}"))
+                migration.op = Operations(MigrationContext.configure(connection))
+                migration.upgrade()
+                migration.upgrade()
+            indexes = {
+                index['name']
+                for table in inspect(db.engine).get_table_names()
+                for index in inspect(db.engine).get_indexes(table)
+            }
+        assert {name for name, _, _ in migration.INDEXES} <= indexes
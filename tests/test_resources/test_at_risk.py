@@ -0,0 +1,203 @@
+"""Test suite for the batch at-risk scan and the /students/at-risk endpoint."""
+
+from datetime import datetime
+import pytest
+from sqlalchemy import event, insert
+from app import app
+from database import db
+from application.models.attendance import Attendance
+from application.models.enrollments import Enrollment
+from application.models.grades import Grade
+from application.models.student_risk import StudentRisk, StudentRiskChange
+from application.models.students import Student
+from application import risk
+from application.risk import merge_by_student, record_risk_changes, run_risk_scan
+
+GRADES = {1: [90, 85, 88, 60, 55, 58], 2: [70, 72, 71], 3: [95, 92, 90, 50, 45, 40],
+          4: [80, 82, 85, 88]}
+ATTENDANCE = {1: ['present'] * 4, 2: ['present', 'absent', 'absent', 'absent'],
+              4: ['present', 'present', 'present', 'absent']}
+ENROLLMENTS = {1: 'enrolled', 2: 'enrolled', 3: 'dropped', 4: 'enrolled'}
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """Create the tables, seed four students' records and yield a test client."""
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            Grade(student_id=student_id, course_id=1, grade=grade,
+                  date_posted=datetime(2024, 9, day))
+            for student_id, grades in GRADES.items()
+            for day, grade in enumerate(grades, 1)
+        ])
+        db.session.add_all([
+            Attendance(student_id=student_id, lecture_id=1, instructor_id=1,
+                       attendance_status=status, dates=datetime(2024, 9, 1))
+            for student_id, statuses in ATTENDANCE.items() for status in statuses
+        ])
+        db.session.add_all([Enrollment(student_id=student_id, course_id=1, status=status)
+                            for student_id, status in ENROLLMENTS.items()])
+        db.session.commit()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+
+
+@pytest.fixture(name="strict_client")
+def strict_client_fixture(client):
+    """Yield the seeded client with students added and foreign keys enforced by SQLite."""
+    with app.app_context():
+        db.session.execute(insert(Student), [{
+            'id': i, 'username': f'student{i}', 'first_name': 'First', 'last_name': 'Last',
+            'email': f'student{i}@example.com', '_password_hash': 'hash', 'profile_picture': 'p.png'
+        } for i in GRADES])
+        db.session.commit()
+        engine = db.engine
+
+    def enforce(dbapi_connection, _record):
+        dbapi_connection.execute('PRAGMA foreign_keys=ON')
+
+    event.listen(engine, 'connect', enforce)
+    engine.dispose()
+    yield client
+    event.remove(engine, 'connect', enforce)
+    engine.dispose()
+
+
+def queued():
+    """Return the student IDs waiting for the next incremental scan."""
+    with app.app_context():
+        return {change.student_id for change in StudentRiskChange.query.all()}
+
+
+def scan(full=False):
+    """Run the scan and commit it."""
+    with app.app_context():
+        result = run_risk_scan(full)
+        db.session.commit()
+    return result
+
+
+class TestAtRiskScan:
+    """Test case for risk features, incremental runs and the listing endpoint."""
+
+    def test_full_scan_flags_students(self, client):
+        """Test falling grades, low attendance and the enrollment requirement."""
+        assert queued() == {1, 2, 3, 4}
+        assert scan(full=True) == (4, 4)
+        assert queued() == set()
+        body = client.get('/students/at-risk').get_json()
+        assert [item['student_id'] for item in body['items']] == [1, 2]
+        first, second = body['items']
+        assert first['falling_grades'] and not first['low_attendance']
+        assert first['recent_grade_mean'] == pytest.approx(57.6667)
+        assert first['grade_trend'] == pytest.approx(-30)
+        assert second['low_attendance'] and second['attendance_rate'] == 0.25
+        assert second['grade_trend'] is None
+        with app.app_context():
+            dropped = db.session.get(StudentRisk, 3)
+            assert dropped.falling_grades and not dropped.at_risk
+
+    def test_reason_filter_and_pages(self, client):
+        """Test the reason filter and cursor pagination."""
+        scan(full=True)
+        body = client.get('/students/at-risk?reason=low_attendance').get_json()
+        assert [item['student_id'] for item in body['items']] == [2]
+        page = client.get('/students/at-risk?limit=1').get_json()
+        assert [item['student_id'] for item in page['items']] == [1]
+        page = client.get(f"/students/at-risk?limit=1&after={page['next_cursor']}").get_json()
+        assert [item['student_id'] for item in page['items']] == [2]
+        assert page['next_cursor'] is None
+        assert client.get('/students/at-risk?reason=bad').status_code == 400
+
+    def test_incremental_scan_only_recomputes_changed_students(self, client):
+        """Test that only students with queued changes are recomputed."""
+        scan(full=True)
+        with app.app_context():
+            before = {risk.student_id: risk.computed_at for risk in StudentRisk.query.all()}
+        for _ in range(3):
+            client.post('/attendances', data={
+                'student_id': 4, 'lecture_id': 2, 'instructor_id': 1,
+                'attendance_status': 'absent', 'dates': '2024-10-01T08:00:00'})
+        assert queued() == {4}
+        with app.app_context():
+            assert [change.to_dict() for change in StudentRiskChange.query.all()] == [
+                {'student_id': 4, 'version': 3}]
+        assert scan() == (1, 1)
+        assert queued() == set()
+        with app.app_context():
+            after = {risk.student_id: risk.computed_at for risk in StudentRisk.query.all()}
+            assert db.session.get(StudentRisk, 4).attendance_rate == pytest.approx(3 / 7, 1e-3)
+        assert {key for key in before if before[key] != after[key]} == {4}
+        body = client.get('/students/at-risk').get_json()
+        assert [item['student_id'] for item in body['items']] == [1, 2, 4]
+        assert scan() == (0, 0)
+
+    @pytest.mark.usefixtures('client')
+    def test_changes_during_a_scan_stay_queued(self, monkeypatch):
+        """Test that a student queued again while being scanned is kept for the next run."""
+        scan_students = risk.scan_students
+
+        def requeue_and_scan(*args):
+            record_risk_changes([4])
+            return scan_students(*args)
+
+        monkeypatch.setattr(risk, 'scan_students', requeue_and_scan)
+        assert scan() == (4, 3)
+        assert queued() == {4}
+
+    def test_bulk_writes_queue_owners(self, client):
+        """Test that bulk updates and deletes queue the students they touched."""
+        scan(full=True)
+        client.patch('/grades', json={'filter': {'student_id': 2}, 'changes': {'grade': 30}})
+        client.delete('/enrollments', json={'filter': {'student_id': 3}})
+        client.delete('/attendances', json={'filter': {'student_id': 1}})
+        assert queued() == {1, 2, 3}
+        scan()
+        with app.app_context():
+            assert db.session.get(StudentRisk, 1).attendance_count == 0
+            assert db.session.get(StudentRisk, 2).grade_trend is None
+            assert not db.session.get(StudentRisk, 3).at_risk
+
+    @pytest.mark.usefixtures('client')
+    def test_students_without_records_are_removed(self):
+        """Test that an incremental scan drops students whose records are gone."""
+        scan(full=True)
+        with app.app_context():
+            for model in (Grade, Enrollment):
+                for row in model.query.filter_by(student_id=3).all():
+                    db.session.delete(row)
+            db.session.commit()
+        assert scan()[0] == 0
+        with app.app_context():
+            assert db.session.get(StudentRisk, 3) is None
+
+    def test_deleting_a_scanned_student(self, strict_client):
+        """Test that a student with a stored risk row can be deleted under enforced foreign keys."""
+        scan(full=True)
+        assert strict_client.delete('/students/1').status_code == 200
+        with app.app_context():
+            assert db.session.get(StudentRisk, 1) is None
+        scan()
+        body = strict_client.get('/students/at-risk').get_json()
+        assert [item['student_id'] for item in body['items']] == [2]
+
+    @pytest.mark.usefixtures('client')
+    def test_cli_command(self):
+        """Test that the CLI runs a full scan and reports the flagged students."""
+        result = app.test_cli_runner().invoke(args=['scan-at-risk-students', '--full'])
+        assert result.exit_code == 0
+        assert 'Scanned 4 students from 4 queued changes; 2 students at risk.' in result.output
+
+
+def test_merge_by_student():
+    """Test that streams with gaps are merged in student order."""
+    grades = [(1, 90), (1, 80), (3, 70)]
+    attendance = [(2, 1, 2), (3, 0, 1)]
+    merged = list(merge_by_student(iter(grades), iter(attendance)))
+    assert merged == [
+        (1, [[(1, 90), (1, 80)], []]),
+        (2, [[], [(2, 1, 2)]]),
+        (3, [[(3, 70)], [(3, 0, 1)]])
+    ]
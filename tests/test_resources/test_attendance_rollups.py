@@ -0,0 +1,139 @@
+"""Test suite for incrementally maintained attendance rollups."""
+
+from datetime import datetime
+import pytest
+from sqlalchemy import event
+from app import app
+from database import db
+from application.models.attendance import Attendance
+from application.models.attendance_rollup import AttendanceRollup, StudentAttendanceTotal
+from application.models.students import Student
+from application.rollups import refresh_attendance_rollups
+
+DATE = '2024-10-01T08:00:00'
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """Create the tables and yield a test client."""
+    with app.app_context():
+        db.create_all()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+
+
+def rollups():
+    """Return the rollup table as ``{(student, lecture, instructor): (present, absent)}``."""
+    with app.app_context():
+        return {(r.student_id, r.lecture_id, r.instructor_id): (r.present_count, r.absent_count)
+                for r in AttendanceRollup.query.all()}
+
+
+def totals():
+    """Return the per-student totals as ``{student: (present, absent)}``."""
+    with app.app_context():
+        return {r.student_id: (r.present_count, r.absent_count)
+                for r in StudentAttendanceTotal.query.all()}
+
+
+def recomputed():
+    """Rebuild the rollups and totals from scratch without committing and return them."""
+    with app.app_context():
+        refresh_attendance_rollups()
+        rebuilt = rollups(), totals()
+        db.session.rollback()
+    return rebuilt
+
+
+def post_attendance(client, student_id, lecture_id, status):
+    """Create one attendance record through the form endpoint."""
+    return client.post('/attendances', data={
+        'student_id': student_id, 'lecture_id': lecture_id, 'instructor_id': 1,
+        'attendance_status': status, 'dates': DATE})
+
+
+class TestAttendanceRollups:
+    """Test case for the attendance rollup table and rate endpoint."""
+
+    def test_post_patch_delete_keep_rollups_in_sync(self, client):
+        """Test that single-row writes adjust the counts incrementally."""
+        for status in ('present', 'present', 'absent'):
+            assert post_attendance(client, 1, 1, status).status_code == 201
+        post_attendance(client, 1, 2, 'absent')
+        assert rollups() == {(1, 1, 1): (2, 1), (1, 2, 1): (0, 1)}
+        assert client.patch('/attendances/3', json={'attendance_status': 'present'}
+                            ).status_code == 200
+        assert client.delete('/attendances/1').status_code == 200
+        assert rollups() == {(1, 1, 1): (2, 0), (1, 2, 1): (0, 1)}
+        assert totals() == {1: (2, 1)}
+        assert (rollups(), totals()) == recomputed()
+
+    def test_bulk_writes_refresh_rollups(self, client):
+        """Test that bulk create, update and delete leave the rollups correct."""
+        client.post('/attendances', json=[
+            {'student_id': s, 'lecture_id': 1, 'instructor_id': 1,
+             'attendance_status': 'present', 'dates': DATE}
+            for s in (1, 1, 2)
+        ])
+        client.patch('/attendances', json={'ids': [1], 'changes': {'attendance_status': 'absent'}})
+        client.delete('/attendances', json={'filter': {'student_id': 2}})
+        assert rollups() == {(1, 1, 1): (1, 1)}
+        assert (rollups(), totals()) == recomputed()
+
+    def test_rate_is_a_rollup_read(self, client):
+        """Test that the rate endpoint reads rollups, not attendance rows."""
+        for status in ('present', 'present', 'present', 'absent'):
+            post_attendance(client, 1, 1 if status == 'present' else 2, status)
+        recorded = []
+
+        def record(_conn, _cursor, statement, *_):
+            recorded.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            body = client.get('/students/1/attendance-rate').get_json()
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+        assert (body['present'], body['absent'], body['rate']) == (3, 1, 0.75)
+        assert 'lectures' not in body
+        assert len(recorded) == 1 and 'FROM student_attendance_totals' in recorded[0]
+        body = client.get('/students/1/attendance-rate?lectures=true').get_json()
+        assert [lecture['rate'] for lecture in body['lectures']] == [1.0, 0.0]
+        body = client.get('/students/1/attendance-rate?lecture_id=2').get_json()
+        assert body['rate'] == 0.0
+        assert client.get('/students/9/attendance-rate').get_json()['rate'] is None
+
+    def test_empty_rows_and_deleted_students_are_removed(self, client):
+        """Test that rows counting nothing are deleted, as are those of a deleted student."""
+        with app.app_context():
+            db.session.execute(db.insert(Student), [{
+                'id': 1, 'username': 'amina', 'first_name': 'Amina', 'last_name': 'Otieno',
+                'email': 'amina@example.com', '_password_hash': 'hash', 'profile_picture': 'p.png'
+            }])
+            db.session.commit()
+        post_attendance(client, 1, 1, 'present')
+        post_attendance(client, 1, 2, 'absent')
+        post_attendance(client, 2, 1, 'present')
+        assert client.delete('/attendances/2').status_code == 200
+        assert rollups() == {(1, 1, 1): (1, 0), (2, 1, 1): (1, 0)}
+        assert client.delete('/students/1').status_code == 200
+        assert rollups() == {(2, 1, 1): (1, 0)}
+        assert totals() == {2: (1, 0)}
+        assert (rollups(), totals()) == recomputed()
+
+    @pytest.mark.usefixtures('client')
+    def test_rebuild_command(self):
+        """Test that the CLI command rebuilds rollups for rows written behind its back."""
+        with app.app_context():
+            db.session.execute(db.insert(Attendance), [
+                {'student_id': 5, 'lecture_id': 1, 'instructor_id': 1,
+                 'attendance_status': 'absent', 'dates': datetime(2024, 10, 1)}
+            ])
+            db.session.commit()
+        assert rollups() == {}
+        result = app.test_cli_runner().invoke(args=['rebuild-attendance-rollups'])
+        assert 'Rebuilt 1 attendance rollups' in result.output
+        assert rollups() == {(5, 1, 1): (0, 1)}
@@ -0,0 +1,148 @@
+"""Test suite for the login and token refresh endpoints."""
+
+import time
+from datetime import timedelta
+import pytest
+from argon2 import PasswordHasher
+from flask_jwt_extended import create_refresh_token, decode_token
+from sqlalchemy import insert
+from app import app
+from database import db
+from application import auth
+from application.auth import token_verifier
+from application.models.instructors import Instructor
+from application.models.students import Student
+from application.ratelimit import rate_limiter
+
+# Hashed with cheaper parameters than the app's, so a login has to rehash.
+OUTDATED = PasswordHasher(time_cost=1, memory_cost=64, parallelism=1)
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """Create the tables, seed a student and an instructor and yield a test client."""
+    token_verifier.verified.clear()
+    rate_limiter.clear()
+    with app.app_context():
+        db.create_all()
+        # Core inserts skip the attribute validators of these models.
+        db.session.execute(insert(Student), [{
+            'id': 1, 'username': 'amina', 'first_name': 'Amina', 'last_name': 'Otieno',
+            'email': 'amina@example.com', '_password_hash': OUTDATED.hash('student secret'),
+            'profile_picture': 'p.png'
+        }])
+        db.session.execute(insert(Instructor), [{
+            'id': 1, 'name': 'Prof', 'email': 'prof@example.com',
+            '_password_hash': OUTDATED.hash('instructor secret'),
+            'department': 'Maths', 'bio': 'Bio'
+        }])
+        db.session.commit()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+
+
+def login(client, role, username, password):
+    """POST a login request."""
+    return client.post('/auth/login', json={'role': role, 'username': username,
+                                            'password': password})
+
+
+def bearer(token):
+    """Authorization header for ``token``."""
+    return {'Authorization': f'Bearer {token}'}
+
+
+class TestAuth:
+    """Test case for password login, refresh tokens and the verified-token cache."""
+
+    def test_student_login(self, client):
+        """Test login by username or email and the issued claims."""
+        body = login(client, 'student', 'amina', 'student secret').get_json()
+        assert (body['role'], body['id'], body['token_type']) == ('student', 1, 'Bearer')
+        assert body['expires_in'] == 15 * 60
+        with app.app_context():
+            claims = decode_token(body['access_token'])
+            assert (claims['sub'], claims['role'], claims['type']) == ('1', 'student', 'access')
+            assert decode_token(body['refresh_token'])['type'] == 'refresh'
+        response = login(client, 'student', 'amina@example.com', 'student secret')
+        assert response.status_code == 200
+
+    def test_login_upgrades_outdated_hash(self, client):
+        """Test that the rehash done by authenticate() is committed."""
+        # pylint: disable=protected-access
+        assert login(client, 'instructor', 'prof@example.com', 'instructor secret'
+                     ).status_code == 200
+        with app.app_context():
+            stored = db.session.get(Instructor, 1)._password_hash
+        assert '$m=64,t=1,p=1$' not in stored
+        assert login(client, 'instructor', 'prof@example.com', 'instructor secret'
+                     ).status_code == 200
+
+    def test_rejected_logins(self, client):
+        """Test wrong passwords, unknown accounts and malformed requests."""
+        assert login(client, 'student', 'amina', 'wrong').status_code == 401
+        assert login(client, 'student', 'nobody', 'student secret').status_code == 401
+        assert login(client, 'instructor', 'amina', 'student secret').status_code == 401
+        assert login(client, 'admin', 'amina', 'student secret').status_code == 400
+        assert client.post('/auth/login', json={'role': 'student'}).status_code == 400
+
+    def test_malformed_login_bodies(self, client):
+        """Test that non-object bodies and non-string fields are rejected with 400."""
+        assert client.post('/auth/login', json=['student', 'amina']).status_code == 400
+        assert client.post('/auth/login', json={'role': ['student'], 'username': 'amina',
+                                                'password': 'x'}).status_code == 400
+        assert login(client, 'student', 'amina', 12345).status_code == 400
+        assert login(client, 'student', {'$ne': ''}, 'student secret').status_code == 400
+
+    def test_refresh(self, client):
+        """Test that a refresh token, and only a refresh token, yields a new access token."""
+        tokens = login(client, 'student', 'amina', 'student secret').get_json()
+        response = client.post('/auth/refresh', headers=bearer(tokens['refresh_token']))
+        assert response.status_code == 200
+        body = response.get_json()
+        assert 'refresh_token' not in body
+        with app.app_context():
+            assert decode_token(body['access_token'])['role'] == 'student'
+        assert client.post('/auth/refresh',
+                           headers=bearer(tokens['access_token'])).status_code == 422
+        assert client.post('/auth/refresh').status_code == 401
+        assert client.post('/auth/refresh', headers=bearer('not-a-token')).status_code == 401
+
+    def test_verified_tokens_skip_signature_checks(self, client, monkeypatch):
+        """Test that a repeated token is verified once and expired tokens are not served."""
+        verified = []
+
+        def counting(encoded_token):
+            verified.append(encoded_token)
+            return decode_token(encoded_token)
+
+        monkeypatch.setattr(auth, 'decode_token', counting)
+        refresh_token = login(client, 'student', 'amina', 'student secret'
+                              ).get_json()['refresh_token']
+        for _ in range(3):
+            assert client.post('/auth/refresh', headers=bearer(refresh_token)).status_code == 200
+        assert verified == [refresh_token]
+        with app.app_context():
+            short_lived = create_refresh_token(identity='1', additional_claims={'role': 'student'},
+                                               expires_delta=timedelta(seconds=1))
+        assert client.post('/auth/refresh', headers=bearer(short_lived)).status_code == 200
+        time.sleep(1.1)
+        assert client.post('/auth/refresh', headers=bearer(short_lived)).status_code == 401
+
+    def test_every_request_verifies_its_token(self, client, monkeypatch):
+        """Test that bearer tokens on other endpoints go through the cache and are checked."""
+        verified = []
+
+        def counting(encoded_token):
+            verified.append(encoded_token)
+            return decode_token(encoded_token)
+
+        monkeypatch.setattr(auth, 'decode_token', counting)
+        access_token = login(client, 'student', 'amina', 'student secret'
+                             ).get_json()['access_token']
+        for path in ('/students', '/students/1', '/instructors'):
+            assert client.get(path, headers=bearer(access_token)).status_code == 200
+        assert verified == [access_token]
+        assert client.get('/students', headers=bearer('not-a-token')).status_code == 401
+        assert client.get('/students').status_code == 200
@@ -0,0 +1,91 @@
+"""Test suite for bulk create endpoints."""
+
+import pytest
+from sqlalchemy import event
+from app import app
+from database import db
+from application.models.attendance import Attendance
+from application.models.enrollments import Enrollment
+from application.models.grades import Grade
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """Create the tables and yield a test client."""
+    with app.app_context():
+        db.create_all()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+
+
+class TestBulkCreate:
+    """Test case for JSON array bodies on collection POST handlers."""
+
+    def test_bulk_grades_in_one_statement(self, client):
+        """Test that a grade upload is one INSERT in one transaction."""
+        rows = [{'student_id': i, 'course_id': 1, 'grade': 1 + i % 100,
+                 'date_posted': '2024-12-01T09:00:00'} for i in range(400)]
+        inserts = []
+
+        def record(_conn, _cursor, statement, *_):
+            if statement.lstrip().upper().startswith('INSERT INTO GRADES'):
+                inserts.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            response = client.post('/grades', json=rows)
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+        assert response.status_code == 201
+        body = response.get_json()
+        assert body['created'] == 400
+        assert [r['index'] for r in body['results']] == list(range(400))
+        assert len(inserts) == 1
+        with app.app_context():
+            assert Grade.query.count() == 400
+            first = db.session.get(Grade, body['results'][0]['id'])
+            assert first.student_id == 0 and first.version == 1
+
+    def test_invalid_row_rejects_whole_batch(self, client):
+        """Test that a single invalid row aborts the batch with per-row errors."""
+        rows = [
+            {'student_id': 1, 'course_id': 1, 'grade': 90},
+            {'student_id': 2, 'course_id': 1, 'grade': 150},
+            {'student_id': 3, 'grade': 80},
+        ]
+        response = client.post('/grades', json=rows)
+        assert response.status_code == 400
+        assert [r['index'] for r in response.get_json()['results']] == [1, 2]
+        with app.app_context():
+            assert Grade.query.count() == 0
+
+    def test_bulk_attendance_and_enrollments(self, client):
+        """Test that model validators normalize and check every row."""
+        response = client.post('/attendances', json=[
+            {'student_id': 1, 'lecture_id': 1, 'instructor_id': 1,
+             'attendance_status': ' Present ', 'dates': '2024-10-01T08:00:00'},
+            {'student_id': 2, 'lecture_id': 1, 'instructor_id': 1,
+             'attendance_status': 'absent'},
+        ])
+        assert response.status_code == 201
+        response = client.post('/enrollments', json=[
+            {'course_id': 1, 'student_id': 1, 'status': 'enrolled'},
+            {'course_id': 1, 'student_id': 2, 'status': 'graduated'},
+        ])
+        assert response.status_code == 400
+        with app.app_context():
+            statuses = [a.attendance_status for a in Attendance.query.order_by(Attendance.id)]
+            assert statuses == ['present', 'absent']
+            assert Enrollment.query.count() == 0
+
+    def test_malformed_body(self, client):
+        """Test that non-array or unknown-field bodies are rejected."""
+        assert client.post('/grades', json={'grade': 1}).status_code == 400
+        assert client.post('/grades', json=[]).status_code == 400
+        response = client.post('/enrollments', json=[
+            {'course_id': 1, 'student_id': 1, 'status': 'enrolled', 'id': 7}
+        ])
+        assert response.status_code == 400
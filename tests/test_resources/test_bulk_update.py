@@ -0,0 +1,120 @@
+"""Test suite for bulk PATCH and DELETE on collection endpoints."""
+
+from datetime import datetime
+import pytest
+from sqlalchemy import event
+from app import app
+from database import db
+from application.cache import response_cache
+from application.models.attendance import Attendance
+from application.models.notifications import Notification
+
+SENT = datetime(2024, 9, 1, 10, 0, 0)
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """Create the tables, seed notifications and attendance, and yield a test client."""
+    with app.app_context():
+        db.create_all()
+        response_cache.clear()
+        db.session.add_all([
+            Notification(title='Reminder', message_body='Assignment due', student_id=i % 2,
+                         instructor_id=1, read_status='unread', sent_date=SENT, read_date=SENT)
+            for i in range(6)
+        ])
+        db.session.add_all([
+            Attendance(student_id=i, lecture_id=1 + i % 2, instructor_id=1,
+                       attendance_status='absent', dates=SENT)
+            for i in range(4)
+        ])
+        db.session.commit()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+        response_cache.clear()
+
+
+def record_statements(client, method, url, body, table):
+    """Send a request and return the response and the verbs of the statements writing ``table``."""
+    recorded = []
+
+    def record(_conn, _cursor, statement, *_):
+        words = statement.split()
+        target = words[1] if words[0].upper() == 'UPDATE' else words[2]
+        if target == table:
+            recorded.append(words[0].upper())
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = client.open(url, method=method, json=body)
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    return response, recorded
+
+
+class TestBulkUpdate:
+    """Test case for set-based PATCH on collections."""
+
+    def test_filter_update_is_one_statement(self, client):
+        """Test that marking a student's notifications read is a single UPDATE."""
+        response, statements = record_statements(client, 'PATCH', '/notifications', {
+            'filter': {'student_id': 0}, 'changes': {'read_status': 'read'}}, 'notifications')
+        assert response.status_code == 200
+        assert response.get_json() == {'updated': 3, 'ids': [1, 3, 5]}
+        assert statements == ['UPDATE']
+        with app.app_context():
+            rows = Notification.query.order_by(Notification.id).all()
+            assert [n.read_status for n in rows] == ['read', 'unread'] * 3
+            assert [n.version for n in rows] == [2, 1] * 3
+
+    def test_update_by_ids_runs_validators(self, client):
+        """Test that changes are normalized and rejected by the model validators."""
+        response = client.patch('/attendances', json={
+            'ids': [1, 2], 'changes': {'attendance_status': ' Present '}})
+        assert response.get_json()['updated'] == 2
+        response = client.patch('/attendances', json={
+            'ids': [3], 'changes': {'attendance_status': 'late'}})
+        assert response.status_code == 400
+        with app.app_context():
+            statuses = [a.attendance_status for a in Attendance.query.order_by(Attendance.id)]
+            assert statuses == ['present', 'present', 'absent', 'absent']
+
+    def test_rejects_missing_target_and_unknown_columns(self, client):
+        """Test that a bulk PATCH must name its rows and whitelisted changes."""
+        assert client.patch('/notifications', json={
+            'changes': {'read_status': 'read'}}).status_code == 400
+        assert client.patch('/notifications', json={
+            'ids': [1], 'changes': {'title': 'New'}}).status_code == 400
+        assert client.patch('/notifications', json={
+            'filter': {'title': 'Reminder'}, 'changes': {'read_status': 'read'}}).status_code == 400
+
+    def test_update_changes_etags(self, client):
+        """Test that bulk changes invalidate the ETags of the updated rows."""
+        etag = client.get('/notifications/1').get_etag()[0]
+        client.patch('/notifications', json={'ids': [1], 'changes': {'read_status': 'read'}})
+        response = client.get('/notifications/1', headers={'If-None-Match': f'"{etag}"'})
+        assert response.status_code == 200
+        assert response.get_json()['read_status'] == 'read'
+
+
+class TestBulkDelete:
+    """Test case for set-based DELETE on collections."""
+
+    def test_delete_by_filter(self, client):
+        """Test that a lecture's attendance is deleted with one statement."""
+        response, statements = record_statements(client, 'DELETE', '/attendances', {
+            'filter': {'lecture_id': 1}}, 'attendances')
+        assert response.get_json() == {'deleted': 2, 'ids': [1, 3]}
+        assert statements == ['DELETE']
+        with app.app_context():
+            assert [a.id for a in Attendance.query.order_by(Attendance.id)] == [2, 4]
+
+    def test_delete_requires_target(self, client):
+        """Test that an empty body never deletes the whole table."""
+        assert client.delete('/attendances').status_code == 400
+        assert client.delete('/attendances', json={'filter': {}}).status_code == 400
+        with app.app_context():
+            assert Attendance.query.count() == 4
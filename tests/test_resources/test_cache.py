@@ -0,0 +1,82 @@
+"""Test suite for the response cache and its invalidation."""
+
+import time
+import pytest
+from app import app
+from database import db
+from application.cache import MemoryBackend, SQLiteBackend, response_cache
+from application.models.lectures import Lecture
+
+SCHEDULE = [{'day': 'Monday', 'start': '09:00', 'end': '11:00'}]
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """Create the tables, seed two lectures and yield a test client."""
+    with app.app_context():
+        db.create_all()
+        response_cache.clear()
+        db.session.add_all([
+            Lecture(lecture_info='Algebra', instructor_id=1, schedule=SCHEDULE),
+            Lecture(lecture_info='Geometry', instructor_id=1, schedule=SCHEDULE),
+        ])
+        db.session.commit()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+        response_cache.clear()
+
+
+class TestResponseCache:
+    """Test case for cached read endpoints."""
+
+    def test_repeated_reads_hit(self, client):
+        """Test that the second identical read is served from the cache."""
+        assert client.get('/lectures').headers['X-Cache'] == 'MISS'
+        response = client.get('/lectures')
+        assert response.headers['X-Cache'] == 'HIT'
+        assert len(response.get_json()) == 2
+
+    def test_update_invalidates_affected_keys(self, client):
+        """Test that a PATCH only evicts the updated row and the collection."""
+        client.get('/lectures')
+        client.get('/lectures/1')
+        client.get('/lectures/2')
+        assert client.patch('/lectures/1', json={'lecture_info': 'Calculus'}).status_code == 200
+        response = client.get('/lectures/1')
+        assert response.headers['X-Cache'] == 'MISS'
+        assert response.get_json()['lecture_info'] == 'Calculus'
+        assert client.get('/lectures').headers['X-Cache'] == 'MISS'
+        assert client.get('/lectures/2').headers['X-Cache'] == 'HIT'
+
+    def test_cached_response_honours_etag(self, client):
+        """Test that a cached by-ID response still answers If-None-Match."""
+        etag = client.get('/lectures/1').get_etag()[0]
+        response = client.get('/lectures/1', headers={'If-None-Match': f'"{etag}"'})
+        assert response.status_code == 304
+
+
+class TestBackends:
+    """Test case for the cache backends."""
+
+    def test_memory_backend_evicts_least_recently_used(self):
+        """Test LRU eviction and expiry of the in-process backend."""
+        backend = MemoryBackend(maxsize=2, ttl=60)
+        backend.set('a', 1)
+        backend.set('b', 2)
+        backend.get('a')
+        backend.set('c', 3)
+        assert backend.get('b') is None
+        assert backend.get('a') == 1
+        backend.set('d', 4, ttl=0)
+        time.sleep(0.01)
+        assert backend.get('d') is None
+
+    def test_sqlite_backend_is_shared(self, tmp_path):
+        """Test that two backends on the same file see each other's writes."""
+        path = str(tmp_path / 'cache.sqlite3')
+        first, second = SQLiteBackend(path), SQLiteBackend(path)
+        first.set('key', {'body': 'value'})
+        assert second.get('key') == {'body': 'value'}
+        second.set('gone', 'x', ttl=-1)
+        assert first.get('gone') is None
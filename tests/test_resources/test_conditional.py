@@ -0,0 +1,98 @@
+"""Test suite for ETags and conditional GET on by-ID endpoints."""
+
+from datetime import datetime
+import pytest
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+from app import app
+from database import db
+from application.models.grades import Grade
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """Create the tables, seed one grade and yield a test client."""
+    with app.app_context():
+        db.create_all()
+        db.session.add(Grade(student_id=1, course_id=1, grade=60,
+                             date_posted=datetime(2024, 9, 1, 10, 0, 0)))
+        db.session.commit()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+
+
+class TestConditionalGet:
+    """Test case for ETag and If-None-Match handling."""
+
+    def test_response_has_etag(self, client):
+        """Test that a by-ID response carries a strong ETag."""
+        response = client.get('/grades/1')
+        assert response.status_code == 200
+        etag, weak = response.get_etag()
+        assert etag and not weak
+
+    def test_matching_etag_returns_304(self, client):
+        """Test that a matching If-None-Match returns an empty 304."""
+        etag = client.get('/grades/1').get_etag()[0]
+        response = client.get('/grades/1', headers={'If-None-Match': f'"{etag}"'})
+        assert response.status_code == 304
+        assert response.get_data() == b''
+        assert response.get_etag()[0] == etag
+
+    def test_304_only_reads_the_version(self, client):
+        """Test that the 304 path does not select the full row."""
+        etag = client.get('/grades/1').get_etag()[0]
+        recorded = []
+
+        def record(_conn, _cursor, statement, *_):
+            recorded.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            client.get('/grades/1', headers={'If-None-Match': f'"{etag}"'})
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+        assert len(recorded) == 1
+        assert 'date_posted' not in recorded[0]
+
+    def test_etag_changes_after_update(self, client):
+        """Test that an update invalidates the previous ETag."""
+        etag = client.get('/grades/1').get_etag()[0]
+        assert client.patch('/grades/1', json={'grade': 75}).status_code == 200
+        response = client.get('/grades/1', headers={'If-None-Match': f'"{etag}"'})
+        assert response.status_code == 200
+        assert response.get_json()['grade'] == 75
+        assert response.get_etag()[0] != etag
+
+    def test_patch_cannot_write_the_version(self, client):
+        """Test that a PATCH naming version or id is refused and old ETags stay stale."""
+        etag = client.get('/grades/1').get_etag()[0]
+        assert client.patch('/grades/1', json={'grade': 75}).status_code == 200
+        response = client.patch('/grades/1', json={'grade': 70, 'version': 1})
+        assert response.status_code == 400
+        assert client.patch('/grades/1', json={'id': 5}).status_code == 400
+        assert client.patch('/grades/1', json=[{'grade': 70}]).status_code == 400
+        response = client.get('/grades/1', headers={'If-None-Match': f'"{etag}"'})
+        assert (response.status_code, response.get_json()['grade']) == (200, 75)
+
+    def test_concurrent_patch_is_a_conflict(self, client):
+        """Test that a PATCH losing a race with another write answers 409."""
+        grades = Grade.__table__
+
+        def concurrent_write(session, *_):
+            session.connection().execute(
+                update(grades).where(grades.c.id == 1).values(version=grades.c.version + 1))
+
+        event.listen(Session, 'before_flush', concurrent_write, once=True)
+        response = client.patch('/grades/1', json={'grade': 75})
+        assert response.status_code == 409
+        assert client.get('/grades/1').get_json()['grade'] == 60
+
+    def test_etag_depends_on_fields(self, client):
+        """Test that different projections have different ETags."""
+        full = client.get('/grades/1').get_etag()[0]
+        partial = client.get('/grades/1?fields=grade').get_etag()[0]
+        assert full != partial
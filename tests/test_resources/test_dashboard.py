@@ -0,0 +1,121 @@
+"""Test suite for the instructor dashboard endpoint."""
+
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import event, insert
+from app import app
+from database import db
+from application.models.assignment import Assignment
+from application.models.attendance import Attendance
+from application.models.course import Course
+from application.models.enrollments import Enrollment
+from application.models.grades import Grade
+from application.models.instructors import Instructor
+from application.models.lectures import Lecture
+from application.models.notifications import Notification
+from application.models.submission import Submission
+
+SCHEDULE = [{'day': 'Monday', 'start': '09:00', 'end': '11:00'}]
+DATE = datetime(2024, 9, 1)
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """Create the tables, seed two instructors' workloads and yield a test client."""
+    with app.app_context():
+        db.create_all()
+        # Core inserts skip the attribute validators of these models.
+        db.session.execute(insert(Instructor), [
+            {'id': i, 'name': f'Instructor {i}', 'email': f'i{i}@example.com',
+             '_password_hash': 'x', 'department': 'Maths', 'bio': 'Bio'}
+            for i in (1, 2, 3)
+        ])
+        db.session.execute(insert(Course), [
+            {'id': 1, 'course_info': 'Algebra', 'instructor_id': 1, 'schedule': SCHEDULE},
+            {'id': 2, 'course_info': 'Geometry', 'instructor_id': 1, 'schedule': SCHEDULE},
+            {'id': 3, 'course_info': 'History', 'instructor_id': 2, 'schedule': SCHEDULE},
+        ])
+        db.session.execute(insert(Assignment), [
+            {'id': i, 'title': 'Homework', 'description': 'Exercises', 'course_id': i,
+             'due_date': DATE, 'total_points': 10}
+            for i in (1, 3)
+        ])
+        db.session.add_all([
+            Lecture(lecture_info='Algebra I', instructor_id=1, schedule=SCHEDULE),
+            Lecture(lecture_info='History I', instructor_id=2, schedule=SCHEDULE),
+            Enrollment(course_id=1, student_id=1, status='enrolled'),
+            Enrollment(course_id=2, student_id=1, status='enrolled'),
+            Enrollment(course_id=2, student_id=2, status='enrolled'),
+            Enrollment(course_id=2, student_id=3, status='dropped'),
+            Enrollment(course_id=3, student_id=4, status='enrolled'),
+            Grade(student_id=1, course_id=1, grade=80, date_posted=DATE),
+            Attendance(student_id=1, lecture_id=1, instructor_id=1,
+                       attendance_status='present', dates=DATE),
+            Attendance(student_id=2, lecture_id=1, instructor_id=1,
+                       attendance_status='absent', dates=DATE),
+            Attendance(student_id=3, lecture_id=1, instructor_id=1,
+                       attendance_status='present', dates=DATE),
+            Attendance(student_id=4, lecture_id=2, instructor_id=2,
+                       attendance_status='absent', dates=DATE),
+        ] + [
+            Notification(title='Note', message_body='Body', student_id=1, instructor_id=1,
+                         read_status=status, sent_date=DATE, read_date=DATE)
+            for status in ('unread', 'unread', 'read')
+        ])
+        db.session.execute(insert(Submission), [
+            {'assignment_id': 1, 'student_id': 1, 'submission_info': 'a', 'grade_id': 1,
+             'date': DATE},
+            # Ungraded: student 2 has no grade in course 1, and student 1's
+            # resubmission came after their grade was posted.
+            {'assignment_id': 1, 'student_id': 2, 'submission_info': 'b', 'grade_id': 1,
+             'date': DATE},
+            {'assignment_id': 1, 'student_id': 1, 'submission_info': 'd', 'grade_id': 1,
+             'date': DATE + timedelta(days=1)},
+            {'assignment_id': 3, 'student_id': 4, 'submission_info': 'c', 'grade_id': 1,
+             'date': DATE},
+        ])
+        db.session.commit()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+
+
+class TestInstructorDashboard:
+    """Test case for /instructors/<id>/dashboard."""
+
+    def test_dashboard_figures(self, client):
+        """Test every figure against the seeded data."""
+        response = client.get('/instructors/1/dashboard')
+        assert response.status_code == 200
+        assert response.get_json() == {
+            'instructor_id': 1,
+            'courses': 2,
+            'lectures': 1,
+            'enrolled_students': 2,
+            'submissions': 3,
+            'ungraded_submissions': 2,
+            'attendance': {'present': 2, 'absent': 1, 'rate': 0.6667},
+            'unread_notifications': 2
+        }
+
+    def test_single_statement(self, client):
+        """Test that the whole dashboard is computed by one statement."""
+        recorded = []
+
+        def record(_conn, _cursor, statement, *_):
+            recorded.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            client.get('/instructors/2/dashboard')
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+        assert len(recorded) == 1
+
+    def test_idle_and_unknown_instructors(self, client):
+        """Test an instructor without any data and a missing instructor."""
+        body = client.get('/instructors/3/dashboard').get_json()
+        assert body['courses'] == 0 and body['attendance']['rate'] is None
+        assert client.get('/instructors/9/dashboard').status_code == 404
@@ -0,0 +1,95 @@
+"""Test suite for the discussion activity endpoints."""
+
+from datetime import datetime
+import pytest
+from sqlalchemy import event, insert
+from app import app
+from database import db
+from application.models.comments import Comment
+from application.models.course import Course
+from application.models.discussion import Discussion
+
+SCHEDULE = [{'day': 'Monday', 'start': '09:00', 'end': '11:00'}]
+# (discussion, student, instructor, posted, edited)
+COMMENTS = [
+    (1, 1, 1, datetime(2024, 9, 1, 9), datetime(2024, 9, 1, 9)),
+    (1, 2, 1, datetime(2024, 9, 1, 12), datetime(2024, 9, 1, 12)),
+    (1, 1, 2, datetime(2024, 9, 2, 9), datetime(2024, 9, 3, 9)),
+    (1, 3, 1, datetime(2024, 9, 2, 10), datetime(2024, 9, 2, 10)),
+    (3, 1, 1, datetime(2024, 9, 5, 8), datetime(2024, 9, 5, 8)),
+]
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """Create the tables, seed discussions with comments and yield a test client."""
+    with app.app_context():
+        db.create_all()
+        # Core inserts skip the attribute validators of these models.
+        db.session.execute(insert(Course), [
+            {'id': i, 'course_info': f'Course {i}', 'instructor_id': 1, 'schedule': SCHEDULE}
+            for i in (1, 2)
+        ])
+        db.session.add_all([
+            Discussion(title=f'Topic {i}', description='Talk', course_id=course_id,
+                       created_at=datetime(2024, 9, 1), updated_at=datetime(2024, 9, 1))
+            for i, course_id in ((1, 1), (2, 1), (3, 2))
+        ])
+        db.session.execute(insert(Comment), [
+            {'discussion_id': discussion_id, 'student_id': student_id,
+             'instructor_id': instructor_id, 'content': 'Hello', 'posted_at': posted,
+             'edited_at': edited}
+            for discussion_id, student_id, instructor_id, posted, edited in COMMENTS
+        ])
+        db.session.commit()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+
+
+class TestDiscussionActivity:
+    """Test case for per-discussion comment activity."""
+
+    def test_discussion_activity(self, client):
+        """Test the figures and daily counts of one discussion."""
+        body = client.get('/discussions/1/activity').get_json()
+        assert body == {
+            'discussion_id': 1, 'course_id': 1, 'title': 'Topic 1', 'comments': 4,
+            'students': 3, 'instructors': 2, 'participants': 5,
+            'first_comment_at': '2024-09-01T09:00:00', 'last_activity_at': '2024-09-03T09:00:00',
+            'comments_per_day': 2.0,
+            'daily': [{'date': '2024-09-01', 'comments': 2}, {'date': '2024-09-02', 'comments': 2}]
+        }
+
+    def test_discussion_without_comments(self, client):
+        """Test that a quiet discussion reports zeros and no activity time."""
+        body = client.get('/discussions/2/activity').get_json()
+        assert (body['comments'], body['participants'], body['daily']) == (0, 0, [])
+        assert body['last_activity_at'] is None and body['comments_per_day'] is None
+
+    def test_course_activity_in_one_statement(self, client):
+        """Test the course variant and that it reads the comments once."""
+        recorded = []
+
+        def record(_conn, _cursor, statement, *_):
+            if 'comments' in statement:
+                recorded.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            body = client.get('/courses/1/discussion-activity').get_json()
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+        assert [(entry['discussion_id'], entry['comments']) for entry in body['discussions']] == [
+            (1, 4), (2, 0)
+        ]
+        assert len(recorded) == 1
+        single = client.get('/courses/2/discussion-activity').get_json()['discussions'][0]
+        assert (single['comments'], single['comments_per_day']) == (1, 1.0)
+
+    def test_unknown_ids(self, client):
+        """Test 404 responses for unknown discussions and courses."""
+        assert client.get('/discussions/99/activity').status_code == 404
+        assert client.get('/courses/99/discussion-activity').status_code == 404
@@ -0,0 +1,123 @@
+"""Test suite for ?expand= eager loading of related entities."""
+
+from datetime import datetime
+import pytest
+from sqlalchemy import event, insert
+from app import app
+from database import db
+from application.cache import response_cache
+from application.models.course import Course
+from application.models.enrollments import Enrollment
+from application.models.grades import Grade
+from application.models.instructors import Instructor
+from application.models.lectures import Lecture
+from application.models.students import Student
+
+SCHEDULE = [{'day': 'Monday', 'start': '09:00', 'end': '11:00'}]
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """Create the tables, seed grades with their students and courses, and yield a client."""
+    with app.app_context():
+        db.create_all()
+        response_cache.clear()
+        # Core inserts skip the attribute validators of these models.
+        db.session.execute(insert(Instructor), [
+            {'id': i, 'name': f'Instructor {i}', 'email': f'i{i}@example.com',
+             '_password_hash': 'x', 'department': 'Maths', 'bio': 'Bio'}
+            for i in (1, 2)
+        ])
+        db.session.execute(insert(Course), [
+            {'id': i, 'course_info': f'Course {i}', 'instructor_id': 1 + i % 2,
+             'schedule': SCHEDULE}
+            for i in range(1, 5)
+        ])
+        db.session.execute(insert(Student), [
+            {'id': i, 'username': f'student{i}', 'first_name': 'First', 'last_name': f'Last{i}',
+             'email': f's{i}@example.com', '_password_hash': 'x', 'profile_picture': 'p.png'}
+            for i in range(1, 6)
+        ])
+        db.session.add_all([
+            Grade(student_id=1 + i % 5, course_id=1 + i % 4, grade=50 + i,
+                  date_posted=datetime(2024, 9, 1))
+            for i in range(20)
+        ])
+        db.session.add_all([Enrollment(course_id=course_id, student_id=1, status='enrolled')
+                            for course_id in (2, 3)])
+        db.session.add(Lecture(lecture_info='Algebra', instructor_id=1, schedule=SCHEDULE))
+        db.session.commit()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+        response_cache.clear()
+
+
+@pytest.fixture(name="statements")
+def statements_fixture(client):
+    """Record the SQL statements run while handling requests."""
+    recorded = []
+
+    def record(_conn, _cursor, statement, *_):
+        recorded.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    yield client, recorded
+    event.remove(engine, 'before_cursor_execute', record)
+
+
+class TestExpand:
+    """Test case for embedding related entities."""
+
+    def test_list_expand_uses_constant_queries(self, statements):
+        """Test that expanding a list does not issue a query per row."""
+        client, recorded = statements
+        response = client.get('/grades?expand=student,course.instructor')
+        assert response.status_code == 200
+        items = response.get_json()
+        assert len(items) == 20
+        assert items[0]['student']['username'] == 'student1'
+        assert items[0]['course']['instructor']['email'] == 'i2@example.com'
+        assert len(recorded) == 1
+
+    def test_collection_expand_on_detail(self, statements):
+        """Test that a one-to-many expansion is nested as a list."""
+        client, recorded = statements
+        response = client.get('/students/1?expand=enrollment.course')
+        assert response.status_code == 200
+        enrollments = response.get_json()['enrollment']
+        assert [e['course']['course_info'] for e in enrollments] == ['Course 2', 'Course 3']
+        assert response.get_etag() == (None, None)
+        assert len(recorded) <= 3
+
+    def test_expand_with_pagination_and_fields(self, client):
+        """Test that expansion combines with cursor pages and sparse fieldsets."""
+        response = client.get('/grades?limit=5&fields=grade&expand=course')
+        body = response.get_json()
+        assert len(body['items']) == 5
+        assert set(body['items'][0]) == {'grade', 'course'}
+        assert body['items'][0]['course']['course_info'] == 'Course 1'
+
+    def test_whitelist_and_depth_limit(self, client):
+        """Test that only whitelisted, shallow enough paths are accepted."""
+        assert client.get('/grades?expand=submission').status_code == 400
+        assert client.get('/grades/1?expand=nothing').status_code == 400
+        app.config['EXPAND_MAX_DEPTH'] = 1
+        try:
+            assert client.get('/grades?expand=course.instructor').status_code == 400
+        finally:
+            app.config.pop('EXPAND_MAX_DEPTH')
+
+    def test_expanded_cache_is_invalidated_by_related_rows(self, client):
+        """Test that a cached expanded response is evicted when a related row changes."""
+        client.get('/lectures?expand=instructor')
+        assert client.get('/lectures?expand=instructor').headers['X-Cache'] == 'HIT'
+        with app.app_context():
+            db.session.execute(db.update(Instructor).where(Instructor.id == 1)
+                               .values(bio='Updated'))
+            db.session.commit()
+        response = client.get('/lectures?expand=instructor')
+        assert response.headers['X-Cache'] == 'MISS'
+        assert response.get_json()[0]['instructor']['bio'] == 'Updated'
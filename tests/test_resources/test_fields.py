@@ -0,0 +1,70 @@
+"""Test suite for sparse fieldsets on list and detail endpoints."""
+
+from datetime import datetime
+import pytest
+from sqlalchemy import event
+from app import app
+from database import db
+from application.models.discussion import Discussion
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """Create the tables, seed discussions and yield a test client."""
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            Discussion(title=f'Week {i}', description='x' * 900, course_id=1,
+                       created_at=datetime(2024, 10, 1 + i),
+                       updated_at=datetime(2024, 10, 2 + i))
+            for i in range(3)
+        ])
+        db.session.commit()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+
+
+@pytest.fixture(name="statements")
+def statements_fixture(client):
+    """Record the SQL statements run while handling requests."""
+    recorded = []
+
+    def record(_conn, _cursor, statement, *_):
+        recorded.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    yield client, recorded
+    event.remove(engine, 'before_cursor_execute', record)
+
+
+class TestFields:
+    """Test case for the fields query parameter."""
+
+    def test_list_is_trimmed(self, client):
+        """Test that list items only contain the requested fields."""
+        body = client.get('/discussions?fields=title,created_at').get_json()
+        assert len(body) == 3
+        assert all(set(item) == {'title', 'created_at'} for item in body)
+
+    def test_detail_is_trimmed(self, client):
+        """Test that a detail response only contains the requested fields."""
+        response = client.get('/discussions/1?fields=id,title')
+        assert response.status_code == 200
+        assert response.get_json() == {'id': 1, 'title': 'Week 0'}
+
+    def test_unrequested_columns_are_not_selected(self, statements):
+        """Test that unrequested columns are never read from the database."""
+        client, recorded = statements
+        client.get('/discussions?fields=title')
+        selects = [s for s in recorded if s.lstrip().upper().startswith('SELECT')]
+        assert selects
+        assert all('description' not in s for s in selects)
+
+    def test_unknown_field(self, client):
+        """Test that unknown, private or unserialized fields are rejected."""
+        assert client.get('/discussions?fields=title,nope').status_code == 400
+        assert client.get('/students?fields=_password_hash').status_code == 400
+        assert client.get('/discussions?fields=version').status_code == 400
@@ -0,0 +1,72 @@
+"""Test suite for filtering and sorting on collection endpoints."""
+
+from datetime import datetime
+import pytest
+from app import app
+from database import db
+from application.models.grades import Grade
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """Create the tables, seed grades for two courses and yield a test client."""
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            Grade(student_id=1 + i % 2, course_id=1 + i % 3, grade=40 + 10 * i,
+                  date_posted=datetime(2024, 9, 6 - i, 10, 0, 0))
+            for i in range(6)
+        ])
+        db.session.commit()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+        app.config['REJECT_UNINDEXED_FILTERS'] = False
+
+
+class TestFiltering:
+    """Test case for the filter and sort query parameters."""
+
+    def test_equality_filters(self, client):
+        """Test that equality filters are combined with AND."""
+        body = client.get('/grades?student_id=1&course_id=1').get_json()
+        assert [(g['student_id'], g['course_id']) for g in body] == [(1, 1)]
+
+    def test_in_and_range_filters(self, client):
+        """Test comma separated values and comparison operators."""
+        body = client.get('/grades?course_id=2,3').get_json()
+        assert {g['course_id'] for g in body} == {2, 3}
+        body = client.get('/grades?grade__gte=70').get_json()
+        assert sorted(g['grade'] for g in body) == [70, 80, 90]
+
+    def test_sort_descending(self, client):
+        """Test that a - prefix sorts in descending order."""
+        body = client.get('/grades?sort=-grade').get_json()
+        assert [g['grade'] for g in body] == [90, 80, 70, 60, 50, 40]
+
+    def test_sort_with_pagination(self, client):
+        """Test that cursors follow the requested sort order across pages."""
+        first = client.get('/grades?sort=-grade&limit=4').get_json()
+        second = client.get(
+            f"/grades?sort=-grade&limit=4&after={first['next_cursor']}"
+        ).get_json()
+        grades = [g['grade'] for g in first['items'] + second['items']]
+        assert grades == [90, 80, 70, 60, 50, 40]
+        assert client.get(
+            f"/grades?sort=grade&limit=4&after={first['next_cursor']}"
+        ).status_code == 400
+
+    def test_rejects_columns_outside_whitelist(self, client):
+        """Test that only whitelisted columns can be filtered or sorted on."""
+        assert client.get('/grades?id__gt=1&foo=1').status_code == 400
+        assert client.get('/grades?sort=student_id').status_code == 400
+        assert client.get('/grades?sort=id,-grade').status_code == 400
+        assert client.get('/grades?grade__like=5').status_code == 400
+        assert client.get('/grades?grade=abc').status_code == 400
+
+    def test_unindexed_columns(self, client):
+        """Test that unindexed columns are flagged, or rejected when configured."""
+        response = client.get('/grades?grade=50')
+        assert response.headers['X-Unindexed-Columns'] == 'grade'
+        app.config['REJECT_UNINDEXED_FILTERS'] = True
+        assert client.get('/grades?grade=50').status_code == 400
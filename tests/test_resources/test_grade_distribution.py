@@ -0,0 +1,134 @@
+"""Test suite for the vectorized grade distribution endpoints and CLI command."""
+
+from datetime import datetime
+import numpy as np
+import pytest
+from sqlalchemy import event, insert
+from app import app
+from database import db
+from application.distributions import grade_distribution
+from application.models.course import Course
+from application.models.grades import Grade
+
+SCHEDULE = [{'day': 'Monday', 'start': '09:00', 'end': '11:00'}]
+GRADES = {1: [55, 70, 70, 81, 92, 92, 92, 100, 64], 2: [40, 60], 4: [75, 75]}
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """Create the tables, seed four courses with grades and yield a test client."""
+    with app.app_context():
+        db.create_all()
+        db.session.execute(insert(Course), [
+            {'id': i, 'course_info': f'Course {i}', 'instructor_id': 1, 'schedule': SCHEDULE}
+            for i in (1, 2, 3, 4)
+        ])
+        db.session.add_all([
+            Grade(student_id=student_id, course_id=course_id, grade=grade,
+                  date_posted=datetime(2024, 9, 1))
+            for course_id, grades in GRADES.items()
+            for student_id, grade in enumerate(grades, 1)
+        ])
+        db.session.commit()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+
+
+class TestGradeDistribution:
+    """Test case for per-course histograms, letter grades and z-scores."""
+
+    def test_histogram_and_letters_match_numpy(self, client):
+        """Test that bins and letter buckets equal numpy's histogram of the raw grades."""
+        body = client.get('/courses/1/grade-distribution').get_json()
+        grades = np.array(GRADES[1])
+        counts, _ = np.histogram(grades, bins=np.arange(1, 102, 10))
+        assert [bucket['count'] for bucket in body['histogram']] == counts.tolist()
+        assert body['histogram'][0] == {'min': 1, 'max': 10, 'count': 0}
+        assert body['histogram'][-1] == {'min': 91, 'max': 100, 'count': 4}
+        assert body['letters'] == {'F': 1, 'D': 1, 'C': 2, 'B': 1, 'A': 4}
+        assert body['mean'] == pytest.approx(grades.mean(), abs=1e-4)
+        assert body['std'] == pytest.approx(grades.std(), abs=1e-4)
+
+    def test_z_scores(self, client):
+        """Test that every grade of the course is listed with its z-score."""
+        body = client.get('/courses/1/grade-distribution').get_json()
+        grades = np.array(GRADES[1])
+        expected = (grades - grades.mean()) / grades.std()
+        rows = sorted(body['z_scores'], key=lambda row: row['student_id'])
+        assert [row['student_id'] for row in rows] == list(range(1, 10))
+        assert [row['z_score'] for row in rows] == pytest.approx(expected, abs=1e-4)
+
+    def test_constant_course_has_zero_z_scores(self, client):
+        """Test that a course without spread does not divide by zero."""
+        body = client.get('/courses/4/grade-distribution').get_json()
+        assert body['std'] == 0
+        assert [row['z_score'] for row in body['z_scores']] == [0, 0]
+
+    def test_course_without_grades(self, client):
+        """Test that an existing course without grades reports empty buckets."""
+        body = client.get('/courses/3/grade-distribution?bin_width=25').get_json()
+        assert body['count'] == 0 and body['mean'] is None
+        assert [bucket['count'] for bucket in body['histogram']] == [0, 0, 0, 0]
+        assert body['z_scores'] == []
+
+    def test_bin_width(self, client):
+        """Test that the last bin is clipped to the highest grade."""
+        body = client.get('/courses/1/grade-distribution?bin_width=30').get_json()
+        assert [(b['min'], b['max'], b['count']) for b in body['histogram']] == [
+            (1, 30, 0), (31, 60, 1), (61, 90, 4), (91, 100, 4)
+        ]
+
+    def test_many_courses_in_one_query(self, client):
+        """Test that all distributions come from a single SELECT of the grade rows."""
+        recorded = []
+
+        def record(_conn, _cursor, statement, *_):
+            if 'grades' in statement:
+                recorded.append(statement)
+
+        engine = db.engine
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            body = client.get('/courses/grade-distribution').get_json()
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+        assert [entry['course_id'] for entry in body] == [1, 2, 4]
+        assert [entry['count'] for entry in body] == [9, 2, 2]
+        assert 'z_scores' not in body[0]
+        assert len(recorded) == 1
+
+    def test_selected_courses_with_z_scores(self, client):
+        """Test course selection, unknown IDs and the z_scores flag."""
+        body = client.get('/courses/grade-distribution?course_id=2,3,99&z_scores=true').get_json()
+        assert [entry['course_id'] for entry in body] == [2, 3]
+        assert [row['z_score'] for row in body[0]['z_scores']] == [-1, 1]
+        assert body[1]['z_scores'] == []
+
+    def test_errors(self, client):
+        """Test validation of the bin width and unknown courses."""
+        assert client.get('/courses/1/grade-distribution?bin_width=0').status_code == 400
+        assert client.get('/courses/grade-distribution?bin_width=x').status_code == 400
+        assert client.get('/courses/99/grade-distribution').status_code == 404
+
+    @pytest.mark.usefixtures('client')
+    def test_cli_command(self, tmp_path):
+        """Test that the CLI prints the report and writes z-scores as CSV."""
+        path = tmp_path / 'z_scores.csv'
+        result = app.test_cli_runner().invoke(
+            args=['grade-distribution', '--course-id', '2', '--z-scores', str(path)]
+        )
+        assert result.exit_code == 0
+        assert 'course 2: n=2 mean=50.0 std=10.0 F=1 D=1 C=0 B=0 A=0' in result.output
+        assert path.read_text().splitlines() == [
+            'course_id,student_id,grade,z_score', '2,1,40,-1.0000', '2,2,60,1.0000'
+        ]
+
+
+def test_distribution_of_unordered_ids():
+    """Test that course IDs with gaps are mapped back in ascending order."""
+    result = grade_distribution(np.array([7, 3, 7, 3]), np.array([1, 2, 3, 4]),
+                                np.array([90, 50, 70, 60]))
+    assert result['courses'].tolist() == [3, 7]
+    assert result['means'].tolist() == [55, 80]
+    assert result['letters'].tolist() == [[1, 1, 0, 0, 0], [0, 0, 1, 0, 1]]
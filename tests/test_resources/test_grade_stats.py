@@ -0,0 +1,91 @@
+"""Test suite for the course grade statistics endpoints."""
+
+from datetime import datetime
+import numpy as np
+import pytest
+from sqlalchemy import event, insert
+from app import app
+from database import db
+from application.grade_stats import summarize
+from application.models.course import Course
+from application.models.grades import Grade
+
+SCHEDULE = [{'day': 'Monday', 'start': '09:00', 'end': '11:00'}]
+GRADES = {1: [55, 70, 70, 81, 92, 92, 92, 100, 64], 2: [40, 60]}
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """Create the tables, seed three courses with grades and yield a test client."""
+    with app.app_context():
+        db.create_all()
+        db.session.execute(insert(Course), [
+            {'id': i, 'course_info': f'Course {i}', 'instructor_id': 1, 'schedule': SCHEDULE}
+            for i in (1, 2, 3)
+        ])
+        db.session.add_all([
+            Grade(student_id=student_id, course_id=course_id, grade=grade,
+                  date_posted=datetime(2024, 9, 1))
+            for course_id, grades in GRADES.items()
+            for student_id, grade in enumerate(grades, 1)
+        ])
+        db.session.commit()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+
+
+class TestGradeStats:
+    """Test case for SQL-side gradebook statistics."""
+
+    def test_matches_numpy_on_raw_grades(self, client):
+        """Test that the statistics equal numpy's on the expanded grade list."""
+        body = client.get('/courses/1/grade-stats').get_json()
+        grades = np.array(GRADES[1])
+        assert body['course_id'] == 1
+        assert body['count'] == len(grades)
+        assert body['mean'] == pytest.approx(grades.mean(), abs=1e-4)
+        assert body['std'] == pytest.approx(grades.std(), abs=1e-4)
+        assert body['median'] == np.median(grades)
+        assert (body['min'], body['max']) == (55, 100)
+        for p in (10, 25, 75, 90):
+            assert body['percentiles'][f'p{p}'] == pytest.approx(np.percentile(grades, p))
+
+    def test_single_grouped_query(self, client):
+        """Test that statistics come from one grouped query, not from Grade rows."""
+        recorded = []
+
+        def record(_conn, _cursor, statement, *_):
+            if 'grades' in statement:
+                recorded.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            client.get('/courses/grade-stats')
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+        assert len(recorded) == 1
+        assert 'GROUP BY' in recorded[0] and 'date_posted' not in recorded[0]
+
+    def test_multi_course_variant(self, client):
+        """Test that several courses are summarized in one response."""
+        body = client.get('/courses/grade-stats?course_id=2,3,9&percentiles=50').get_json()
+        assert [c['course_id'] for c in body] == [2, 3]
+        assert body[0]['mean'] == 50 and body[0]['percentiles'] == {'p50': 50.0}
+        assert body[1]['count'] == 0 and body[1]['mean'] is None
+
+    def test_errors(self, client):
+        """Test unknown courses and malformed parameters."""
+        assert client.get('/courses/9/grade-stats').status_code == 404
+        assert client.get('/courses/1/grade-stats?percentiles=150').status_code == 400
+        assert client.get('/courses/1/grade-stats?percentiles=50,nan').status_code == 400
+        assert client.get('/courses/grade-stats?course_id=a').status_code == 400
+
+    def test_summarize_weighted_distribution(self):
+        """Test that counts are treated as repeated values."""
+        stats = summarize(np.array([1, 3]), np.array([3, 1]), (25, 50))
+        expanded = np.array([1, 1, 1, 3])
+        assert stats['mean'] == expanded.mean()
+        assert stats['percentiles'] == {'p25': 1.0, 'p50': 1.0}
@@ -0,0 +1,119 @@
+"""Test suite for the password hashing pool."""
+
+import threading
+import time
+import pytest
+from flask import Flask
+from app import app
+from application.hashing import (HashingBusyError, HashingService, benchmark_parameters,
+                                 password_hashing)
+from application.models.instructors import Instructor
+from application.models.students import Student
+
+
+@pytest.fixture(name="service")
+def service_fixture():
+    """Yield a one-process hashing service with a single queue slot."""
+    owner = Flask(__name__)
+    owner.config.update(HASHING_WORKERS=1, HASHING_MAX_PENDING=1, HASHING_QUEUE_TIMEOUT=0.05)
+    service = HashingService()
+    service.init_app(owner)
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture(name="configure")
+def configure_fixture():
+    """Yield a function that reconfigures the app's hashing service; restore it afterwards."""
+    def configure(**settings):
+        owner = Flask(__name__)
+        owner.config.update(HASHING_WORKERS=1, **settings)
+        password_hashing.init_app(owner)
+
+    yield configure
+    password_hashing.init_app(app)
+
+
+class TestHashing:
+    """Test case for hashing in worker processes, queue metrics and backpressure."""
+
+    def test_models_hash_and_verify_in_the_pool(self):
+        """Test that the password setters and authenticate() go through the pool."""
+        student, instructor = Student(), Instructor()
+        student.password_hash = 'correct horse'
+        instructor.password_hash = 'battery staple'
+        assert student.authenticate('correct horse')
+        assert not student.authenticate('wrong')
+        assert instructor.authenticate('battery staple')
+        stats = password_hashing.stats()
+        assert stats['workers'] >= 1 and stats['queue_depth'] == 0
+        assert stats['peak_queue_depth'] >= 1
+
+    def test_full_queue_is_rejected(self, service):
+        """Test that a caller finding every slot taken gets HashingBusyError."""
+        worker = threading.Thread(target=service.run, args=(time.sleep, 0.5))
+        worker.start()
+        while service.queue_depth == 0:
+            time.sleep(0.01)
+        with pytest.raises(HashingBusyError):
+            service.hash('secret')
+        worker.join()
+        assert service.stats()['rejected'] == 1 and service.queue_depth == 0
+        assert service.verify(service.hash('secret'), 'secret')
+
+    def test_hash_many_maps_over_the_pool(self, service):
+        """Test that a batch is hashed in order with one queue slot."""
+        hashes = service.hash_many(['one', 'two', 'three'])
+        assert [service.verify(h, p) for h, p in zip(hashes, ['one', 'two', 'three'])] == [
+            True, True, True]
+        assert not service.verify(hashes[0], 'two')
+        assert service.stats()['peak_queue_depth'] == 1 and service.queue_depth == 0
+        assert service.hash_many([]) == []
+        assert HashingService().verify(HashingService().hash_many(['secret'])[0], 'secret')
+
+    def test_inline_hashing_without_workers(self):
+        """Test that a service without workers hashes on the calling thread."""
+        service = HashingService()
+        assert service.verify(service.hash('secret'), 'secret')
+        assert not service.verify('not a hash', 'secret')
+
+    def test_busy_response_and_metrics(self):
+        """Test the 503 answer to a full queue and the metrics endpoint."""
+        with app.test_request_context():
+            response = app.handle_user_exception(HashingBusyError('busy'))
+        assert response.status_code == 503 and response.headers['Retry-After'] == '2'
+        body = app.test_client().get('/metrics/hashing').get_json()
+        assert set(body) == {'workers', 'max_pending', 'queue_depth', 'peak_queue_depth',
+                             'rejected'}
+
+    def test_login_rehashes_outdated_hashes(self, configure):
+        """Test that authenticate() replaces hashes made with other parameters."""
+        # pylint: disable=protected-access
+        configure(ARGON2_TIME_COST=1, ARGON2_MEMORY_COST=64, ARGON2_PARALLELISM=1)
+        student = Student()
+        student.password_hash = 'correct horse'
+        assert '$m=64,t=1,p=1$' in student._password_hash
+        configure(ARGON2_TIME_COST=2, ARGON2_MEMORY_COST=128, ARGON2_PARALLELISM=1)
+        outdated = student._password_hash
+        assert not student.authenticate('wrong') and student._password_hash == outdated
+        assert student.authenticate('correct horse')
+        upgraded = student._password_hash
+        assert '$m=128,t=2,p=1$' in upgraded
+        assert student.authenticate('correct horse') and student._password_hash == upgraded
+
+    def test_benchmark_picks_parameters_for_the_target(self):
+        """Test the parameter search at both ends of the target range."""
+        assert benchmark_parameters(0, 1, 64)[0] == {'time_cost': 1, 'memory_cost': 8,
+                                                     'parallelism': 1}
+        parameters, elapsed = benchmark_parameters(10 ** 6, 1, 64)
+        assert parameters == {'time_cost': 64, 'memory_cost': 64, 'parallelism': 1}
+        assert elapsed > 0
+
+    def test_benchmark_command(self):
+        """Test that the CLI prints settings ready for the environment."""
+        result = app.test_cli_runner().invoke(args=[
+            'benchmark-argon2', '--target-ms', '5', '--parallelism', '1', '--max-memory', '256'
+        ])
+        assert result.exit_code == 0
+        assert 'ARGON2_PARALLELISM=1' in result.output
+        assert 'ARGON2_MEMORY_COST=' in result.output and 'ARGON2_TIME_COST=' in result.output
@@ -0,0 +1,164 @@
+"""Test suite for the course leaderboard and student rank endpoints."""
+
+from datetime import datetime
+import pytest
+from sqlalchemy import event, insert, select
+from app import app
+from database import db
+from application.leaderboard import leaderboards, standings_query
+from application.models.course import Course
+from application.models.course_standing import CourseStanding, CourseStandingRevision
+from application.models.grades import Grade
+from application.models.students import Student
+
+SCHEDULE = [{'day': 'Monday', 'start': '09:00', 'end': '11:00'}]
+# (student, course, grade) in ID order
+GRADES = [(1, 1, 90), (1, 1, 80), (2, 1, 85), (3, 1, 95), (4, 1, 60), (4, 1, 70), (1, 2, 50)]
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """Create the tables, seed grades in two courses and yield a test client."""
+    leaderboards.clear()
+    with app.app_context():
+        db.create_all()
+        # Core inserts skip the attribute validators of this model.
+        db.session.execute(insert(Course), [
+            {'id': i, 'course_info': f'Course {i}', 'instructor_id': 1, 'schedule': SCHEDULE}
+            for i in (1, 2)
+        ])
+        db.session.add_all([Grade(student_id=student_id, course_id=course_id, grade=grade,
+                                  date_posted=datetime(2024, 9, 1))
+                            for student_id, course_id, grade in GRADES])
+        db.session.commit()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+    leaderboards.clear()
+
+
+@pytest.fixture(name="strict_client")
+def strict_client_fixture(client):
+    """Yield the seeded client with students added and foreign keys enforced by SQLite."""
+    with app.app_context():
+        db.session.execute(insert(Student), [{
+            'id': i, 'username': f'student{i}', 'first_name': 'First', 'last_name': 'Last',
+            'email': f'student{i}@example.com', '_password_hash': 'hash', 'profile_picture': 'p.png'
+        } for i in range(1, 5)])
+        db.session.commit()
+        engine = db.engine
+
+    def enforce(dbapi_connection, _record):
+        dbapi_connection.execute('PRAGMA foreign_keys=ON')
+
+    event.listen(engine, 'connect', enforce)
+    engine.dispose()
+    yield client
+    event.remove(engine, 'connect', enforce)
+    engine.dispose()
+
+
+def standing_queries(client, url):
+    """GET ``url`` and return the statements that read course_standings."""
+    recorded = []
+
+    def record(_conn, _cursor, statement, *_):
+        if 'FROM course_standings' in statement:
+            recorded.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        body = client.get(url).get_json()
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    return body, recorded
+
+
+def ranking(body):
+    """Return ``(rank, student_id, average)`` for every leaderboard entry."""
+    return [(entry['rank'], entry['student_id'], entry['average'])
+            for entry in body['leaderboard']]
+
+
+class TestLeaderboard:
+    """Test case for ranks kept current by grade writes."""
+
+    def test_leaderboard_ranks_ties_and_limit(self, client):
+        """Test ordering by average, shared ranks for equal averages and ?limit=."""
+        body = client.get('/courses/1/leaderboard').get_json()
+        assert body['students'] == 4
+        assert ranking(body) == [(1, 3, 95.0), (2, 1, 85.0), (2, 2, 85.0), (4, 4, 65.0)]
+        body = client.get('/courses/1/leaderboard?limit=2').get_json()
+        assert ranking(body) == [(1, 3, 95.0), (2, 1, 85.0)]
+        assert client.get('/courses/1/leaderboard?limit=0').status_code == 400
+        assert client.get('/courses/99/leaderboard').status_code == 404
+
+    def test_student_rank(self, client):
+        """Test the rank endpoint and its errors."""
+        body = client.get('/students/4/rank?course_id=1').get_json()
+        assert body == {'course_id': 1, 'students': 4, 'rank': 4, 'student_id': 4,
+                        'average': 65.0, 'grade_count': 2}
+        assert client.get('/students/1/rank?course_id=2').get_json()['rank'] == 1
+        assert client.get('/students/4/rank').status_code == 400
+        assert client.get('/students/3/rank?course_id=2').status_code == 404
+
+    def test_single_grade_writes_update_the_board(self, client):
+        """Test that PATCH and DELETE move the built board without reloading the standings."""
+        client.get('/courses/1/leaderboard')
+        assert client.patch('/grades/5', json={'grade': 100}).status_code == 200
+        body, queries = standing_queries(client, '/courses/1/leaderboard')
+        assert ranking(body) == [(1, 3, 95.0), (2, 1, 85.0), (2, 2, 85.0), (2, 4, 85.0)]
+        assert not queries
+        assert client.delete('/grades/4').status_code == 200
+        body, queries = standing_queries(client, '/students/4/rank?course_id=1')
+        assert (body['rank'], body['students']) == (1, 3)
+        assert not queries
+        with app.app_context():
+            assert db.session.get(CourseStanding, (1, 3)) is None
+
+    def test_deleting_owners_drops_their_standings(self, strict_client):
+        """Test that deleting a graded student or course works with enforced foreign keys."""
+        client = strict_client
+        client.get('/courses/1/leaderboard')
+        assert client.delete('/students/4').status_code == 200
+        body, queries = standing_queries(client, '/courses/1/leaderboard')
+        assert ranking(body) == [(1, 3, 95.0), (2, 1, 85.0), (2, 2, 85.0)]
+        assert not queries
+        assert client.delete('/courses/2').status_code == 200
+        with app.app_context():
+            assert db.session.get(CourseStanding, (2, 1)) is None
+            assert db.session.get(CourseStandingRevision, 2) is None
+            assert db.session.get(CourseStanding, (1, 1)).grade_count == 2
+
+    def test_bulk_writes_rebuild_the_board(self, client):
+        """Test that bulk creates and updates refresh the standings and the built board."""
+        client.get('/courses/1/leaderboard')
+        response = client.post('/grades', json=[{'student_id': 5, 'course_id': 1, 'grade': 99}])
+        assert response.status_code == 201
+        body, queries = standing_queries(client, '/courses/1/leaderboard?limit=1')
+        assert ranking(body) == [(1, 5, 99.0)] and body['students'] == 5
+        assert len(queries) == 1
+        client.patch('/grades', json={'ids': [1, 2], 'changes': {'grade': 100}})
+        assert client.get('/students/1/rank?course_id=1').get_json()['rank'] == 1
+        with app.app_context():
+            stored = db.session.execute(
+                select(CourseStanding.course_id, CourseStanding.student_id,
+                       CourseStanding.grade_total, CourseStanding.grade_count,
+                       CourseStanding.average)
+                .order_by(CourseStanding.course_id, CourseStanding.student_id)
+            ).all()
+            expected = db.session.execute(standings_query().order_by(
+                Grade.course_id, Grade.student_id)).all()
+            assert stored == expected
+
+    def test_rolled_back_writes_leave_the_board(self, client):
+        """Test that a rolled back grade change neither reaches the table nor the board."""
+        client.get('/courses/1/leaderboard')
+        with app.app_context():
+            db.session.get(Grade, 5).grade = 100
+            db.session.flush()
+            db.session.rollback()
+        body = client.get('/students/4/rank?course_id=1').get_json()
+        assert (body['rank'], body['average']) == (4, 65.0)
@@ -0,0 +1,58 @@
+"""Test suite for keyset pagination on collection endpoints."""
+
+from datetime import datetime
+import pytest
+from app import app
+from database import db
+from application.models.grades import Grade
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """Create the tables, seed a few grades and yield a test client."""
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            Grade(student_id=1, course_id=1, grade=50 + i,
+                  date_posted=datetime(2024, 9, 1 + i, 10, 0, 0))
+            for i in range(5)
+        ])
+        db.session.commit()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+
+
+class TestPagination:
+    """Test case for the limit/after query parameters."""
+
+    def test_unpaginated_returns_full_list(self, client):
+        """Test that omitting limit keeps the plain JSON array response."""
+        response = client.get('/grades')
+        assert response.status_code == 200
+        assert len(response.get_json()) == 5
+
+    def test_pages_walk_the_collection(self, client):
+        """Test that following next_cursor visits every row exactly once."""
+        seen = []
+        response = client.get('/grades?limit=2')
+        body = response.get_json()
+        seen.extend(item['id'] for item in body['items'])
+        while body['next_cursor']:
+            response = client.get(f"/grades?limit=2&after={body['next_cursor']}")
+            body = response.get_json()
+            seen.extend(item['id'] for item in body['items'])
+        assert seen == sorted(seen)
+        assert len(seen) == 5
+
+    def test_last_page_has_no_cursor(self, client):
+        """Test that a page covering the remainder has no next_cursor."""
+        body = client.get('/grades?limit=5').get_json()
+        assert len(body['items']) == 5
+        assert body['next_cursor'] is None
+
+    def test_invalid_parameters(self, client):
+        """Test that malformed limit and cursor values are rejected."""
+        assert client.get('/grades?limit=abc').status_code == 400
+        assert client.get('/grades?limit=0').status_code == 400
+        assert client.get('/grades?limit=2&after=not-a-cursor').status_code == 400
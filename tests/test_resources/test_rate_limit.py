@@ -0,0 +1,94 @@
+"""Test suite for the token-bucket rate limiter."""
+
+import pytest
+from flask import Flask
+from sqlalchemy import insert
+from app import app
+from database import db
+from application.models.students import Student
+from application.ratelimit import RateLimiter, parse_limit, rate_limiter, take_token
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """Create the tables, seed a student and yield a test client with full buckets."""
+    rate_limiter.clear()
+    with app.app_context():
+        db.create_all()
+        # Core inserts skip the attribute validators of these models.
+        db.session.execute(insert(Student), [{
+            'id': 1, 'username': 'amina', 'first_name': 'Amina', 'last_name': 'Otieno',
+            'email': 'amina@example.com', '_password_hash': 'hash', 'profile_picture': 'p.png'
+        }])
+        db.session.commit()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+    rate_limiter.clear()
+
+
+def limited_app(**settings):
+    """A small app with one GET and one POST route behind its own limiter."""
+    owner = Flask(__name__)
+    owner.config.update(RATE_LIMITS={'POST': {'ip': '2/minute'}}, **settings)
+    owner.add_url_rule('/items', 'items', lambda: 'ok', methods=['GET', 'POST'])
+    limiter = RateLimiter()
+    limiter.init_app(owner)
+    return owner.test_client()
+
+
+def post_from(client, address):
+    """POST /items from ``address``."""
+    return client.post('/items', environ_base={'REMOTE_ADDR': address}).status_code
+
+
+class TestRateLimit:
+    """Test case for per-IP and per-username buckets on login and write routes."""
+
+    def test_login_is_limited_per_username(self, client, monkeypatch):
+        """Test that a sixth guess at one account is refused without hashing."""
+        attempts = []
+        monkeypatch.setattr('application.resources.auth_resource.authenticate_account',
+                            lambda *args: attempts.append(args))
+        for address in range(5):
+            response = client.post('/auth/login', json={
+                'role': 'student', 'username': 'Amina', 'password': 'guess'
+            }, environ_base={'REMOTE_ADDR': f'10.0.0.{address}'})
+            assert response.status_code == 401
+        response = client.post('/auth/login', json={
+            'role': 'student', 'username': 'amina ', 'password': 'guess'
+        }, environ_base={'REMOTE_ADDR': '10.0.0.9'})
+        assert response.status_code == 429
+        assert 0 < int(response.headers['Retry-After']) <= 12
+        assert len(attempts) == 5
+        response = client.post('/auth/login', json={
+            'role': 'student', 'username': 'brian', 'password': 'guess'
+        }, environ_base={'REMOTE_ADDR': '10.0.0.9'})
+        assert response.status_code == 401
+
+    def test_method_rules_cover_writes_only(self):
+        """Test that a POST rule limits each address and leaves GETs alone."""
+        client = limited_app()
+        assert [post_from(client, '10.0.0.1') for _ in range(3)] == [200, 200, 429]
+        assert post_from(client, '10.0.0.2') == 200
+        assert client.get('/items', environ_base={'REMOTE_ADDR': '10.0.0.1'}).status_code == 200
+        assert post_from(limited_app(RATE_LIMIT_ENABLED=False), '10.0.0.1') == 200
+
+    def test_sqlite_buckets_are_shared(self, tmp_path):
+        """Test that two limiters on one SQLite file draw from the same buckets."""
+        settings = {'RATE_LIMIT_BACKEND': 'sqlite', 'RATE_LIMIT_PATH': str(tmp_path / 'rl.db')}
+        first, second = limited_app(**settings), limited_app(**settings)
+        assert post_from(first, '10.0.0.1') == 200
+        assert post_from(second, '10.0.0.1') == 200
+        assert post_from(first, '10.0.0.1') == 429
+
+    def test_refill_and_limit_parsing(self):
+        """Test the bucket arithmetic and the limit syntax."""
+        assert take_token(2, 0, 0, 2, 60) == (1, 0)
+        assert take_token(0, 0, 15, 2, 60) == (0.5, 15)
+        assert take_token(0, 0, 30, 2, 60) == (0, 0)
+        assert take_token(2, 0, 600, 2, 60) == (1, 0)
+        assert parse_limit('5/minute') == (5, 60)
+        for limit in ('five/minute', '0/hour', '5/week', '5'):
+            with pytest.raises(ValueError):
+                parse_limit(limit)
@@ -0,0 +1,152 @@
+"""Test suite for the notification read-latency endpoint and its bucket cache."""
+
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import event
+from app import app
+from database import db
+from application.models.notification_latency import (NotificationLatencyBucket,
+                                                     NotificationLatencyCoverage)
+from application.models.notifications import Notification
+from application.read_latency import store_buckets
+
+DAY_ONE = datetime(2024, 9, 1, 9)
+DAY_TWO = datetime(2024, 9, 2, 9)
+# (instructor, sent, latency in seconds, read status)
+NOTIFICATIONS = [(1, DAY_ONE, seconds, 'read') for seconds in (60, 120, 180, 240, 600)] + [
+    (1, DAY_ONE, 5, 'unread'), (2, DAY_ONE, 3600, 'read'), (1, DAY_TWO, 30, 'read')
+]
+URL = '/notifications/read-latency?start=2024-09-01T00:00:00&end=2024-09-03T00:00:00'
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """Create the tables, seed notifications over two days and yield a test client."""
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            Notification(title='Note', message_body='Body', student_id=1,
+                         instructor_id=instructor_id, read_status=status, sent_date=sent,
+                         read_date=sent + timedelta(seconds=seconds))
+            for instructor_id, sent, seconds, status in NOTIFICATIONS
+        ])
+        db.session.commit()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+
+
+def notification_queries(client, url):
+    """GET ``url`` and return the parameters of every query reading notifications."""
+    recorded = []
+
+    def record(_conn, _cursor, statement, parameters, *_):
+        if 'FROM notifications' in statement:
+            recorded.append(parameters)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        body = client.get(url).get_json()
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    return body, recorded
+
+
+class TestReadLatency:
+    """Test case for bucketed read-latency percentiles."""
+
+    def test_daily_percentiles_per_instructor(self, client):
+        """Test nearest-rank percentiles, means and the exclusion of unread notifications."""
+        body = client.get(URL).get_json()
+        assert body['bucket'] == 'day' and body['percentiles'] == [50, 90, 99]
+        assert body['series'] == [
+            {'bucket_start': '2024-09-01T00:00:00', 'instructor_id': 1, 'count': 5,
+             'mean': 240.0, 'p50': 180.0, 'p90': 600.0, 'p99': 600.0},
+            {'bucket_start': '2024-09-01T00:00:00', 'instructor_id': 2, 'count': 1,
+             'mean': 3600.0, 'p50': 3600.0, 'p90': 3600.0, 'p99': 3600.0},
+            {'bucket_start': '2024-09-02T00:00:00', 'instructor_id': 1, 'count': 1,
+             'mean': 30.0, 'p50': 30.0, 'p90': 30.0, 'p99': 30.0},
+        ]
+
+    def test_hourly_buckets_and_instructor_filter(self, client):
+        """Test hour buckets restricted to one instructor."""
+        body = client.get(URL + '&bucket=hour&instructor_id=1').get_json()
+        assert [(entry['bucket_start'], entry['count']) for entry in body['series']] == [
+            ('2024-09-01T09:00:00', 5), ('2024-09-02T09:00:00', 1)
+        ]
+
+    def test_cached_buckets_are_not_rescanned(self, client):
+        """Test that cached ranges are not read again and extensions read only new buckets."""
+        first, queries = notification_queries(
+            client, '/notifications/read-latency?start=2024-09-01&end=2024-09-02')
+        assert len(queries) == 1
+        again, queries = notification_queries(
+            client, '/notifications/read-latency?start=2024-09-01&end=2024-09-02')
+        assert again == first and not queries
+        body, queries = notification_queries(client, URL)
+        assert len(queries) == 1
+        assert '2024-09-02 00:00:00.000000' in queries[0]
+        assert '2024-09-01 00:00:00.000000' not in queries[0]
+        assert len(body['series']) == 3
+        with app.app_context():
+            coverage = db.session.get(NotificationLatencyCoverage, 'day')
+            assert (coverage.cached_from, coverage.cached_until) == (
+                datetime(2024, 9, 1), datetime(2024, 9, 3))
+
+    def test_writes_refresh_only_their_bucket(self, client):
+        """Test that changing a notification re-aggregates its bucket and keeps the others."""
+        client.get(URL)
+        response = client.patch('/notifications/8', json={
+            'read_date': (DAY_TWO + timedelta(seconds=90)).isoformat()})
+        assert response.status_code == 200
+        response = client.patch('/notifications/1', json={
+            'read_date': (DAY_ONE + timedelta(seconds=660)).isoformat()})
+        assert response.status_code == 200
+        with app.app_context():
+            coverage = db.session.get(NotificationLatencyCoverage, 'day')
+            assert coverage.cached_until == datetime(2024, 9, 3)
+        body, queries = notification_queries(client, URL)
+        assert not queries
+        assert [entry['mean'] for entry in body['series']] == [360.0, 3600.0, 90.0]
+
+    def test_repeated_cache_writes_do_not_conflict(self, client):
+        """Test that a bucket cached twice, as by concurrent requests, keeps one row."""
+        client.get(URL)
+        with app.app_context():
+            store_buckets(datetime(2024, 9, 1), datetime(2024, 9, 3), 'day')
+            db.session.commit()
+            assert NotificationLatencyBucket.query.count() == 3
+
+    def test_bulk_writes_reset_the_cache(self, client):
+        """Test that bulk updates drop the cached buckets."""
+        client.get(URL)
+        client.patch('/notifications', json={'ids': [1], 'changes': {'read_status': 'unread'}})
+        with app.app_context():
+            assert db.session.get(NotificationLatencyCoverage, 'day') is None
+        assert client.get(URL).get_json()['series'][0]['count'] == 4
+
+    def test_open_bucket_is_not_cached(self, client):
+        """Test that the current bucket is computed live and never cached."""
+        sent = datetime.now() - timedelta(minutes=1)
+        with app.app_context():
+            db.session.add(Notification(title='Now', message_body='Body', student_id=1,
+                                        instructor_id=3, read_status='read',
+                                        sent_date=sent, read_date=sent))
+            db.session.commit()
+        body = client.get('/notifications/read-latency?instructor_id=3').get_json()
+        assert [entry['count'] for entry in body['series']] == [1]
+        with app.app_context():
+            coverage = db.session.get(NotificationLatencyCoverage, 'day')
+            assert coverage.cached_until <= sent
+
+    def test_invalid_parameters(self, client):
+        """Test validation of the bucket size, range and instructor."""
+        base = '/notifications/read-latency'
+        assert client.get(f'{base}?instructor_id=abc').status_code == 400
+        assert client.get(f'{base}?bucket=week').status_code == 400
+        assert client.get(f'{base}?start=yesterday').status_code == 400
+        assert client.get(f'{base}?start=2024-09-02&end=2024-09-01').status_code == 400
+        assert client.get(f'{base}?bucket=hour&start=2020-01-01&end=2024-01-01'
+                          ).status_code == 400
@@ -0,0 +1,52 @@
+"""Test suite for streamed collection responses."""
+
+import json
+from datetime import datetime
+import pytest
+from app import app
+from database import db
+from application.models.grades import Grade
+from application.resources import collection
+
+
+@pytest.fixture(name="client")
+def client_fixture(monkeypatch):
+    """Create the tables, seed grades and yield a test client."""
+    monkeypatch.setattr(collection, 'STREAM_CHUNK_SIZE', 2)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            Grade(student_id=1, course_id=1 + i % 2, grade=50 + i,
+                  date_posted=datetime(2024, 9, 1 + i, 10, 0, 0))
+            for i in range(5)
+        ])
+        db.session.commit()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+
+
+class TestStreaming:
+    """Test case for the stream parameter and NDJSON responses."""
+
+    def test_streamed_json_array(self, client):
+        """Test that a streamed array matches the buffered response."""
+        response = client.get('/grades?stream=true')
+        assert response.is_streamed
+        assert response.mimetype == 'application/json'
+        assert response.get_json() == client.get('/grades').get_json()
+
+    def test_ndjson(self, client):
+        """Test that NDJSON emits one JSON document per line."""
+        response = client.get('/grades?course_id=1&fields=id,grade',
+                              headers={'Accept': 'application/x-ndjson'})
+        assert response.mimetype == 'application/x-ndjson'
+        lines = response.get_data(as_text=True).splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {'id': 1, 'grade': 50}, {'id': 3, 'grade': 52}, {'id': 5, 'grade': 54}
+        ]
+
+    def test_empty_stream(self, client):
+        """Test that an empty result still streams a valid JSON array."""
+        response = client.get('/grades?stream=1&course_id=9')
+        assert response.get_json() == []
@@ -0,0 +1,97 @@
+"""Test suite for the assignment submission statistics endpoints."""
+
+from datetime import datetime
+import pytest
+from sqlalchemy import event, insert
+from app import app
+from database import db
+from application.models.assignment import Assignment
+from application.models.course import Course
+from application.models.enrollments import Enrollment
+from application.models.submission import Submission
+
+SCHEDULE = [{'day': 'Monday', 'start': '09:00', 'end': '11:00'}]
+DUE = {1: datetime(2024, 10, 10, 12), 2: datetime(2024, 10, 20, 12), 3: datetime(2024, 10, 1)}
+# (assignment, student, hours after the due date)
+SUBMISSIONS = [(1, 1, -24), (1, 2, 1), (1, 3, 3), (1, 3, 30), (1, 4, 5), (1, 7, -1),
+               (2, 1, 1), (2, 2, 2)]
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """Create the tables, seed two courses with assignments and yield a test client."""
+    with app.app_context():
+        db.create_all()
+        # Core inserts skip the attribute validators of these models.
+        db.session.execute(insert(Course), [
+            {'id': i, 'course_info': f'Course {i}', 'instructor_id': 1, 'schedule': SCHEDULE}
+            for i in (1, 2)
+        ])
+        db.session.execute(insert(Assignment), [
+            {'id': i, 'title': 'Homework', 'description': 'Exercises',
+             'course_id': 1 if i < 3 else 2, 'due_date': due, 'total_points': 10}
+            for i, due in DUE.items()
+        ])
+        db.session.add_all(
+            [Enrollment(course_id=1, student_id=i, status='enrolled') for i in range(1, 7)]
+            + [Enrollment(course_id=1, student_id=7, status='dropped')]
+        )
+        db.session.execute(insert(Submission), [
+            {'assignment_id': assignment_id, 'student_id': student_id, 'submission_info': 'x',
+             'grade_id': 1, 'date': DUE[assignment_id].replace(day=1) if hours < -23
+             else datetime.fromtimestamp(DUE[assignment_id].timestamp() + hours * 3600)}
+            for assignment_id, student_id, hours in SUBMISSIONS
+        ])
+        db.session.commit()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+
+
+class TestSubmissionStats:
+    """Test case for late, on-time and missing submission figures."""
+
+    def test_assignment_stats(self, client):
+        """Test the figures of one assignment against the seeded submissions."""
+        body = client.get('/assignments/1/submission-stats').get_json()
+        assert body == {
+            'assignment_id': 1, 'course_id': 1, 'due_date': '2024-10-10T12:00:00',
+            'enrolled': 6, 'submitted': 5, 'on_time': 2, 'late': 3, 'missing': 2,
+            'median_lateness_seconds': 3 * 3600
+        }
+
+    def test_even_number_of_late_students(self, client):
+        """Test that the median averages the two middle lateness values."""
+        body = client.get('/assignments/2/submission-stats').get_json()
+        assert (body['submitted'], body['late'], body['missing']) == (2, 2, 4)
+        assert body['median_lateness_seconds'] == 1.5 * 3600
+
+    def test_assignment_without_submissions(self, client):
+        """Test that an assignment without submissions or enrollments reports zeros."""
+        body = client.get('/assignments/3/submission-stats').get_json()
+        assert (body['enrolled'], body['submitted'], body['late'], body['missing']) == (0,) * 4
+        assert body['median_lateness_seconds'] is None
+
+    def test_course_stats_in_one_statement(self, client):
+        """Test the course variant and that it runs a single SELECT."""
+        recorded = []
+
+        def record(_conn, _cursor, statement, *_):
+            if 'submissions' in statement:
+                recorded.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            body = client.get('/courses/1/submission-stats').get_json()
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+        assert [entry['assignment_id'] for entry in body['assignments']] == [1, 2]
+        assert body['totals'] == {'submitted': 7, 'on_time': 2, 'late': 5, 'missing': 6}
+        assert len(recorded) == 1
+
+    def test_unknown_ids(self, client):
+        """Test 404 responses for unknown assignments and courses."""
+        assert client.get('/assignments/99/submission-stats').status_code == 404
+        assert client.get('/courses/99/submission-stats').status_code == 404
@@ -0,0 +1,95 @@
+"""Test suite for the student transcript endpoint."""
+
+from datetime import datetime
+import pytest
+from sqlalchemy import event, insert
+from app import app
+from database import db
+from application.cache import response_cache
+from application.models.course import Course
+from application.models.enrollments import Enrollment
+from application.models.grades import Grade
+from application.models.students import Student
+
+SCHEDULE = [{'day': 'Monday', 'start': '09:00', 'end': '11:00'}]
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """Create the tables, seed two students with enrollments and grades, and yield a client."""
+    with app.app_context():
+        db.create_all()
+        response_cache.clear()
+        db.session.execute(insert(Course), [
+            {'id': i, 'course_info': f'Course {i}', 'instructor_id': 1, 'schedule': SCHEDULE}
+            for i in (1, 2, 3)
+        ])
+        db.session.execute(insert(Student), [
+            {'id': i, 'username': f'student{i}', 'first_name': 'First', 'last_name': 'Last',
+             'email': f's{i}@example.com', '_password_hash': 'x', 'profile_picture': 'p.png'}
+            for i in (1, 2, 3)
+        ])
+        db.session.add_all([
+            Enrollment(course_id=1, student_id=1, status='enrolled'),
+            Enrollment(course_id=2, student_id=1, status='pending'),
+            Enrollment(course_id=1, student_id=2, status='enrolled'),
+            Grade(student_id=1, course_id=2, grade=71, date_posted=datetime(2024, 9, 1)),
+            Grade(student_id=1, course_id=2, grade=88, date_posted=datetime(2024, 10, 1)),
+            Grade(student_id=2, course_id=1, grade=64, date_posted=datetime(2024, 9, 1)),
+        ])
+        db.session.commit()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+        response_cache.clear()
+
+
+class TestTranscript:
+    """Test case for /students/<id>/transcript."""
+
+    def test_transcript_from_one_query(self, client):
+        """Test that courses, statuses and grades come from a single query."""
+        recorded = []
+
+        def record(_conn, _cursor, statement, *_):
+            recorded.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            response = client.get('/students/1/transcript')
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+        assert response.status_code == 200
+        courses = response.get_json()['courses']
+        assert [(c['course']['course_info'], c['status']) for c in courses] == [
+            ('Course 1', 'enrolled'), ('Course 2', 'pending')]
+        assert courses[0]['grades'] == []
+        assert [g['grade'] for g in courses[1]['grades']] == [71, 88]
+        assert len(recorded) == 1
+
+    def test_unknown_student_and_empty_transcript(self, client):
+        """Test that a missing student is a 404 and one without enrollments is empty."""
+        assert client.get('/students/9/transcript').status_code == 404
+        assert client.get('/students/3/transcript').get_json()['courses'] == []
+
+    def test_cache_invalidated_by_own_grades_only(self, client):
+        """Test that a grade change evicts only the owning student's transcript."""
+        client.get('/students/1/transcript')
+        client.get('/students/2/transcript')
+        assert client.get('/students/1/transcript').headers['X-Cache'] == 'HIT'
+        assert client.patch('/grades/1', json={'grade': 95}).status_code == 200
+        response = client.get('/students/1/transcript')
+        assert response.headers['X-Cache'] == 'MISS'
+        assert response.get_json()['courses'][1]['grades'][0]['grade'] == 95
+        assert client.get('/students/2/transcript').headers['X-Cache'] == 'HIT'
+
+    def test_cache_invalidated_by_bulk_enrollment_changes(self, client):
+        """Test that bulk enrollment updates evict the affected transcripts."""
+        client.get('/students/2/transcript')
+        client.patch('/enrollments', json={'filter': {'course_id': 1},
+                                           'changes': {'status': 'dropped'}})
+        response = client.get('/students/2/transcript')
+        assert response.headers['X-Cache'] == 'MISS'
+        assert response.get_json()['courses'][0]['status'] == 'dropped'
@@ -0,0 +1,190 @@
+"""Test suite for unique username and email handling."""
+
+import pytest
+from sqlalchemy import event, insert
+from sqlalchemy.exc import IntegrityError
+from app import app
+from database import db
+from application.hashing import password_hashing
+from application.models.instructors import Instructor
+from application.models.students import Student
+from application.resources.bulk import bulk_create
+from application.resources.conflicts import conflicting_column
+
+STUDENT_FIELDS = ('username', 'first_name', 'last_name', 'email', 'password_hash',
+                  'profile_picture')
+
+
+@pytest.fixture(name="client")
+def client_fixture():
+    """Create the tables, seed a student and an instructor and yield a test client."""
+    with app.app_context():
+        db.create_all()
+        # Core inserts skip the attribute validators of these models.
+        db.session.execute(insert(Student), [{
+            'id': 1, 'username': 'amina', 'first_name': 'Amina', 'last_name': 'Otieno',
+            'email': 'amina@example.com', '_password_hash': 'hash', 'profile_picture': 'p.png'
+        }])
+        db.session.execute(insert(Instructor), [
+            {'id': i, 'name': f'Prof {i}', 'email': f'prof{i}@example.com',
+             '_password_hash': 'hash', 'department': 'Maths', 'bio': 'Bio'}
+            for i in (1, 2)
+        ])
+        db.session.commit()
+        yield app.test_client()
+        db.session.rollback()
+        db.drop_all()
+
+
+@pytest.fixture(name="statements")
+def statements_fixture():
+    """Yield the list of SQL statements run against the students table."""
+    recorded = []
+
+    def record(_conn, _cursor, statement, *_):
+        if 'students' in statement:
+            recorded.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    yield recorded
+    event.remove(engine, 'before_cursor_execute', record)
+
+
+def register(client, **fields):
+    """POST a student registration form."""
+    form = {'username': 'brian', 'first_name': 'Brian', 'last_name': 'Kamau',
+            'email': 'brian@example.com', '_password_hash': 'secret',
+            'profile_picture': 'b.png', **fields}
+    return client.post('/students', data=form)
+
+
+def student_row(username, email):
+    """A bulk import row for a student."""
+    return {'username': username, 'first_name': 'First', 'last_name': 'Last', 'email': email,
+            'password_hash': 'secret', 'profile_picture': 'p.png'}
+
+
+class TestUniqueness:
+    """Test case for unique constraints surfacing as 409 responses."""
+
+    def test_registration_is_one_statement(self, client, statements):
+        """Test that creating a student writes with one INSERT and no uniqueness lookups."""
+        response = register(client)
+        assert response.status_code == 201
+        # The SELECT reloads the committed row by ID for the response body.
+        assert [statement.split()[0] for statement in statements] == ['INSERT', 'SELECT']
+        assert statements[1].rstrip().endswith('WHERE students.id = ?')
+
+    def test_duplicate_registration(self, client):
+        """Test 409 answers naming the taken field, and 400 for invalid values."""
+        response = register(client, username='amina')
+        assert response.status_code == 409
+        assert response.get_json() == {'error': 'Username is already in use', 'field': 'username'}
+        response = register(client, email='amina@example.com')
+        assert (response.status_code, response.get_json()['field']) == (409, 'email')
+        assert register(client, email='not an email').status_code == 400
+        assert register(client).status_code == 201
+
+    def test_instructor_conflicts(self, client):
+        """Test duplicate instructor emails on create and update."""
+        response = client.post('/instructors', data={
+            'name': 'Prof 3', 'email': 'prof1@example.com', '_password_hash': 'secret',
+            'profile_picture': 'p.png', 'department': 'Maths', 'bio': 'Bio'
+        })
+        assert (response.status_code, response.get_json()['field']) == (409, 'email')
+        response = client.patch('/instructors/2', json={'email': 'prof1@example.com'})
+        assert response.status_code == 409
+        assert client.patch('/instructors/2', json={'email': 'invalid'}).status_code == 400
+        assert client.patch('/students/1', json={'username': 'ab'}).status_code == 400
+        response = client.patch('/instructors/2', json={'email': 'new@example.com'})
+        assert response.get_json()['email'] == 'new@example.com'
+
+    def test_bulk_pre_check(self, client, statements):
+        """Test that a bulk import reports every clash with one query per column."""
+        rows = [student_row('brian', 'brian@example.com'),
+                student_row('amina', 'other@example.com'),
+                student_row('carol', 'brian@example.com'),
+                student_row('dennis', 'dennis@example.com')]
+        response = client.post('/students', json=rows)
+        assert response.status_code == 409
+        assert [(entry['index'], entry['field']) for entry in response.get_json()['results']] == [
+            (1, 'username'), (2, 'email')
+        ]
+        assert len(statements) == 2 and all(s.startswith('SELECT') for s in statements)
+        response = client.post('/students', json=[rows[0], rows[3]])
+        assert (response.status_code, response.get_json()['created']) == (201, 2)
+        with app.app_context():
+            brian = db.session.get(Student, response.get_json()['results'][0]['id'])
+            assert brian.authenticate('secret')
+        with app.test_request_context():
+            response = bulk_create(Student, [student_row('edwin', 'dennis@example.com')],
+                                   STUDENT_FIELDS)
+        assert (response.status_code, response.get_json()['field']) == (409, 'email')
+        assert client.get('/students/1').status_code == 200
+
+    def test_bulk_passwords_are_hashed_in_one_batch(self, client, monkeypatch):
+        """Test that a bulk import hashes its passwords with one pool call, after the checks."""
+        batches = []
+
+        def counting(function, items):
+            batches.append(list(items))
+            return [function(item) for item in batches[-1]]
+
+        monkeypatch.setattr(password_hashing, 'map', counting)
+        rows = [student_row(f'user{i}', f'user{i}@example.com') for i in range(3)]
+        response = client.post('/students', json=rows + [student_row('amina', 'a@example.com')])
+        assert response.status_code == 409 and not batches
+        bad = dict(student_row('brian', 'brian@example.com'), password_hash=123)
+        response = client.post('/students', json=[bad])
+        assert response.get_json()['results'] == [
+            {'index': 0, 'error': 'password_hash must be a string'}]
+        assert client.post('/students', json=rows).status_code == 201
+        assert batches == [['secret'] * 3]
+        with app.app_context():
+            assert all(student.authenticate('secret')
+                       for student in Student.query.filter(Student.id > 1))
+
+    def test_bulk_instructors(self, client):
+        """Test per-row conflicts and validation errors of a bulk instructor import."""
+        def instructor_row(email):
+            return {'name': 'Prof', 'email': email, 'password_hash': 'secret',
+                    'profile_picture': 'p.png', 'department': 'Maths', 'bio': 'Bio'}
+
+        rows = [instructor_row('prof3@example.com'), instructor_row('prof1@example.com')]
+        response = client.post('/instructors', json=rows)
+        assert response.status_code == 409
+        assert response.get_json()['results'] == [
+            {'index': 1, 'error': 'Email is already in use', 'field': 'email'}]
+        response = client.post('/instructors', json=[instructor_row('invalid')])
+        assert response.status_code == 400
+        assert client.post('/instructors', json={'name': 'Prof'}).status_code == 400
+        response = client.post('/instructors', json=rows[:1])
+        assert response.status_code == 201
+
+
+class FakeDiagnostics:  # pylint: disable=too-few-public-methods
+    """Stand-in for the ``diag`` attribute of a psycopg2 error."""
+
+    def __init__(self, constraint_name):
+        self.constraint_name = constraint_name
+
+
+class FakeDriverError(Exception):
+    """A driver error naming its violated constraint the way psycopg2 does."""
+
+    def __init__(self, message, constraint_name):
+        super().__init__(message)
+        self.diag = FakeDiagnostics(constraint_name)
+
+
+def test_conflicting_column_prefers_constraint_name():
+    """Test that the driver's constraint name wins over the message text."""
+    error = IntegrityError('INSERT', {}, FakeDriverError(
+        'duplicate key value violates unique constraint (Key (email))', 'students_username_key'))
+    assert conflicting_column(Student, error) == 'username'
+    error = IntegrityError('INSERT', {}, FakeDriverError('Key (email)', 'students_pkey'))
+    assert conflicting_column(Student, error) is None
+    error = IntegrityError('INSERT', {}, Exception('UNIQUE constraint failed: students.email'))
+    assert conflicting_column(Student, error) == 'email'